@@ -0,0 +1,100 @@
+"""
+绘图计算器 - 无界面批量分析入口
+
+对方程式文件（每行一个方程式）中的每个方程式计算函数属性，结果以JSON Lines格式
+逐行写入输出文件：每行一个JSON对象，包含来源、方程式、状态、表达式和各项属性，
+sympy对象同时给出字符串和LaTeX。中断或崩溃后用相同命令重新运行会跳过已完成的方程式。
+
+用法示例：
+    python analyze.py bank/ -o bank_analysis.jsonl --jobs 8 --timeout 30
+    python analyze.py --clear-cache
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from core.analysis_cache import AnalysisCache
+from core.batch_analysis import BatchAnalyzer
+from utils.helpers import FileHandler
+
+
+def collect_records(paths):
+    """读取所有方程式文件
+
+    Args:
+        paths: 文件或目录路径列表，目录中收集 *.txt 文件
+
+    Returns:
+        list: (来源文件, 行号, 方程式) 的列表
+    """
+    records = []
+    for source in FileHandler.find_equation_files(paths):
+        for line, equation in enumerate(FileHandler.load_equations(source), 1):
+            records.append((source, line, equation))
+    return records
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Analyze equation files without the GUI and write JSON Lines.")
+    parser.add_argument('inputs', nargs='*', help="equation files or directories containing *.txt files")
+    parser.add_argument('-o', '--output', help="JSON Lines output file (appended to, used for resuming)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument('--timeout', type=float, default=60.0, help="hard time limit per equation in seconds")
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help="time budget per symbolic step in seconds (default: FunctionAnalyzer.TIME_BUDGET)")
+    parser.add_argument('--no-cache', action='store_true', help="do not read or write the persistent analysis cache")
+    parser.add_argument('--clear-cache', action='store_true',
+                        help="clear the persistent analysis cache first (exits if no inputs are given)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="only print the summary")
+    args = parser.parse_args(argv)
+    if not args.inputs and not args.clear_cache:
+        parser.error("the following arguments are required: inputs")
+    if args.inputs and not args.output:
+        parser.error("the following arguments are required: -o/--output")
+    return args
+
+
+def main(argv=None):
+    """主函数
+
+    Returns:
+        int: 退出码，有方程式失败或超时时为1
+    """
+    args = parse_args(argv)
+    if args.clear_cache:
+        cache = AnalysisCache.shared()
+        entries = cache.stats()['entries']
+        cache.invalidate()
+        print(f"Cleared {entries} cached analysis result(s) from {cache.path}")
+        if not args.inputs:
+            return 0
+
+    records = collect_records(args.inputs)
+    if not records:
+        print("No equations found.")
+        return 0
+
+    def progress(done, total, record):
+        if not args.quiet:
+            print(f"[{done}/{total}] {record['status']:7} {record['equation']}", flush=True)
+
+    analyzer = BatchAnalyzer(
+        workers=args.jobs, timeout=args.timeout,
+        time_budget=args.time_budget, use_cache=not args.no_cache
+    )
+    start = time.perf_counter()
+    counts = analyzer.run(records, args.output, progress)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{counts['ok']} ok, {counts['error']} error, {counts['timeout']} timeout, "
+        f"{counts['skipped']} already done, in {elapsed:.1f} s -> {args.output}"
+    )
+    return 1 if counts['error'] or counts['timeout'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
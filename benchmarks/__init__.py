@@ -0,0 +1,3 @@
+"""
+性能基准模块 - 固定表达式语料上的流水线和交互基准
+"""
@@ -0,0 +1,62 @@
+"""
+基准公共工具 - 运行环境记录和耗时统计
+"""
+
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+
+
+def environment():
+    """记录运行环境，比较结果时用于判断是否可比
+
+    Returns:
+        dict: 提交、Python和主要依赖的版本等
+    """
+    import matplotlib
+    import sympy as sp
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'sympy': sp.__version__,
+        'matplotlib': matplotlib.__version__,
+    }
+
+
+def percentiles(samples_ms):
+    """计算耗时分布
+
+    Args:
+        samples_ms: 耗时列表（毫秒）
+
+    Returns:
+        dict: 次数、均值、p50、p90、p99和最大值（毫秒）
+    """
+    if not samples_ms:
+        return {'count': 0}
+    values = np.asarray(samples_ms, dtype=float)
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        'count': int(values.size),
+        'mean': float(values.mean()),
+        'p50': float(p50),
+        'p90': float(p90),
+        'p99': float(p99),
+        'max': float(values.max()),
+    }
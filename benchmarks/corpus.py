@@ -0,0 +1,43 @@
+"""
+基准语料 - 固定的表达式集合，从简单到困难
+
+修改语料会使新旧基准结果无法直接比较，只应追加新的分组。
+"""
+
+# 分组名 -> 表达式列表（与界面输入框中的写法相同）
+CORPUS = {
+    'polynomial': [
+        'x^2-4',
+        'x^3-3x+1',
+        'x^5-3x^3+x-1',
+    ],
+    'trig': [
+        'sin(x)',
+        'sin(x)cos(3x)',
+        'tan(x)',
+        'sec(x)',
+        'arctan(x)',
+    ],
+    'special': [
+        'jn(2,x)',
+        'gamma(x)',
+        'erf(x)',
+        'exp(-x^2)sin(5x)',
+        '|x|-2',
+    ],
+    'rational': [
+        '1/x',
+        '(x^2-1)/(x^2-4)',
+        '1/(x-1)^2',
+        '(x^3-1)/(x+2)',
+    ],
+}
+
+
+def all_expressions():
+    """按分组顺序列出全部表达式
+
+    Returns:
+        list: (分组名, 表达式) 列表
+    """
+    return [(group, expr) for group, exprs in CORPUS.items() for expr in exprs]
@@ -0,0 +1,466 @@
+"""
+交互回放基准 - 在Qt的offscreen平台上回放鼠标和滚轮事件，统计交互延迟和重绘次数
+
+事件按时间戳逐个送入GraphInteractions的on_press、on_motion、on_release、zoom和pan_wheel，
+事件之间照常处理Qt事件循环，渲染调度器和重新采样定时器与真实界面中一样工作。
+每类事件统计处理耗时的百分位数（update_dot单独计时），另外统计完整重绘和blit的次数。
+
+事件坐标使用坐标轴内的相对位置（0到1），与画布大小无关；可以把合成的事件序列保存下来，
+或者回放录制的序列。
+
+用法：
+    python -m benchmarks.interactions run -o before.json --curves 20
+    python -m benchmarks.interactions run -o after.json --curves 20
+    python -m benchmarks.interactions compare before.json after.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+from matplotlib.backend_bases import MouseEvent
+from PyQt6.QtCore import QPoint, QPointF, Qt
+from PyQt6.QtGui import QWheelEvent
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.common import environment, percentiles
+
+
+# 结果文件格式版本
+FORMAT_VERSION = 1
+
+# 与界面初始视图相同
+VIEW = (-10.0, 10.0, -10.0, 10.0)
+
+# 交互事件类型，以及它们对应的matplotlib事件名
+MOUSE_EVENTS = {
+    'press': 'button_press_event',
+    'motion': 'motion_notify_event',
+    'release': 'button_release_event',
+}
+
+
+def curve_equations(count):
+    """生成用于回放的一组曲线，正弦、抛物线、余弦和直线交替出现并上下错开
+
+    Args:
+        count: 曲线数量
+
+    Returns:
+        list: 方程式字符串列表（与输入框中的写法相同）
+    """
+    equations = []
+    for k in range(count):
+        offset = f"{0.5 * k - 0.25 * count:+g}"
+        family = k % 4
+        if family == 0:
+            equations.append(f"sin(x+{0.3 * k:g}){offset}")
+        elif family == 1:
+            equations.append(f"0.05x^2{offset}")
+        elif family == 2:
+            equations.append(f"cos(2x){offset}")
+        else:
+            equations.append(f"x/5{offset}")
+    return equations
+
+
+def synthetic_events(trace_func, rate=120.0):
+    """生成一段合成的交互序列
+
+    依次为：沿第一条曲线按住左键追踪、中键拖动平移、滚轮缩放、滚轮平移。
+
+    Args:
+        trace_func: 追踪的曲线函数（在初始视图中求值）
+        rate: 事件频率（每秒事件数）
+
+    Returns:
+        list: 事件字典列表，t为相对开始的秒数，x、y为坐标轴内的相对位置
+    """
+    x_min, x_max, y_min, y_max = VIEW
+    dt = 1.0 / rate
+    events = []
+    t = 0.0
+
+    def add(kind, **fields):
+        nonlocal t
+        events.append(dict(fields, t=round(t, 6), kind=kind))
+        t += dt
+
+    # 沿曲线追踪
+    xs = np.linspace(x_min + 0.5, x_max - 0.5, 300)
+    with np.errstate(all='ignore'):
+        ys = np.broadcast_to(np.asarray(trace_func(xs), dtype=float), xs.shape)
+    fx = (xs - x_min) / (x_max - x_min)
+    fy = np.clip((ys - y_min) / (y_max - y_min), 0.02, 0.98)
+    add('press', x=float(fx[0]), y=float(fy[0]), button=1)
+    for x, y in zip(fx[1:], fy[1:]):
+        add('motion', x=float(x), y=float(y), button=1)
+    add('release', x=float(fx[-1]), y=float(fy[-1]), button=1)
+    t += 0.3
+
+    # 中键拖动平移：绕一个圆移动
+    angles = np.linspace(0, 2 * np.pi, 120)
+    add('press', x=0.5, y=0.5, button=2)
+    for angle in angles[1:]:
+        add('motion', x=float(0.5 + 0.2 * np.sin(angle)), y=float(0.5 + 0.2 * (1 - np.cos(angle))), button=2)
+    add('release', x=0.5, y=0.5, button=2)
+    t += 0.3
+
+    # 滚轮缩放：先放大再缩小回来
+    for scale in [1 / 1.2] * 30 + [1.2] * 30:
+        add('zoom', x=0.6, y=0.4, scale=scale)
+    t += 0.3
+
+    # 滚轮平移：水平再垂直
+    for dx, dy in [(0.1, 0.0)] * 30 + [(0.0, -0.1)] * 30:
+        add('pan_wheel', x=0.5, y=0.5, dx=dx, dy=dy)
+
+    return events
+
+
+class InteractionReplay:
+    """交互回放器类，创建离屏主窗口，回放事件并收集计时"""
+
+    def __init__(self, equations, size=(800, 1000)):
+        """创建主窗口并绘制曲线
+
+        Args:
+            equations: 方程式字符串列表
+            size: 窗口大小（像素）
+
+        Raises:
+            RuntimeError: 绘制失败
+        """
+        from ui.main_window import GraphingCalculatorWindow
+
+        self.app = QApplication.instance() or QApplication(sys.argv[:1])
+        self.window = GraphingCalculatorWindow()
+        self.window.resize(*size)
+        self.window.show()
+        self._process_events(0.2)
+
+        self.window.entry_2d.setText(' '.join(equations))
+        self.window.plot_graphs_2d()
+        gm = self.window.graph_manager
+        if len(gm.lines) != len(equations):
+            raise RuntimeError(self.window.result_browser.toPlainText())
+
+        # 函数属性分析与交互无关，停掉以免后台线程干扰计时
+        gm.analysis_runner.cancel()
+        self._process_events(0.3)
+
+        self.gm = gm
+        self.interactions = self.window.interactions
+        self.timings = defaultdict(list)
+        self.counts = defaultdict(int)
+        self._instrument()
+
+    def _instrument(self):
+        """包装画布和update_dot以统计重绘次数和耗时"""
+        canvas = self.gm.canvas
+        draw = canvas.draw
+        blit = canvas.blit
+        update_dot = self.interactions.update_dot
+
+        def counted_draw(*args, **kwargs):
+            start = time.perf_counter()
+            draw(*args, **kwargs)
+            self.timings['draw'].append(1000 * (time.perf_counter() - start))
+            self.counts['draw'] += 1
+
+        def counted_blit(*args, **kwargs):
+            blit(*args, **kwargs)
+            self.counts['blit'] += 1
+
+        def timed_update_dot(event):
+            start = time.perf_counter()
+            update_dot(event)
+            self.timings['update_dot'].append(1000 * (time.perf_counter() - start))
+
+        canvas.draw = counted_draw
+        canvas.blit = counted_blit
+        self.interactions.update_dot = timed_update_dot
+
+    def replay(self, events):
+        """按时间戳回放事件
+
+        Args:
+            events: 事件字典列表
+
+        Returns:
+            dict: 每类事件的耗时分布、重绘统计和墙钟时间
+        """
+        gm = self.gm
+        scheduler = gm.render_scheduler
+        requests, frames = scheduler.requests, scheduler.frames
+        self.timings.clear()
+        self.counts.clear()
+
+        start = time.perf_counter()
+        for event in events:
+            self._wait_until(start + event['t'])
+            handler, args = self._dispatch(event)
+            tick = time.perf_counter()
+            handler(*args)
+            self.timings[self._label(event)].append(1000 * (time.perf_counter() - tick))
+
+        # 等待最后一帧和交互结束后的重新采样
+        self._process_events(0.1 + gm.RESAMPLE_DELAY_MS / 1000)
+        wall = time.perf_counter() - start
+
+        return {
+            'events': {kind: percentiles(samples) for kind, samples in sorted(self.timings.items())},
+            'redraws': {
+                'draw': self.counts['draw'],
+                'blit': self.counts['blit'],
+                'requests': scheduler.requests - requests,
+                'frames': scheduler.frames - frames,
+                'final_detail': scheduler.detail,
+            },
+            'wall': wall,
+        }
+
+    def close(self):
+        """关闭窗口"""
+        self.window.close()
+        self._process_events(0.05)
+
+    def _dispatch(self, event):
+        """把事件字典转换为交互处理函数调用
+
+        Args:
+            event: 事件字典
+
+        Returns:
+            tuple: (处理函数, 参数元组)
+        """
+        canvas = self.gm.canvas
+        x, y = self.gm.ax.transAxes.transform((event['x'], event['y']))
+        kind = event['kind']
+
+        if kind in MOUSE_EVENTS:
+            mouse_event = MouseEvent(MOUSE_EVENTS[kind], canvas, x, y, button=event.get('button'))
+            handler = getattr(self.interactions, f"on_{kind}")
+            return handler, (mouse_event,)
+
+        # 滚轮事件使用Qt的逻辑像素坐标，原点在左上角
+        ratio = canvas.device_pixel_ratio
+        position = QPointF(x / ratio, canvas.get_width_height()[1] - y / ratio)
+        delta = 120 if event.get('scale', 1.0) < 1 or event.get('dx', 0) + event.get('dy', 0) > 0 else -120
+        wheel_event = QWheelEvent(
+            position, canvas.mapToGlobal(position), QPoint(), QPoint(0, delta),
+            Qt.MouseButton.NoButton, Qt.KeyboardModifier.NoModifier,
+            Qt.ScrollPhase.NoScrollPhase, False
+        )
+        if kind == 'zoom':
+            return self.interactions.zoom, (event['scale'], wheel_event)
+        if kind == 'pan_wheel':
+            return self.interactions.pan_wheel, (event['dx'], event['dy'], wheel_event)
+        raise ValueError(f"unknown event kind: {kind}")
+
+    @staticmethod
+    def _label(event):
+        """统计用的事件名，鼠标事件附带按键（1为左键，2为中键）"""
+        if event['kind'] in MOUSE_EVENTS and event.get('button'):
+            return f"{event['kind']}:{event['button']}"
+        return event['kind']
+
+    def _wait_until(self, deadline):
+        """处理Qt事件直到指定时间"""
+        while True:
+            self.app.processEvents()
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 0.001))
+
+    def _process_events(self, seconds):
+        """处理Qt事件一段时间"""
+        self._wait_until(time.perf_counter() + seconds)
+
+
+def run(curves=20, events=None, repeats=3, rate=120.0):
+    """运行回放基准
+
+    Args:
+        curves: 曲线数量
+        events: 事件列表，为None时使用合成序列
+        repeats: 回放次数，所有回放的耗时合并统计
+        rate: 合成序列的事件频率
+
+    Returns:
+        dict: 基准结果
+    """
+    from utils.helpers import ExpressionParser
+
+    equations = curve_equations(curves)
+    if events is None:
+        expr = ExpressionParser.preprocess(equations[0])
+        trace_func = _compile(expr)
+        events = synthetic_events(trace_func, rate)
+
+    replay = InteractionReplay(equations)
+    gm = replay.gm
+    combined = defaultdict(list)
+    redraws = defaultdict(float)
+    wall = 0.0
+    try:
+        for _ in range(repeats):
+            gm.ax.set_xlim(VIEW[0], VIEW[1])
+            gm.ax.set_ylim(VIEW[2], VIEW[3])
+            gm.canvas.draw()
+            replay._process_events(0.1 + gm.RESAMPLE_DELAY_MS / 1000)
+
+            result = replay.replay(events)
+            for kind, samples in replay.timings.items():
+                combined[kind].extend(samples)
+            for key, value in result['redraws'].items():
+                if key != 'final_detail':
+                    redraws[key] += value
+            wall += result['wall']
+    finally:
+        replay.close()
+
+    return {
+        'format': FORMAT_VERSION,
+        'environment': environment(),
+        'curves': equations,
+        'event_count': len(events),
+        'repeats': repeats,
+        'events': {kind: percentiles(samples) for kind, samples in sorted(combined.items())},
+        'redraws': {key: value / repeats for key, value in redraws.items()},
+        'wall': wall / repeats,
+    }
+
+
+def _compile(expr_str):
+    """按界面的设置编译一个表达式，用于计算追踪路径"""
+    import sympy as sp
+    from sympy.parsing.sympy_parser import parse_expr
+    from utils.helpers import ExpressionParser
+
+    local_dict = ExpressionParser.plot_local_dict()
+    expr = parse_expr(expr_str, local_dict=local_dict, transformations=ExpressionParser.TRANSFORMATIONS)
+    return sp.lambdify(local_dict['x'], expr, modules=[ExpressionParser.plot_modules(), 'numpy'])
+
+
+def compare(base, new, threshold=0.25, statistic='p50', min_delta=0.5):
+    """比较两份回放结果
+
+    Args:
+        base: 基准结果（旧）
+        new: 基准结果（新）
+        threshold: 相对变慢阈值
+        statistic: 比较使用的百分位数
+        min_delta: 绝对差阈值（毫秒）
+
+    Returns:
+        tuple: (比较行列表, 退化行列表)，每行为(名称, 旧值, 新值, 比值)
+    """
+    rows, regressions = [], []
+    for kind, entry in new['events'].items():
+        old = base['events'].get(kind, {}).get(statistic)
+        value = entry.get(statistic)
+        if old is None or value is None:
+            continue
+        ratio = value / old if old else float('inf')
+        row = (f"{kind} {statistic}", old, value, ratio)
+        rows.append(row)
+        if ratio > 1 + threshold and value - old > min_delta:
+            regressions.append(row)
+
+    # 完整重绘次数增加同样算退化（blit被完整重绘取代时耗时会成倍增加）
+    old_draws = base['redraws'].get('draw')
+    new_draws = new['redraws'].get('draw')
+    if old_draws and new_draws is not None:
+        row = ('draw count', old_draws, new_draws, new_draws / old_draws)
+        rows.append(row)
+        if new_draws > old_draws * (1 + threshold):
+            regressions.append(row)
+    return rows, regressions
+
+
+def _print_result(data):
+    """打印耗时分布和重绘统计"""
+    print(f"{len(data['curves'])} curve(s), {data['event_count']} event(s) x {data['repeats']}")
+    print(f"{'event':>14} {'count':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  (ms)")
+    for kind, entry in data['events'].items():
+        print(f"{kind:>14} {entry['count']:6d} {entry['p50']:8.2f} {entry['p90']:8.2f} "
+              f"{entry['p99']:8.2f} {entry['max']:8.2f}")
+    redraws = data['redraws']
+    print(f"per replay: {redraws['draw']:.0f} full draw(s), {redraws['blit']:.0f} blit(s), "
+          f"{redraws['requests']:.0f} redraw request(s) -> {redraws['frames']:.0f} frame(s), "
+          f"{data['wall']:.2f} s")
+
+
+def main(argv=None):
+    """命令行入口
+
+    Returns:
+        int: 退出码，比较时发现退化为1
+    """
+    parser = argparse.ArgumentParser(description="Replay mouse and wheel events through GraphInteractions.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help="replay events and save JSON")
+    run_parser.add_argument('-o', '--output', help="JSON output file")
+    run_parser.add_argument('-n', '--curves', type=int, default=20, help="number of plotted curves")
+    run_parser.add_argument('-r', '--repeats', type=int, default=3)
+    run_parser.add_argument('--rate', type=float, default=120.0, help="synthetic events per second")
+    run_parser.add_argument('--events', help="replay a recorded event file instead of the synthetic sequence")
+    run_parser.add_argument('--save-events', help="write the replayed event sequence to this file")
+
+    compare_parser = sub.add_parser('compare', help="compare two result files")
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.25,
+                                help="relative slowdown that counts as a regression")
+    compare_parser.add_argument('--statistic', choices=['p50', 'p90', 'p99'], default='p50')
+    compare_parser.add_argument('--min-delta', type=float, default=0.5,
+                                help="ignore absolute differences below this many milliseconds")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        events = None
+        if args.events:
+            with open(args.events, encoding='utf-8') as f:
+                events = json.load(f)
+        if args.save_events:
+            if events is None:
+                from utils.helpers import ExpressionParser
+                equations = curve_equations(args.curves)
+                events = synthetic_events(_compile(ExpressionParser.preprocess(equations[0])), args.rate)
+            with open(args.save_events, 'w', encoding='utf-8') as f:
+                json.dump(events, f)
+
+        data = run(args.curves, events, args.repeats, args.rate)
+        _print_result(data)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            print(f"Saved to {args.output}")
+        return 0
+
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+
+    print(f"base: {base['environment'].get('commit')}  new: {new['environment'].get('commit')}")
+    rows, regressions = compare(base, new, args.threshold, args.statistic, args.min_delta)
+    for name, old, value, ratio in rows:
+        flag = 'REGRESSION ' if (name, old, value, ratio) in regressions else ''
+        print(f"{flag}{name}: {old:.2f} -> {value:.2f} ({ratio:.2f}x)")
+    print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+内存检查 - 反复绘制和清除图形，检查内存是否保持平稳
+
+在Qt的offscreen平台上创建主窗口，循环执行“绘制方程式、清除图形”，
+每个循环后记录Python分配的内存（tracemalloc）、进程常驻内存和仍然存活的Figure、Axes数量。
+预热循环之后内存增长超过阈值，或者存活的Figure超过一个时退出码为1。
+
+用法：
+    python -m benchmarks.memory
+    python -m benchmarks.memory --cycles 500 --equations "sin(x) x^2 1/x"
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.common import environment
+
+
+# 预热循环数：缓存填充、字体加载等一次性分配在此期间完成
+WARMUP_CYCLES = 20
+
+# 预热后允许的Python内存增长（MB）
+GROWTH_LIMIT_MB = 2.0
+
+DEFAULT_EQUATIONS = ['sin(x)', 'x^2-4', '1/x', 'exp(-x^2)', '|x|-2']
+
+
+def resident_mb():
+    """进程常驻内存（MB），无法读取时为None"""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def live_objects():
+    """统计仍然存活的matplotlib图形和坐标轴
+
+    Returns:
+        dict: Figure和Axes对象数量
+    """
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+    gc.collect()
+    counts = {'figures': 0, 'axes': 0}
+    for obj in gc.get_objects():
+        if isinstance(obj, Figure):
+            counts['figures'] += 1
+        elif isinstance(obj, Axes):
+            counts['axes'] += 1
+    return counts
+
+
+def run(cycles=100, equations=None):
+    """循环绘制和清除图形并记录内存
+
+    Args:
+        cycles: 循环次数
+        equations: 每次绘制的方程式列表
+
+    Returns:
+        dict: 每个循环的内存记录和汇总
+    """
+    from sympy.core.cache import clear_cache
+    from ui.main_window import GraphingCalculatorWindow
+
+    equations = equations or DEFAULT_EQUATIONS
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    window = GraphingCalculatorWindow()
+    window.show()
+    window.init_graphing()
+    app.processEvents()
+
+    tracemalloc.start()
+    samples = []
+    start = time.perf_counter()
+    try:
+        for cycle in range(cycles):
+            window.entry_2d.setText(' '.join(equations))
+            window.plot_graphs_2d()
+            app.processEvents()
+            window.clear_graphs()
+            app.processEvents()
+
+            # sympy的函数缓存有上限，后台分析会把它逐渐填满，不计入增长
+            clear_cache()
+            gc.collect()
+            current, _ = tracemalloc.get_traced_memory()
+            samples.append({'cycle': cycle + 1, 'python_mb': current / 2 ** 20, 'rss_mb': resident_mb()})
+    finally:
+        tracemalloc.stop()
+        window.graph_manager.analysis_runner.cancel()
+
+    objects = live_objects()
+    window.close()
+    app.processEvents()
+
+    warm = samples[min(WARMUP_CYCLES, len(samples)) - 1]
+    last = samples[-1]
+    growth = last['python_mb'] - warm['python_mb']
+    failures = []
+    if len(samples) > WARMUP_CYCLES and growth > GROWTH_LIMIT_MB:
+        failures.append(
+            f"python memory grew {growth:.2f} MB after warm-up (limit {GROWTH_LIMIT_MB} MB)"
+        )
+    if objects['figures'] > 1:
+        failures.append(f"{objects['figures']} figures alive after {cycles} cycles")
+
+    return {
+        'environment': environment(),
+        'equations': equations,
+        'cycles': cycles,
+        'elapsed': time.perf_counter() - start,
+        'growth_mb': growth,
+        'live_objects': objects,
+        'samples': samples,
+        'failures': failures,
+    }
+
+
+def main(argv=None):
+    """命令行入口
+
+    Returns:
+        int: 退出码，内存不平稳时为1
+    """
+    parser = argparse.ArgumentParser(description="Check that repeated plot/clear cycles keep memory flat.")
+    parser.add_argument('-n', '--cycles', type=int, default=100)
+    parser.add_argument('--equations', help="space separated equations to plot in every cycle")
+    parser.add_argument('-o', '--output', help="JSON output file")
+    args = parser.parse_args(argv)
+
+    data = run(args.cycles, args.equations.split() if args.equations else None)
+
+    step = max(1, args.cycles // 10)
+    for sample in data['samples'][step - 1::step]:
+        rss = f"{sample['rss_mb']:.1f}" if sample['rss_mb'] is not None else '?'
+        print(f"cycle {sample['cycle']:5d}: python {sample['python_mb']:8.2f} MB, rss {rss} MB")
+    print(f"growth after {WARMUP_CYCLES} warm-up cycles: {data['growth_mb']:.2f} MB, "
+          f"{data['live_objects']['figures']} figure(s) and {data['live_objects']['axes']} axes alive, "
+          f"{data['elapsed']:.1f} s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"Saved to {args.output}")
+
+    for failure in data['failures']:
+        print(f"FAILED: {failure}")
+    return 1 if data['failures'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+绘图流水线基准 - 分阶段计时并保存为JSON，便于比较两个提交
+
+阶段：预处理、parse_expr、lambdify、自适应采样求值、函数属性分析、求交点、Agg渲染。
+不需要Qt，可在无显示器的机器上运行。
+
+用法：
+    python -m benchmarks.pipeline run -o before.json
+    python -m benchmarks.pipeline run -o after.json
+    python -m benchmarks.pipeline compare before.json after.json --threshold 0.25
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import numpy as np
+import sympy as sp
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from sympy.parsing.sympy_parser import parse_expr
+
+from benchmarks.common import environment
+from benchmarks.corpus import CORPUS, all_expressions
+from core.function_props import FunctionAnalyzer
+from core.sampling import AdaptiveSampler
+from plotting.style import apply_figure_style, apply_grid, apply_legend
+from utils.helpers import ExpressionParser
+
+
+# 结果文件格式版本
+FORMAT_VERSION = 1
+
+# 默认视图，与界面初始视图相同
+VIEW = (-10.0, 10.0, -10.0, 10.0)
+
+
+def measure(func, repeats):
+    """多次调用函数并统计耗时
+
+    Args:
+        func: 无参数函数
+        repeats: 调用次数
+
+    Returns:
+        dict: 最小值、中位数（秒）和次数
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {'min': min(times), 'median': statistics.median(times), 'repeats': repeats}
+
+
+def render_figure(curves, labels):
+    """按界面样式在Agg画布上绘制并渲染一次
+
+    Args:
+        curves: (x数组, y数组) 列表
+        labels: LaTeX标签列表
+    """
+    fig = Figure(figsize=(10, 8))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_xlim(VIEW[0], VIEW[1])
+    ax.set_ylim(VIEW[2], VIEW[3])
+    apply_grid(ax)
+    apply_figure_style(fig, ax)
+
+    colors = colormaps['tab10'].colors
+    for idx, ((x_vals, y_vals), label) in enumerate(zip(curves, labels)):
+        ax.plot(x_vals, y_vals, color=colors[idx % len(colors)], label=f"${label}$")
+    apply_legend(ax)
+    canvas.draw()
+
+
+def run(repeats=5, analysis_repeats=1, skip_analysis=False):
+    """运行全部基准
+
+    Args:
+        repeats: 快速阶段的重复次数
+        analysis_repeats: 函数属性分析的重复次数
+        skip_analysis: 是否跳过函数属性分析
+
+    Returns:
+        dict: 基准结果
+    """
+    x = sp.symbols('x')
+    local_dict = ExpressionParser.plot_local_dict()
+    modules = ExpressionParser.plot_modules()
+    transformations = ExpressionParser.TRANSFORMATIONS
+    sampler = AdaptiveSampler()
+    x_min, x_max, y_min, y_max = VIEW
+
+    results = {stage: {} for stage in (
+        'preprocess', 'parse', 'lambdify', 'evaluate', 'analysis', 'intersections', 'render'
+    )}
+    compiled = {}
+
+    for group, equation in all_expressions():
+        name = f"{group}:{equation}"
+        processed = ExpressionParser.preprocess(equation)
+        expr = parse_expr(processed, local_dict=local_dict, transformations=transformations)
+        func = sp.lambdify(x, expr, modules=[modules, 'numpy'])
+        samples = sampler.sample(func, x_min, x_max, y_min, y_max)
+        compiled[name] = (func, samples, sp.latex(expr))
+
+        results['preprocess'][name] = measure(lambda: ExpressionParser.preprocess(equation), repeats)
+        results['parse'][name] = measure(
+            lambda: parse_expr(processed, local_dict=local_dict, transformations=transformations), repeats
+        )
+        results['lambdify'][name] = measure(lambda: sp.lambdify(x, expr, modules=[modules, 'numpy']), repeats)
+        results['evaluate'][name] = measure(lambda: sampler.sample(func, x_min, x_max, y_min, y_max), repeats)
+        if not skip_analysis:
+            results['analysis'][name] = measure(
+                lambda: FunctionAnalyzer.compute_function_properties(expr), analysis_repeats
+            )
+        print(f"  {name}", file=sys.stderr)
+
+    # 求交点和渲染按分组进行，另加一组全部表达式
+    groups = {group: [f"{group}:{equation}" for equation in exprs] for group, exprs in CORPUS.items()}
+    groups['all'] = [name for names in groups.values() for name in names]
+    x_vals = np.linspace(x_min, x_max, 800)
+    for group, names in groups.items():
+        funcs = [compiled[name][0] for name in names]
+        curves = [compiled[name][1] for name in names]
+        labels = [compiled[name][2] for name in names]
+        results['intersections'][group] = measure(
+            lambda: FunctionAnalyzer.find_intersections(funcs, x_vals), repeats
+        )
+        results['render'][group] = measure(lambda: render_figure(curves, labels), repeats)
+
+    if skip_analysis:
+        del results['analysis']
+
+    return {
+        'format': FORMAT_VERSION,
+        'environment': environment(),
+        'results': results,
+        'totals': {stage: sum(entry['median'] for entry in entries.values())
+                   for stage, entries in results.items()},
+    }
+
+
+def compare(base, new, threshold=0.25, min_delta=0.0005, statistic='min'):
+    """比较两份基准结果，找出变慢的条目
+
+    默认以最小值比较（受系统噪声影响最小）；相对变慢超过threshold且绝对差超过
+    min_delta秒才算退化，避免把微秒级的噪声当作退化。
+
+    Args:
+        base: 基准结果（旧）
+        new: 基准结果（新）
+        threshold: 相对变慢阈值
+        min_delta: 绝对差阈值（秒）
+        statistic: 比较使用的统计量，'min'或'median'
+
+    Returns:
+        tuple: (比较行列表, 退化行列表)，每行为(阶段, 名称, 旧值, 新值, 比值)
+    """
+    rows, regressions = [], []
+    for stage, entries in new['results'].items():
+        base_entries = base['results'].get(stage, {})
+        for name, entry in entries.items():
+            if name not in base_entries:
+                continue
+            old_median = base_entries[name][statistic]
+            new_median = entry[statistic]
+            ratio = new_median / old_median if old_median else float('inf')
+            row = (stage, name, old_median, new_median, ratio)
+            rows.append(row)
+            if ratio > 1 + threshold and new_median - old_median > min_delta:
+                regressions.append(row)
+    return rows, regressions
+
+
+def _print_summary(data):
+    """打印各阶段总耗时"""
+    for stage, total in data['totals'].items():
+        print(f"{stage:>14}: {total * 1000:10.2f} ms")
+
+
+def main(argv=None):
+    """命令行入口
+
+    Returns:
+        int: 退出码，比较时发现退化为1
+    """
+    parser = argparse.ArgumentParser(description="Plot pipeline benchmarks.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help="run the benchmarks and save JSON")
+    run_parser.add_argument('-o', '--output', help="JSON output file")
+    run_parser.add_argument('-r', '--repeats', type=int, default=5)
+    run_parser.add_argument('--analysis-repeats', type=int, default=1)
+    run_parser.add_argument('--skip-analysis', action='store_true')
+
+    compare_parser = sub.add_parser('compare', help="compare two result files")
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.25,
+                                help="relative slowdown that counts as a regression")
+    compare_parser.add_argument('--min-delta', type=float, default=0.0005,
+                                help="ignore absolute differences below this many seconds")
+    compare_parser.add_argument('--statistic', choices=['min', 'median'], default='min')
+    compare_parser.add_argument('-v', '--verbose', action='store_true', help="print every entry")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        data = run(args.repeats, args.analysis_repeats, args.skip_analysis)
+        _print_summary(data)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            print(f"Saved to {args.output}")
+        return 0
+
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+
+    print(f"base: {base['environment'].get('commit')}  new: {new['environment'].get('commit')}")
+    for stage, total in new['totals'].items():
+        old_total = base['totals'].get(stage)
+        if old_total:
+            print(f"{stage:>14}: {old_total * 1000:10.2f} -> {total * 1000:10.2f} ms ({total / old_total:5.2f}x)")
+
+    rows, regressions = compare(base, new, args.threshold, args.min_delta, args.statistic)
+    for stage, name, old_median, new_median, ratio in (rows if args.verbose else regressions):
+        flag = 'REGRESSION ' if (stage, name, old_median, new_median, ratio) in regressions else ''
+        print(f"{flag}{stage}/{name}: {old_median * 1000:.3f} -> {new_median * 1000:.3f} ms ({ratio:.2f}x)")
+
+    print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+回归检查 - 对曾经出错的输入和行为逐项检查
+
+每项检查返回失败说明，通过时返回None；任一项失败时退出码为1。
+
+用法：
+    python -m benchmarks.regressions
+    python -m benchmarks.regressions --only parametric_spaces
+"""
+
+import argparse
+import sys
+
+
+def check_parametric_spaces():
+    """参数方程中标识符之间的空格表示乘法，不能在解析前被去掉"""
+    import sympy as sp
+
+    from core.expression_cache import ExpressionCache
+    from utils.helpers import ExpressionParser
+
+    t = sp.symbols('t')
+    expected = {
+        '(t cos(t), t sin(t))': sp.Tuple(t * sp.cos(t), t * sp.sin(t)),
+        '(t  cos(t),t sin(t))': sp.Tuple(t * sp.cos(t), t * sp.sin(t)),
+    }
+
+    text = 'sin(x) (t cos(t), t sin(t)) x^2'
+    split = ExpressionParser.split_equations(text)
+    if split != ['sin(x)', '(t cos(t), t sin(t))', 'x^2']:
+        return f"split_equations({text!r}) returned {split}"
+
+    cache = ExpressionCache()
+    for equation, expr in expected.items():
+        compiled = cache.compile(
+            ExpressionParser.preprocess(equation), ExpressionParser.plot_local_dict(),
+            ExpressionParser.TRANSFORMATIONS, ExpressionParser.plot_modules()
+        )
+        if compiled.expr != expr:
+            return f"{equation!r} compiled to {compiled.expr}, expected {expr}"
+    return None
+
+
+def check_decimation_width():
+    """导出路径的顶点数应随输出宽度变化，且每个像素列最多保留4个点"""
+    import numpy as np
+
+    from core.sampling import decimate_minmax
+    from plotting.headless import HeadlessRenderer
+
+    sampler = HeadlessRenderer().sampler
+    for name, func in (('sin(1/x)', lambda x: np.sin(1 / x)), ('tan(x)', np.tan)):
+        x_vals, y_vals = sampler.sample(func, -10, 10, -10, 10)
+        counts = []
+        for columns in (300, 600, 1200):
+            x_out, y_out = decimate_minmax(x_vals, y_vals, -10, 10, columns)
+            limit = 4 * (columns + 1) + np.count_nonzero(~np.isfinite(y_out))
+            if x_out.size > limit:
+                return f"{name}: {x_out.size} vertices for {columns} columns, limit {limit}"
+            counts.append(x_out.size)
+        if max(counts) >= x_vals.size or counts != sorted(counts):
+            return f"{name}: vertex counts {counts} for {x_vals.size} samples do not follow width"
+    return None
+
+
+def check_intersection_grid():
+    """交点数量不应随采样密度变化，紧靠极点的交点不能漏掉，极点本身不能算作交点"""
+    import numpy as np
+    import sympy as sp
+
+    from core.function_props import FunctionAnalyzer
+
+    x = sp.symbols('x')
+    exprs = [x ** 2, sp.Integer(0), sp.sin(x), 1 / x, sp.tan(x), x ** 3 - x]
+    funcs = [sp.lambdify(x, expr, 'numpy') for expr in exprs]
+
+    counts = {}
+    for samples in (50, 101, 800, 5000):
+        by_pair = FunctionAnalyzer.find_pair_intersections(funcs, np.linspace(-10, 10, samples))
+        counts[samples] = {pair: len(points) for pair, points in by_pair.items()}
+        for (i, j), points in by_pair.items():
+            for px, py in points:
+                with np.errstate(all='ignore'):
+                    gap = abs(float(funcs[i](px)) - float(funcs[j](px)))
+                if not gap <= 1e-6 * max(1.0, abs(py)):
+                    return f"{exprs[i]} and {exprs[j]}: ({px:.6g}, {py:.6g}) is not an intersection ({samples} samples)"
+    if any(count != counts[5000] for count in counts.values()):
+        totals = {samples: sum(count.values()) for samples, count in counts.items()}
+        return f"intersection counts depend on the grid: {totals}"
+    return None
+
+
+def check_root_engine():
+    """数值零点：极点和可去奇点不能算作零点，重根只报告一次"""
+    import numpy as np
+    import sympy as sp
+
+    from core.numeric import NumericSolver
+
+    x = sp.symbols('x')
+    multiples_of_pi = [k * np.pi for k in range(-3, 4)]
+    expected = {
+        sp.tan(x): multiples_of_pi,
+        1 / x: [],
+        sp.gamma(x): [],
+        x ** 2: [0.0],
+        (x - 1) ** 3: [1.0],
+        sp.sin(x) / x: [root for root in multiples_of_pi if root != 0],
+    }
+
+    for expr, roots in expected.items():
+        func = NumericSolver.compile(expr)
+        derivative = NumericSolver.compile(sp.diff(expr, x))
+        # 101个点的网格恰好采到x = 0（极点或可去奇点本身）
+        for num_points in (NumericSolver.DEFAULT_POINTS, 101, 1000):
+            found = {
+                'find_roots_with_bounds': NumericSolver.find_roots_with_bounds(func, -10, 10, num_points),
+                'find_roots_with_bounds(derivative)': NumericSolver.find_roots_with_bounds(
+                    func, -10, 10, num_points, derivative
+                ),
+                'locate_zeros': NumericSolver.locate_zeros(func, derivative, -10, 10, num_points)[0],
+                'locate_zeros(central difference)': NumericSolver.locate_zeros(func, None, -10, 10, num_points)[0],
+            }
+            for method, result in found.items():
+                xs = [root.x for root in result]
+                if len(xs) != len(roots) or not np.allclose(xs, roots, rtol=0, atol=1e-6):
+                    return f"{method} for {expr} with {num_points} points returned {np.round(xs, 6).tolist()}"
+    return None
+
+
+def check_intersection_pruning():
+    """按y值范围剔除函数对不能改变交点结果"""
+    import numpy as np
+    import sympy as sp
+
+    from core.function_props import FunctionAnalyzer
+
+    x = sp.symbols('x')
+    exprs = [x ** 2, sp.Integer(0), sp.sin(x), 1 / x, sp.tan(x), x ** 3 - x, x + 20, sp.exp(x), -x ** 2 - 5, sp.cos(x) + 3]
+    funcs = [sp.lambdify(x, expr, 'numpy') for expr in exprs]
+
+    for samples in (50, 800):
+        x_vals = np.linspace(-10, 10, samples)
+        pruned = FunctionAnalyzer.find_pair_intersections(funcs, x_vals, prune=True)
+        full = FunctionAnalyzer.find_pair_intersections(funcs, x_vals, prune=False)
+        if pruned != full:
+            differing = sorted(pair for pair in set(pruned) | set(full) if pruned.get(pair) != full.get(pair))
+            return f"prune=True and prune=False differ for pairs {differing} ({samples} samples)"
+    return None
+
+
+CHECKS = {
+    'parametric_spaces': check_parametric_spaces,
+    'decimation_width': check_decimation_width,
+    'intersection_grid': check_intersection_grid,
+    'root_engine': check_root_engine,
+    'intersection_pruning': check_intersection_pruning,
+}
+
+
+def main(argv=None):
+    """命令行入口
+
+    Returns:
+        int: 退出码，有失败的检查时为1
+    """
+    parser = argparse.ArgumentParser(description="Run regression checks.")
+    parser.add_argument('--only', nargs='+', choices=sorted(CHECKS), help="checks to run")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for name in args.only or CHECKS:
+        failure = CHECKS[name]()
+        print(f"{'FAILED' if failure else 'ok':6s} {name}{': ' + failure if failure else ''}")
+        failures += bool(failure)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+启动时间检查 - 用 -X importtime 检查启动时的导入开销，并测量首次绘制所需时间
+
+启动目标（见README）：
+    - 导入main模块不加载matplotlib、sympy和scipy，总导入时间不超过 IMPORT_BUDGET_MS
+    - 从启动进程到窗口首次绘制不超过 FIRST_PAINT_TARGET 秒
+    - 绘图区域（图形和画布）在 READY_TARGET 秒内可用
+
+任一项不满足时退出码为1，可作为启动时间的回归检查。
+
+用法：
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeats 5 -o startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import environment
+
+
+# 导入main模块的总耗时预算（毫秒）
+IMPORT_BUDGET_MS = 300
+
+# 启动进程到窗口首次绘制的目标（秒）
+FIRST_PAINT_TARGET = 1.0
+
+# 启动进程到绘图区域可用的目标（秒）
+READY_TARGET = 4.0
+
+# 首次绘制之前不应导入的包
+DEFERRED_PACKAGES = ('matplotlib', 'sympy', 'scipy')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 子进程中运行的启动探针：与main.py相同的启动过程，首次绘制和绘图区域可用时各输出一行
+PROBE = r"""
+import sys
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QApplication
+from ui.main_window import GraphingCalculatorWindow
+
+
+class PaintProbe(QObject):
+    painted = False
+
+    def eventFilter(self, source, event):
+        if event.type() == QEvent.Type.Paint and not self.painted:
+            self.painted = True
+            print('paint', ','.join(sorted(
+                name for name in ('matplotlib', 'sympy', 'scipy') if name in sys.modules
+            )), flush=True)
+        return False
+
+
+app = QApplication(sys.argv[:1])
+window = GraphingCalculatorWindow()
+probe = PaintProbe()
+window.installEventFilter(probe)
+window.show()
+while window.graph_manager is None or window.graph_manager.canvas is None:
+    app.processEvents()
+app.processEvents()
+print('ready', flush=True)
+"""
+
+
+def import_profile(module='main'):
+    """用 -X importtime 在新进程中导入模块并解析每个模块的耗时
+
+    Args:
+        module: 要导入的模块名
+
+    Returns:
+        list: (模块名, 自身耗时微秒, 累计耗时微秒) 列表，按导入顺序
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, env=_child_env()
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def time_to_first_paint():
+    """启动一次窗口，测量首次绘制和绘图区域可用的时间
+
+    Returns:
+        dict: first_paint、ready（秒，从启动进程算起）和首次绘制前已导入的重量级包
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-c', PROBE], cwd=ROOT, env=_child_env(),
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    result = {'first_paint': None, 'ready': None, 'loaded_before_paint': []}
+    try:
+        for line in process.stdout:
+            elapsed = time.perf_counter() - start
+            marker, _, detail = line.strip().partition(' ')
+            if marker == 'paint':
+                result['first_paint'] = elapsed
+                result['loaded_before_paint'] = [name for name in detail.split(',') if name]
+            elif marker == 'ready':
+                result['ready'] = elapsed
+                break
+    finally:
+        process.kill()
+        process.wait()
+    return result
+
+
+def _child_env():
+    """子进程环境：无显示器时使用Qt的offscreen平台"""
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    return env
+
+
+def run(repeats=3):
+    """运行启动检查
+
+    Args:
+        repeats: 启动窗口的次数，取最小值
+
+    Returns:
+        dict: 导入统计、启动时间和未达标的项目
+    """
+    entries = import_profile('main')
+    total_ms = sum(self_us for _, self_us, _ in entries) / 1000
+    deferred_imported = sorted({
+        name.split('.')[0] for name, _, _ in entries if name.split('.')[0] in DEFERRED_PACKAGES
+    })
+    slowest = sorted(entries, key=lambda entry: entry[2], reverse=True)[:10]
+
+    launches = [time_to_first_paint() for _ in range(repeats)]
+    paints = [launch['first_paint'] for launch in launches if launch['first_paint'] is not None]
+    readies = [launch['ready'] for launch in launches if launch['ready'] is not None]
+    first_paint = min(paints) if paints else None
+    ready = min(readies) if readies else None
+    loaded_before_paint = sorted({name for launch in launches for name in launch['loaded_before_paint']})
+
+    failures = []
+    if deferred_imported:
+        failures.append(f"import main loads {', '.join(deferred_imported)}")
+    if total_ms > IMPORT_BUDGET_MS:
+        failures.append(f"import main takes {total_ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    if loaded_before_paint:
+        failures.append(f"{', '.join(loaded_before_paint)} imported before the first paint")
+    if first_paint is None or first_paint > FIRST_PAINT_TARGET:
+        failures.append(f"first paint after {first_paint} s (target {FIRST_PAINT_TARGET} s)")
+    if ready is None or ready > READY_TARGET:
+        failures.append(f"plot area ready after {ready} s (target {READY_TARGET} s)")
+
+    return {
+        'environment': environment(),
+        'import_ms': total_ms,
+        'deferred_imported': deferred_imported,
+        'slowest_imports': [
+            {'module': name, 'self_ms': self_us / 1000, 'cumulative_ms': cumulative_us / 1000}
+            for name, self_us, cumulative_us in slowest
+        ],
+        'first_paint': first_paint,
+        'ready': ready,
+        'launches': launches,
+        'failures': failures,
+    }
+
+
+def main(argv=None):
+    """命令行入口
+
+    Returns:
+        int: 退出码，有未达标的项目时为1
+    """
+    parser = argparse.ArgumentParser(description="Check import time and time to first paint.")
+    parser.add_argument('-r', '--repeats', type=int, default=3, help="number of window launches")
+    parser.add_argument('-o', '--output', help="JSON output file")
+    args = parser.parse_args(argv)
+
+    data = run(args.repeats)
+
+    print(f"import main: {data['import_ms']:.0f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    for entry in data['slowest_imports']:
+        print(f"  {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+    if data['first_paint'] is not None:
+        print(f"first paint: {data['first_paint']:.2f} s (target {FIRST_PAINT_TARGET} s)")
+    if data['ready'] is not None:
+        print(f"plot area ready: {data['ready']:.2f} s (target {READY_TARGET} s)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"Saved to {args.output}")
+
+    for failure in data['failures']:
+        print(f"FAILED: {failure}")
+    return 1 if data['failures'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
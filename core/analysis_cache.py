@@ -0,0 +1,237 @@
+"""
+分析结果缓存模块 - 把函数属性分析结果持久化到磁盘
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+import sympy as sp
+
+from core.function_props import FunctionAnalyzer
+from core.numeric import ApproximateResult
+
+
+def user_cache_dir(app_name='graphing_calculator'):
+    """获取当前平台的用户缓存目录
+
+    Args:
+        app_name: 应用子目录名
+
+    Returns:
+        str: 缓存目录路径
+    """
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, app_name)
+
+
+class AnalysisCache:
+    """分析结果缓存类，基于SQLite的持久化缓存
+
+    键为分析器版本、时间预算和表达式srepr的哈希，值为按顺序排列的
+    (属性名, 属性值) 列表。总大小超过上限时按最近使用时间淘汰。
+    含近似值（符号计算超时后的数值回退）的结果不写入，下次仍尝试符号计算；
+    调用方还应在分析过程中有任何一步超时（AnalysisGraph.timed_out）时跳过写入。
+    缓存读写失败一律视为未命中，不影响分析本身。
+    """
+
+    # 默认大小上限（字节）
+    DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+    _shared = None
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, version=None):
+        """初始化缓存
+
+        Args:
+            path: 数据库文件路径，为None时放在用户缓存目录
+            max_bytes: 缓存数据总大小上限（字节）
+            version: 分析器版本，为None时使用FunctionAnalyzer.VERSION
+        """
+        self.path = path or os.path.join(user_cache_dir(), 'analysis.sqlite3')
+        self.max_bytes = max_bytes
+        self.version = FunctionAnalyzer.VERSION if version is None else version
+        self.enabled = True
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS analysis ("
+                    " key TEXT PRIMARY KEY,"
+                    " version TEXT NOT NULL,"
+                    " data BLOB NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " last_used REAL NOT NULL)"
+                )
+        except (sqlite3.Error, OSError):
+            self.enabled = False
+
+    @classmethod
+    def shared(cls):
+        """获取进程内共享的缓存实例
+
+        Returns:
+            AnalysisCache: 共享缓存
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def make_key(self, expr, time_budget=None):
+        """计算表达式的缓存键
+
+        Args:
+            expr: sympy表达式对象
+            time_budget: 分析使用的时间预算，为None时使用FunctionAnalyzer.TIME_BUDGET
+
+        Returns:
+            str: 十六进制哈希
+        """
+        if time_budget is None:
+            time_budget = FunctionAnalyzer.TIME_BUDGET
+        canonical = f"{self.version}|{time_budget}|{sp.srepr(expr)}"
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, expr, time_budget=None):
+        """读取缓存的分析结果
+
+        Args:
+            expr: sympy表达式对象
+            time_budget: 分析使用的时间预算
+
+        Returns:
+            list: (属性名, 属性值) 列表，未命中时返回None
+        """
+        if not self.enabled:
+            return None
+
+        key = self.make_key(expr, time_budget)
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT data FROM analysis WHERE key = ? AND version = ?",
+                    (key, self.version)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE analysis SET last_used = ? WHERE key = ?", (time.time(), key))
+            return pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError):
+            return None
+
+    def put(self, expr, items, time_budget=None):
+        """写入分析结果并按需淘汰旧条目
+
+        Args:
+            expr: sympy表达式对象
+            items: (属性名, 属性值) 列表
+            time_budget: 分析使用的时间预算
+
+        Returns:
+            bool: 是否写入成功，含近似值的结果不写入并返回False
+        """
+        if not self.enabled:
+            return False
+
+        items = list(items)
+        if any(isinstance(value, ApproximateResult) for _, value in items):
+            return False
+
+        try:
+            data = pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return False
+        if len(data) > self.max_bytes:
+            return False
+
+        key = self.make_key(expr, time_budget)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO analysis (key, version, data, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, self.version, data, len(data), time.time())
+                )
+                self._evict(conn)
+            return True
+        except sqlite3.Error:
+            return False
+
+    def invalidate(self, expr=None, time_budget=None):
+        """使缓存失效
+
+        Args:
+            expr: 要失效的表达式，为None时清空全部缓存
+            time_budget: 分析使用的时间预算
+        """
+        if not self.enabled:
+            return
+
+        try:
+            with self._connect() as conn:
+                if expr is None:
+                    conn.execute("DELETE FROM analysis")
+                else:
+                    conn.execute("DELETE FROM analysis WHERE key = ?", (self.make_key(expr, time_budget),))
+        except sqlite3.Error:
+            pass
+
+    def stats(self):
+        """获取缓存统计信息
+
+        Returns:
+            dict: 包含条目数、总大小和上限的字典
+        """
+        entries, size = 0, 0
+        if self.enabled:
+            try:
+                with self._connect() as conn:
+                    entries, size = conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analysis"
+                    ).fetchone()
+            except sqlite3.Error:
+                pass
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes, 'path': self.path}
+
+    @contextmanager
+    def _connect(self):
+        """打开数据库连接，每次操作单独连接以便在多个线程中使用
+
+        退出时提交事务（出错则回滚）并关闭连接。
+
+        Yields:
+            sqlite3.Connection: 数据库连接
+        """
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _evict(self, conn):
+        """删除旧版本条目，并按最近使用时间淘汰直到总大小不超过上限
+
+        Args:
+            conn: 数据库连接
+        """
+        conn.execute("DELETE FROM analysis WHERE version != ?", (self.version,))
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM analysis").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in conn.execute("SELECT key, size FROM analysis ORDER BY last_used ASC").fetchall():
+            conn.execute("DELETE FROM analysis WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
@@ -0,0 +1,200 @@
+"""
+分析依赖图模块 - 按名称惰性计算并共享函数分析的中间结果
+"""
+
+import time
+
+import sympy as sp
+
+from core.numeric import NumericSolver
+from core.time_budget import AnalysisTimeout, call_with_timeout
+
+
+class AnalysisGraph:
+    """分析依赖图类
+
+    每个节点是一个命名的中间结果（导数、临界点、极限、定义域等），
+    首次被请求时先求出其依赖，再计算自身并缓存。只有可能失控的符号计算
+    （求解、极限、定义域、间断点）在时间预算内于辅助线程中执行；超时时要向
+    计算中途的线程注入异常，其余廉价节点直接在当前线程执行，不承担这一风险。
+    失败或超时同样会被缓存，同一表达式的每个节点最多计算一次。
+    任一计算超时后timed_out为True，这样的结果取决于当时的机器负载，不应持久化。
+    """
+
+    # 节点依赖关系，依赖的结果按顺序作为参数传给节点函数；
+    # 以?开头的是可选依赖，计算失败时传入None
+    DEPENDENCIES = {
+        'derivative': (),
+        'second_derivative': ('derivative',),
+        'x_intercepts': (),
+        'y_intercept': (),
+        'critical_points': ('derivative',),
+        'limit_pos_inf': (),
+        'limit_neg_inf': (),
+        'domain': (),
+        'discontinuities': (),
+        'numeric_func': (),
+        'numeric_derivative': ('derivative',),
+        'numeric_zeros': ('numeric_func', '?numeric_derivative'),
+    }
+
+    # 在时间预算内执行的节点（sympy的solve、limit、continuous_domain、discontinuities）；
+    # 其余节点直接执行，其中数值节点在已放弃线程达到上限时仍须可用，供数值回退使用
+    TIMED = frozenset({
+        'x_intercepts', 'critical_points', 'limit_pos_inf', 'limit_neg_inf', 'domain', 'discontinuities',
+    })
+
+    def __init__(self, expr, time_budget=None):
+        """初始化依赖图
+
+        Args:
+            expr: sympy表达式对象
+            time_budget: 每个节点的时间预算（秒），为None时不限时
+        """
+        self.expr = expr
+        self.x = sp.symbols('x')
+        self.time_budget = time_budget
+
+        # 节点结果：名称 -> (是否成功, 值或异常)
+        self.results = {}
+
+        # 是否有计算超时
+        self.timed_out = False
+
+        # 节点自身耗时（不含依赖），以及各属性的总耗时
+        self.timings = {}
+        self.property_timings = {}
+
+    def get(self, name):
+        """获取节点结果，必要时计算
+
+        Args:
+            name: 节点名称
+
+        Returns:
+            节点的值
+
+        Raises:
+            Exception: 节点或其依赖计算失败时抛出（包括AnalysisTimeout）
+        """
+        if name not in self.results:
+            try:
+                deps = [self._dependency(dep) for dep in self.DEPENDENCIES[name]]
+            except Exception as e:
+                self.results[name] = (False, e)
+            else:
+                compute = getattr(self, f'_node_{name}')
+                self.results[name] = self._run(name, compute, *deps, timed=name in self.TIMED)
+
+        ok, value = self.results[name]
+        if not ok:
+            raise value
+        return value
+
+    def timed(self, name, func, *args):
+        """直接执行一次不缓存的计算，并记录耗时
+
+        Args:
+            name: 计时名称
+            func: 要执行的函数
+            *args: 传给函数的参数
+
+        Returns:
+            函数的返回值
+        """
+        ok, value = self._run(name, func, *args, timed=False)
+        if not ok:
+            raise value
+        return value
+
+    def timing_report(self):
+        """生成按耗时降序排列的计时报告
+
+        Returns:
+            str: 每行一个节点或属性及其耗时
+        """
+        lines = ["Properties:"]
+        for name, seconds in sorted(self.property_timings.items(), key=lambda t: -t[1]):
+            lines.append(f"  {name}: {seconds * 1000:.1f} ms")
+        lines.append("Nodes:")
+        for name, seconds in sorted(self.timings.items(), key=lambda t: -t[1]):
+            lines.append(f"  {name}: {seconds * 1000:.1f} ms")
+        return '\n'.join(lines)
+
+    def _dependency(self, name):
+        """获取依赖的值，可选依赖失败时返回None
+
+        Args:
+            name: 依赖名称，可选依赖以?开头
+
+        Returns:
+            依赖的值
+        """
+        if name.startswith('?'):
+            try:
+                return self.get(name[1:])
+            except Exception:
+                return None
+        return self.get(name)
+
+    def _run(self, name, func, *args, timed=True):
+        """执行计算并记录耗时
+
+        Args:
+            name: 计时名称
+            func: 要执行的函数
+            *args: 传给函数的参数
+            timed: 是否在时间预算内执行，为False时在当前线程直接执行
+
+        Returns:
+            tuple: (是否成功, 值或异常)
+        """
+        start = time.perf_counter()
+        try:
+            if not timed:
+                return True, func(*args)
+            return True, call_with_timeout(func, self.time_budget, *args)
+        except AnalysisTimeout as e:
+            self.timed_out = True
+            return False, e
+        except Exception as e:
+            return False, e
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    # 以下是各节点的计算函数
+    def _node_derivative(self):
+        return sp.diff(self.expr, self.x)
+
+    def _node_second_derivative(self, derivative):
+        return sp.diff(derivative, self.x)
+
+    def _node_x_intercepts(self):
+        return sp.solve(self.expr, self.x)
+
+    def _node_y_intercept(self):
+        return self.expr.subs(self.x, 0)
+
+    def _node_critical_points(self, derivative):
+        return sp.solve(derivative, self.x)
+
+    def _node_limit_pos_inf(self):
+        return sp.limit(self.expr, self.x, sp.oo)
+
+    def _node_limit_neg_inf(self):
+        return sp.limit(self.expr, self.x, -sp.oo)
+
+    def _node_domain(self):
+        return sp.calculus.util.continuous_domain(self.expr, self.x, sp.S.Reals)
+
+    def _node_discontinuities(self):
+        return sp.calculus.util.discontinuities(self.expr, self.x, sp.S.Reals)
+
+    def _node_numeric_func(self):
+        return NumericSolver.compile(self.expr)
+
+    def _node_numeric_derivative(self, derivative):
+        return NumericSolver.compile(derivative)
+
+    def _node_numeric_zeros(self, func, derivative):
+        return NumericSolver.locate_zeros(func, derivative, *NumericSolver.DEFAULT_RANGE)
@@ -0,0 +1,348 @@
+"""
+批量分析模块 - 不依赖界面，在多个进程中分析大量方程式并输出JSON
+"""
+
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+import sympy as sp
+from sympy.parsing.sympy_parser import parse_expr
+
+from core.analysis_cache import AnalysisCache
+from core.function_props import FunctionAnalyzer
+from core.numeric import ApproximateResult, NumericRoot
+from utils.helpers import ExpressionParser
+
+
+def serialize_value(value):
+    """把属性值转换为可JSON序列化的结构
+
+    sympy对象输出为字符串和LaTeX，近似结果保留数值方法说明，
+    字典、列表和集合递归转换，非有限浮点数输出为字符串。
+
+    Args:
+        value: 属性值
+
+    Returns:
+        可JSON序列化的值
+    """
+    if isinstance(value, ApproximateResult):
+        return {'approximate': serialize_value(value.value), 'method': value.method}
+    if isinstance(value, NumericRoot):
+        return {'x': serialize_value(value.x), 'error': serialize_value(value.error)}
+    if isinstance(value, sp.Basic):
+        try:
+            latex = sp.latex(value)
+        except Exception:
+            latex = None
+        return {'sympy': str(value), 'latex': latex}
+    if isinstance(value, bool) or value is None or isinstance(value, (int, str)):
+        return value
+    if isinstance(value, float):
+        return value if math.isfinite(value) else str(value)
+    if isinstance(value, dict):
+        return {str(key): serialize_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [serialize_value(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((serialize_value(item) for item in value), key=str)
+    try:
+        return float(value) if math.isfinite(float(value)) else str(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def record_key(source, line, equation):
+    """计算一条方程式记录的唯一键，用于断点续跑
+
+    Args:
+        source: 来源文件
+        line: 行号
+        equation: 方程式字符串
+
+    Returns:
+        str: 十六进制哈希
+    """
+    return hashlib.sha1(f"{source}\0{line}\0{equation}".encode('utf-8')).hexdigest()
+
+
+def analyze_equation(equation, time_budget=None, use_cache=True):
+    """分析单个方程式
+
+    Args:
+        equation: 方程式字符串
+        time_budget: 每个中间结果的时间预算（秒），为None时使用FunctionAnalyzer.TIME_BUDGET
+        use_cache: 是否使用持久化分析缓存
+
+    Returns:
+        dict: 包含表达式、属性和耗时的结果
+    """
+    start = time.perf_counter()
+    local_dict = ExpressionParser.plot_local_dict()
+    expr = parse_expr(
+        ExpressionParser.preprocess(equation),
+        local_dict=local_dict,
+        transformations=ExpressionParser.TRANSFORMATIONS
+    )
+
+    unsupported_vars = expr.free_symbols - {local_dict['x']}
+    if unsupported_vars:
+        var_names = ', '.join(sorted(str(var) for var in unsupported_vars))
+        raise ValueError(f"unsupported variables: {var_names}")
+
+    cache = AnalysisCache.shared() if use_cache else None
+    items = cache.get(expr, time_budget) if cache else None
+    cached = items is not None
+    if not cached:
+        # 有一步超时的结果取决于当时的负载，不写入缓存
+        graph = FunctionAnalyzer.make_graph(expr, time_budget)
+        items = list(FunctionAnalyzer.iter_function_properties(expr, graph=graph))
+        if cache and not graph.timed_out:
+            cache.put(expr, items, time_budget)
+
+    return {
+        'expr': serialize_value(expr),
+        'properties': serialize_value(dict(items)),
+        'cached': cached,
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+def _worker_loop(conn, time_budget, use_cache):
+    """工作进程主循环：接收 (键, 方程式)，返回分析结果
+
+    启动完成后先发送一条就绪消息，主进程从分配任务时才开始计时，
+    进程启动和导入模块的时间不计入单个方程式的时限。
+
+    Args:
+        conn: 与主进程通信的管道
+        time_budget: 每个中间结果的时间预算
+        use_cache: 是否使用持久化分析缓存
+    """
+    conn.send((None, None))
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        key, equation = task
+        try:
+            result = analyze_equation(equation, time_budget, use_cache)
+            result['status'] = 'ok'
+        except Exception as e:
+            result = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+        try:
+            conn.send((key, result))
+        except OSError:
+            # 主进程已退出
+            return
+
+
+class BatchAnalyzer:
+    """批量分析器类
+
+    每个工作进程一次只分析一个方程式，超过单个方程式的时限时直接终止该进程并换上新进程；
+    结果逐行追加到JSON Lines文件并立即刷新，重新运行时跳过已有记录，崩溃后可以续跑。
+    工作进程连续启动失败（如导入依赖出错）达到MAX_STARTUP_FAILURES次后不再启动新进程，
+    没有可用进程时剩余的方程式记为错误。
+    """
+
+    # 连续启动失败的次数上限
+    MAX_STARTUP_FAILURES = 3
+
+    def __init__(self, workers=None, timeout=60.0, time_budget=None, use_cache=True):
+        """初始化批量分析器
+
+        Args:
+            workers: 工作进程数，为None时使用CPU核数
+            timeout: 单个方程式的总时限（秒）
+            time_budget: 每个中间结果的时间预算（秒）
+            use_cache: 是否使用持久化分析缓存
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.time_budget = time_budget
+        self.use_cache = use_cache
+        self.context = multiprocessing.get_context('spawn')
+
+    @staticmethod
+    def completed_keys(output):
+        """读取输出文件中已完成的记录键，忽略崩溃时写了一半的行
+
+        Args:
+            output: JSON Lines输出文件路径
+
+        Returns:
+            set: 已完成的记录键
+        """
+        keys = set()
+        if not os.path.exists(output):
+            return keys
+        with open(output, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    keys.add(json.loads(line)['key'])
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return keys
+
+    def run(self, records, output, progress=None):
+        """分析所有记录并把结果追加到输出文件
+
+        Args:
+            records: (来源文件, 行号, 方程式) 的列表
+            output: JSON Lines输出文件路径
+            progress: 可选的回调，每完成一条调用一次，参数为(已完成数, 总数, 结果记录)
+
+        Returns:
+            dict: 各状态的数量统计
+        """
+        done_keys = self.completed_keys(output)
+        pending = []
+        meta = {}
+        for source, line, equation in records:
+            key = record_key(source, line, equation)
+            if key in done_keys or key in meta:
+                continue
+            meta[key] = {'key': key, 'source': source, 'line': line, 'equation': equation}
+            pending.append((key, equation))
+
+        counts = {'ok': 0, 'error': 0, 'timeout': 0, 'skipped': len(records) - len(pending)}
+        if not pending:
+            return counts
+
+        total = len(pending)
+        pending.reverse()
+        busy = {}
+        idle = []
+        starting = dict(self._spawn() for _ in range(min(self.workers, total)))
+        startup_failures = 0
+
+        # 若上次崩溃时最后一行不完整，先补一个换行再追加
+        if os.path.exists(output) and os.path.getsize(output):
+            with open(output, 'rb+') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+
+        with open(output, 'a', encoding='utf-8') as out:
+
+            def emit(key, result):
+                record = dict(meta[key], **result)
+                counts[record['status']] += 1
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                out.flush()
+                if progress:
+                    progress(sum(counts[s] for s in ('ok', 'error', 'timeout')), total, record)
+
+            def replace_worker():
+                # 还有待分析的方程式且启动没有反复失败时才换上新进程
+                if pending and startup_failures < self.MAX_STARTUP_FAILURES:
+                    starting.update([self._spawn()])
+
+            try:
+                while pending or busy:
+                    # 给空闲进程分配任务
+                    while idle and pending:
+                        worker = idle.pop()
+                        key, equation = pending.pop()
+                        worker[1].send((key, equation))
+                        busy[worker[1]] = (worker, key, time.monotonic() + self.timeout)
+
+                    # 没有任何可用进程（反复启动失败）时，剩余的方程式记为错误
+                    if pending and not (idle or busy or starting):
+                        while pending:
+                            key, _ = pending.pop()
+                            emit(key, {
+                                'status': 'error',
+                                'error': f"worker process failed to start {startup_failures} times in a row",
+                            })
+                        break
+
+                    timeout = None
+                    if busy:
+                        next_deadline = min(deadline for _, _, deadline in busy.values())
+                        timeout = max(0.0, next_deadline - time.monotonic())
+                    ready = wait(list(busy) + list(starting), timeout=timeout)
+
+                    for conn in ready:
+                        if conn in starting:
+                            # 新进程就绪（启动失败时再换一个）
+                            worker = starting.pop(conn)
+                            try:
+                                conn.recv()
+                                idle.append(worker)
+                                startup_failures = 0
+                            except (EOFError, OSError):
+                                self._stop(worker)
+                                startup_failures += 1
+                                replace_worker()
+                            continue
+
+                        worker, key, _ = busy.pop(conn)
+                        try:
+                            _, result = conn.recv()
+                        except (EOFError, OSError):
+                            # 工作进程意外退出（如内存耗尽），换一个新进程
+                            result = {'status': 'error', 'error': 'worker process died'}
+                            self._stop(worker)
+                            replace_worker()
+                        else:
+                            idle.append(worker)
+                        emit(key, result)
+
+                    # 终止超时的进程
+                    now = time.monotonic()
+                    for conn, (worker, key, deadline) in list(busy.items()):
+                        if now >= deadline:
+                            del busy[conn]
+                            self._stop(worker)
+                            emit(key, {'status': 'timeout', 'error': f"exceeded {self.timeout} s"})
+                            replace_worker()
+            finally:
+                for worker in idle + list(starting.values()) + [entry[0] for entry in busy.values()]:
+                    self._stop(worker, graceful=True)
+
+        return counts
+
+    def _spawn(self):
+        """启动一个工作进程
+
+        Returns:
+            tuple: (主进程端管道, (进程对象, 主进程端管道))
+        """
+        parent_conn, child_conn = self.context.Pipe()
+        process = self.context.Process(
+            target=_worker_loop, args=(child_conn, self.time_budget, self.use_cache), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return parent_conn, (process, parent_conn)
+
+    @staticmethod
+    def _stop(worker, graceful=False):
+        """停止工作进程
+
+        Args:
+            worker: (进程对象, 管道)
+            graceful: 是否先发送退出消息等待其自行结束
+        """
+        process, conn = worker
+        if graceful:
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+            process.join(1.0)
+        if process.is_alive():
+            process.terminate()
+            process.join(1.0)
+        conn.close()
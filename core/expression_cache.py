@@ -0,0 +1,255 @@
+"""
+表达式缓存模块 - 缓存解析、编译和LaTeX渲染结果
+"""
+
+import math
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import sympy as sp
+from sympy.parsing.sympy_parser import parse_expr
+
+
+# 曲线类型：y = f(x)、参数方程 (x(t), y(t)) 和极坐标方程 r = f(θ)
+CARTESIAN = 'cartesian'
+PARAMETRIC = 'parametric'
+POLAR = 'polar'
+
+# 参数方程未给出参数范围时使用的默认范围
+DEFAULT_PARAMETER_RANGE = (0.0, 2 * math.pi)
+
+# 极坐标方程的θ范围最多覆盖的圈数
+MAX_POLAR_TURNS = 12
+
+# 规范化时先把连续空白压缩为一个空格，再去除至少一侧不是标识符字符的空格
+_SEPARATING_SPACE = re.compile(r'\s+')
+_REDUNDANT_SPACE = re.compile(r'(?<!\w) | (?!\w)')
+
+# 编译结果：sympy表达式、numpy可调用对象、LaTeX标签、曲线类型、自变量和参数范围
+# 参数方程的表达式是 sp.Tuple(x(t), y(t))，函数一次调用同时返回两个分量；
+# 极坐标方程的表达式是 r(θ)，函数同样返回 (x, y) 两个分量
+CompiledExpression = namedtuple(
+    'CompiledExpression', ['expr', 'func', 'label', 'kind', 'variable', 'domain'],
+    defaults=(CARTESIAN, sp.Symbol('x'), None)
+)
+
+
+class ExpressionCache:
+    """表达式缓存类，以规范化的方程式和解析设置为键的有界LRU缓存"""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, maxsize=256):
+        """初始化缓存
+
+        Args:
+            maxsize: 最多缓存的表达式数量
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """获取进程内共享的缓存实例
+
+        界面线程和实时编译的工作线程都会调用，首次创建时加锁，保证只有一个实例。
+
+        Returns:
+            ExpressionCache: 共享缓存
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def normalize(equation):
+        """规范化方程式字符串，用作缓存和增量重绘的键
+
+        去除不影响含义的空白；两侧都是字母、数字或下划线的空白会被隐式乘法解析为乘号
+        （t cos(t) 与 tcos(t) 含义不同），压缩为一个空格保留。
+
+        Args:
+            equation: 方程式字符串
+
+        Returns:
+            str: 规范化后的字符串
+        """
+        return _REDUNDANT_SPACE.sub('', _SEPARATING_SPACE.sub(' ', equation.strip()))
+
+    def compile(self, equation, local_dict, transformations, modules_dict):
+        """解析并编译方程式，命中缓存时直接返回
+
+        Args:
+            equation: 方程式字符串
+            local_dict: 本地字典，用于parse_expr
+            transformations: 转换列表，用于parse_expr
+            modules_dict: 模块字典，用于lambdify
+
+        Returns:
+            CompiledExpression: 编译结果
+
+        Raises:
+            Exception: 解析或编译失败时抛出原始异常，失败结果不会被缓存
+        """
+        key = (
+            self.normalize(equation),
+            tuple(transformations),
+            frozenset(local_dict.items()),
+            frozenset(modules_dict.items()),
+        )
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # 解析调用方的原始文本，规范化只用于缓存键
+        if key[0].startswith('r='):
+            entry = self._compile_polar(equation.split('=', 1)[1], local_dict, transformations, modules_dict)
+        else:
+            x = sp.symbols('x')
+            expr = parse_expr(equation, transformations=transformations, local_dict=local_dict)
+            if isinstance(expr, (tuple, sp.Tuple)):
+                entry = self._compile_parametric(expr, modules_dict)
+            else:
+                func = sp.lambdify(x, expr, modules=[modules_dict, "numpy"])
+                entry = CompiledExpression(expr, func, self._latex(expr))
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return entry
+
+    @staticmethod
+    def _compile_parametric(components, modules_dict):
+        """编译参数方程 (x(t), y(t)) 或 (x(t), y(t), t_min, t_max)
+
+        两个分量编译为同一个函数，对t数组一次调用同时得到x和y。
+
+        Args:
+            components: 解析得到的元组
+            modules_dict: 模块字典，用于lambdify
+
+        Returns:
+            CompiledExpression: 编译结果
+
+        Raises:
+            ValueError: 元组长度不对或参数范围不是数值
+        """
+        if len(components) not in (2, 4):
+            raise ValueError("parametric curves are written as (x(t), y(t)) or (x(t), y(t), t_min, t_max)")
+
+        t = sp.symbols('t')
+        x_expr, y_expr = (sp.sympify(component) for component in components[:2])
+        if len(components) == 4:
+            try:
+                domain = tuple(float(bound) for bound in components[2:])
+            except TypeError as e:
+                raise ValueError("parameter range must be numeric") from e
+            if not domain[0] < domain[1]:
+                raise ValueError("parameter range must satisfy t_min < t_max")
+        else:
+            domain = DEFAULT_PARAMETER_RANGE
+
+        expr = sp.Tuple(x_expr, y_expr)
+        func = sp.lambdify(t, (x_expr, y_expr), modules=[modules_dict, "numpy"])
+        label = f"\\left({ExpressionCache._latex(x_expr)},\\ {ExpressionCache._latex(y_expr)}\\right)"
+        return CompiledExpression(expr, func, label, PARAMETRIC, t, domain)
+
+    @staticmethod
+    def _compile_polar(equation, local_dict, transformations, modules_dict):
+        """编译极坐标方程 r = f(θ)，θ也可以写作theta
+
+        r(θ) 只编译一次，返回的函数对θ数组求出r后直接换算为 (x, y)；
+        θ范围由周期决定，见polar_domain。
+
+        Args:
+            equation: 等号右边的表达式字符串
+            local_dict: 本地字典，用于parse_expr
+            transformations: 转换列表，用于parse_expr
+            modules_dict: 模块字典，用于lambdify
+
+        Returns:
+            CompiledExpression: 编译结果
+        """
+        theta = sp.symbols('theta')
+        expr = parse_expr(
+            equation.replace('θ', 'theta'), transformations=transformations,
+            local_dict=dict(local_dict, theta=theta)
+        )
+        r_func = sp.lambdify(theta, expr, modules=[modules_dict, "numpy"])
+
+        def xy_func(theta_vals):
+            r_vals = r_func(theta_vals)
+            return r_vals * np.cos(theta_vals), r_vals * np.sin(theta_vals)
+
+        label = f"r = {ExpressionCache._latex(expr)}"
+        return CompiledExpression(expr, xy_func, label, POLAR, theta, ExpressionCache.polar_domain(expr, theta))
+
+    @staticmethod
+    def polar_domain(expr, theta):
+        """根据r(θ)的周期选择θ范围
+
+        曲线在θ转过2π的整数倍、且恰好经过整数个周期后闭合，
+        取满足这两点的最小范围：sin(2θ) 为0..2π，sin(θ/2) 为0..4π。
+        没有周期、周期与π之比不是有理数或需要的圈数过多时使用0..2π。
+
+        Args:
+            expr: r关于θ的sympy表达式
+            theta: θ符号
+
+        Returns:
+            tuple: (θ最小值, θ最大值)
+        """
+        try:
+            period = sp.periodicity(expr, theta)
+        except Exception:
+            period = None
+        if period:
+            ratio = sp.nsimplify(period / (2 * sp.pi))
+            if ratio.is_Rational and 0 < ratio.p <= MAX_POLAR_TURNS:
+                return (0.0, float(2 * sp.pi * ratio.p))
+        return DEFAULT_PARAMETER_RANGE
+
+    @staticmethod
+    def _latex(expr):
+        """渲染LaTeX标签，失败时回退到字符串表示"""
+        try:
+            return sp.latex(expr)
+        except Exception:
+            return str(expr)
+
+    def stats(self):
+        """获取缓存统计信息
+
+        Returns:
+            dict: 包含命中数、未命中数、当前大小和容量的字典
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+    def clear(self):
+        """清空缓存并重置统计"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
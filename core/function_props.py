@@ -2,79 +2,181 @@
 函数属性计算模块 - 提供数学函数分析功能
 """
 
+import time
+from itertools import combinations
+
 import sympy as sp
 import numpy as np
 
+from core.analysis_graph import AnalysisGraph
+from core.numeric import ApproximateResult, NumericSolver
+from core.sampling import evaluate
+from core.time_budget import AnalysisTimeout
+
 
 class FunctionAnalyzer:
     """函数分析器类，用于计算函数的各种数学属性"""
     
+    # 分析器版本，分析逻辑或结果格式变化时递增，使持久化缓存失效
+    VERSION = '3'
+    
+    # 每个符号计算中间结果的时间预算（秒）
+    TIME_BUDGET = 2.0
+    
+    # 批量求交点时每块差值矩阵的最大元素数
+    INTERSECTION_CHUNK = 2_000_000
+    
+    # 折线求交时每块的线段数
+    SEGMENT_BLOCK = 32
+    
     @staticmethod
-    def compute_function_properties(expr):
+    def compute_function_properties(expr, time_budget=None):
         """计算函数的各种数学属性
         
         Args:
             expr: sympy表达式对象
+            time_budget: 每个中间结果的时间预算（秒），为None时使用TIME_BUDGET
             
         Returns:
             dict: 包含函数属性的字典
         """
-        x = sp.symbols('x')
-        properties = {}
+        return dict(FunctionAnalyzer.iter_function_properties(expr, time_budget))
+    
+    @staticmethod
+    def make_graph(expr, time_budget=None):
+        """创建分析依赖图
         
-        # 计算零点（x轴交点）
-        try:
-            x_intercepts = sp.solve(expr, x)
-            properties['X-Intercepts'] = x_intercepts
-        except Exception:
-            properties['X-Intercepts'] = 'Unable to calculate x-intercepts.'
+        Args:
+            expr: sympy表达式对象
+            time_budget: 每个中间结果的时间预算（秒），为None时使用TIME_BUDGET
+            
+        Returns:
+            AnalysisGraph: 依赖图
+        """
+        return AnalysisGraph(expr, FunctionAnalyzer.TIME_BUDGET if time_budget is None else time_budget)
+    
+    @staticmethod
+    def iter_function_properties(expr, time_budget=None, graph=None):
+        """逐项计算函数的数学属性，每算完一项立即产出
         
-        # 计算y轴交点
-        try:
-            y_intercept = expr.subs(x, 0)
-            properties['Y-Intercept'] = y_intercept
-        except Exception:
-            properties['Y-Intercept'] = 'Unable to calculate y-intercept.'
+        各属性通过依赖图共享导数、临界点、极限和定义域等中间结果，
+        每个中间结果只计算一次，且都在时间预算内进行；超时后改用数值方法，
+        得到的结果以ApproximateResult标记为近似值。
+        同一属性可能先产出计算结果、随后被错误信息覆盖，
+        使用方应按字典更新的方式合并。
+        
+        Args:
+            expr: sympy表达式对象
+            time_budget: 每个中间结果的时间预算（秒），为None时使用TIME_BUDGET
+            graph: 可选的AnalysisGraph，传入时可在计算后读取其计时数据和超时标志
+            
+        Yields:
+            tuple: (属性名, 属性值)
+        """
+        if graph is None:
+            graph = FunctionAnalyzer.make_graph(expr, time_budget)
         
-        # 计算函数末端行为
+        sections = [
+            ('X-Intercepts', FunctionAnalyzer._x_intercepts),
+            ('Y-Intercept', FunctionAnalyzer._y_intercept),
+            ('Function End Behavior', FunctionAnalyzer._end_behavior),
+            ('Derivative', FunctionAnalyzer._derivative),
+            ('Domain', FunctionAnalyzer._domain),
+            ('Range', FunctionAnalyzer._range),
+            ('Asymptotes', FunctionAnalyzer._asymptotes),
+            ('Extrema', FunctionAnalyzer._extrema),
+        ]
+        
+        for section_name, section in sections:
+            start = time.perf_counter()
+            items = section(graph)
+            graph.property_timings[section_name] = time.perf_counter() - start
+            yield from items
+    
+    @staticmethod
+    def _x_intercepts(graph):
+        """计算零点（x轴交点），符号求解失败、超时或无解时使用数值零点"""
         try:
-            limit_pos_inf = sp.limit(expr, x, sp.oo)
-            limit_neg_inf = sp.limit(expr, x, -sp.oo)
-            properties['Function End Behavior'] = {'x→∞': limit_pos_inf, 'x→-∞': limit_neg_inf}
+            x_intercepts = graph.get('x_intercepts')
+            if x_intercepts:
+                return [('X-Intercepts', x_intercepts)]
         except Exception:
-            properties['Function End Behavior'] = 'Unable to calculate function end behavior.'
-        
-        # 计算一阶导数和临界点
+            x_intercepts = 'Unable to calculate x-intercepts.'
+        return [('X-Intercepts', FunctionAnalyzer._numeric_zeros(graph, 0, x_intercepts))]
+    
+    @staticmethod
+    def _y_intercept(graph):
+        """计算y轴交点"""
         try:
-            derivative = sp.diff(expr, x)
-            properties['First Derivative'] = derivative
-            critical_points = sp.solve(derivative, x)
-            properties['Critical Points'] = critical_points
+            return [('Y-Intercept', graph.get('y_intercept'))]
+        except AnalysisTimeout:
+            return [('Y-Intercept', FunctionAnalyzer._approximate(
+                lambda: float(evaluate(graph.get('numeric_func'), [0.0])[0]),
+                "numeric evaluation",
+                'Unable to calculate y-intercept.'
+            ))]
         except Exception:
-            properties['First Derivative'] = 'Unable to calculate first derivative.'
-            properties['Critical Points'] = 'Unable to calculate critical points.'
-        
-        # 计算定义域
+            return [('Y-Intercept', 'Unable to calculate y-intercept.')]
+    
+    @staticmethod
+    def _end_behavior(graph):
+        """计算函数末端行为"""
         try:
-            domain = sp.calculus.util.continuous_domain(expr, x, sp.S.Reals)
-            properties['Domain'] = domain
+            limits = {'x→∞': graph.get('limit_pos_inf'), 'x→-∞': graph.get('limit_neg_inf')}
+            return [('Function End Behavior', limits)]
+        except AnalysisTimeout:
+            return [('Function End Behavior', FunctionAnalyzer._approximate(
+                lambda: FunctionAnalyzer._numeric_limits(graph),
+                "numeric extrapolation",
+                'Unable to calculate function end behavior.'
+            ))]
         except Exception:
-            properties['Domain'] = 'Unable to calculate domain.'
-        
-        # 计算值域
+            return [('Function End Behavior', 'Unable to calculate function end behavior.')]
+    
+    @staticmethod
+    def _derivative(graph):
+        """计算一阶导数和临界点"""
         try:
-            critical_points = sp.solve(sp.diff(expr, x), x)
-            test_points = critical_points.copy()
+            items = [('First Derivative', graph.get('derivative'))]
             
-            # 添加定义域的边界点进行测试
+            # 符号求解失败、超时或无解时使用数值零点
             try:
-                test_points.append(domain.inf)
-                test_points.append(domain.sup)
-            except (AttributeError, TypeError):
-                pass
-            
+                critical_points = graph.get('critical_points')
+            except Exception:
+                critical_points = 'Unable to calculate critical points.'
+            if not critical_points or isinstance(critical_points, str):
+                critical_points = FunctionAnalyzer._numeric_zeros(graph, 1, critical_points)
+            items.append(('Critical Points', critical_points))
+            return items
+        except Exception:
+            return [
+                ('First Derivative', 'Unable to calculate first derivative.'),
+                ('Critical Points', 'Unable to calculate critical points.'),
+            ]
+    
+    @staticmethod
+    def _domain(graph):
+        """计算定义域"""
+        try:
+            return [('Domain', graph.get('domain'))]
+        except AnalysisTimeout:
+            return [('Domain', FunctionAnalyzer._approximate(
+                lambda: NumericSolver.finite_intervals(graph.get('numeric_func'), *NumericSolver.DEFAULT_RANGE),
+                f"finite intervals {FunctionAnalyzer._window()}",
+                'Unable to calculate domain.'
+            ))]
+        except Exception:
+            return [('Domain', 'Unable to calculate domain.')]
+    
+    @staticmethod
+    def _range(graph):
+        """计算值域"""
+        x = graph.x
+        expr = graph.expr
+        
+        def real_values(points):
             y_vals = []
-            for point in test_points:
+            for point in points:
                 if point is not None and (point.is_real or point.is_infinite):
                     try:
                         y_val = expr.subs(x, point).evalf()
@@ -82,55 +184,103 @@ class FunctionAnalyzer:
                             y_vals.append(y_val)
                     except Exception:
                         continue
+            return y_vals
+        
+        try:
+            test_points = list(graph.get('critical_points'))
+            
+            # 添加定义域的边界点进行测试（定义域超时则跳过）
+            try:
+                domain = graph.get('domain')
+            except AnalysisTimeout:
+                domain = None
+            try:
+                test_points.append(domain.inf)
+                test_points.append(domain.sup)
+            except (AttributeError, TypeError):
+                pass
+            
+            y_vals = graph.timed('range_values', real_values, test_points)
+            if not y_vals:
+                return [('Range', 'Unable to calculate range.')]
             
             # 确定值域的上下界
-            if y_vals:
-                y_min = min(y_vals)
-                y_max = max(y_vals)
-                
-                # 检查函数在无穷处的极限
-                limit_pos_inf = sp.limit(expr, x, sp.oo)
-                limit_neg_inf = sp.limit(expr, x, -sp.oo)
-                
-                if limit_pos_inf == sp.oo or limit_neg_inf == sp.oo:
-                    y_max = '∞'
-                if limit_pos_inf == -sp.oo or limit_neg_inf == -sp.oo:
-                    y_min = '-∞'
-                
-                properties['Range'] = f"[{y_min}, {y_max}]"
-            else:
-                properties['Range'] = 'Unable to calculate range.'
+            y_min = min(y_vals)
+            y_max = max(y_vals)
+            
+            # 检查函数在无穷处的极限
+            limit_pos_inf = graph.get('limit_pos_inf')
+            limit_neg_inf = graph.get('limit_neg_inf')
+            
+            if limit_pos_inf == sp.oo or limit_neg_inf == sp.oo:
+                y_max = '∞'
+            if limit_pos_inf == -sp.oo or limit_neg_inf == -sp.oo:
+                y_min = '-∞'
+            
+            return [('Range', f"[{y_min}, {y_max}]")]
+        except AnalysisTimeout:
+            return [('Range', FunctionAnalyzer._approximate(
+                lambda: list(NumericSolver.sampled_range(graph.get('numeric_func'), *NumericSolver.DEFAULT_RANGE)),
+                f"min/max {FunctionAnalyzer._window()}",
+                'Unable to calculate range.'
+            ))]
         except Exception:
-            properties['Range'] = 'Unable to calculate range.'
+            return [('Range', 'Unable to calculate range.')]
+    
+    @staticmethod
+    def _asymptotes(graph):
+        """计算不连续点和渐近线
         
-        # 计算不连续点和渐近线
+        垂直与水平渐近线分别处理，一部分失败不影响另一部分，每个属性名只出现一次。
+        """
+        items = []
         try:
-            discontinuities = sp.calculus.util.discontinuities(expr, x, sp.S.Reals)
+            discontinuities = graph.get('discontinuities')
             if discontinuities:
-                properties['Vertical Asymptotes'] = list(discontinuities)
-                properties['Discontinuities'] = list(discontinuities)
+                items.append(('Vertical Asymptotes', list(discontinuities)))
+                items.append(('Discontinuities', list(discontinuities)))
             else:
-                properties['Vertical Asymptotes'] = 'No vertical asymptotes.'
-                properties['Discontinuities'] = 'No discontinuities.'
-            
-            # 检查水平渐近线
-            limit_pos_inf = sp.limit(expr, x, sp.oo)
-            limit_neg_inf = sp.limit(expr, x, -sp.oo)
-            
-            if limit_pos_inf.is_finite and limit_neg_inf.is_finite:
-                # Always use 'Horizontal Asymptotes' (plural) and a consistent dictionary structure
-                properties['Horizontal Asymptotes'] = {'x→∞': limit_pos_inf, 'x→-∞': limit_neg_inf}
-            else:
-                properties['Horizontal Asymptotes'] = 'No horizontal asymptotes.'
+                items.append(('Vertical Asymptotes', 'No vertical asymptotes.'))
+                items.append(('Discontinuities', 'No discontinuities.'))
+        except AnalysisTimeout:
+            jumps = FunctionAnalyzer._approximate(
+                lambda: NumericSolver.jump_points(graph.get('numeric_func'), *NumericSolver.DEFAULT_RANGE),
+                f"jump detection {FunctionAnalyzer._window()}",
+                'Unable to calculate discontinuities.'
+            )
+            items.append(('Vertical Asymptotes', jumps))
+            items.append(('Discontinuities', jumps))
         except Exception:
-            properties['Asymptotes'] = 'Unable to calculate asymptotes.'
-            properties['Discontinuities'] = 'Unable to calculate discontinuities.'
+            items.append(('Vertical Asymptotes', 'Unable to calculate asymptotes.'))
+            items.append(('Discontinuities', 'Unable to calculate discontinuities.'))
         
-        # 计算二阶导数和极值
+        # 检查水平渐近线
         try:
-            second_derivative = sp.diff(expr, x, 2)
-            properties['Second Derivative'] = second_derivative
-            
+            try:
+                limit_pos_inf = graph.get('limit_pos_inf')
+                limit_neg_inf = graph.get('limit_neg_inf')
+                if limit_pos_inf.is_finite and limit_neg_inf.is_finite:
+                    # Always use 'Horizontal Asymptotes' (plural) and a consistent dictionary structure
+                    items.append(('Horizontal Asymptotes', {'x→∞': limit_pos_inf, 'x→-∞': limit_neg_inf}))
+                else:
+                    items.append(('Horizontal Asymptotes', 'No horizontal asymptotes.'))
+            except AnalysisTimeout:
+                limits = FunctionAnalyzer._numeric_limits(graph)
+                if all(value is not None and abs(value) != sp.oo for value in limits.values()):
+                    items.append(('Horizontal Asymptotes', ApproximateResult(limits, "numeric extrapolation")))
+                else:
+                    items.append(('Horizontal Asymptotes', 'No horizontal asymptotes.'))
+        except Exception:
+            items.append(('Horizontal Asymptotes', 'Unable to calculate asymptotes.'))
+        return items
+    
+    @staticmethod
+    def _extrema(graph):
+        """计算二阶导数和极值"""
+        x = graph.x
+        expr = graph.expr
+        
+        def classify(second_derivative, critical_points):
             # 分析临界点的性质
             extrema = []
             for cp in critical_points:
@@ -145,61 +295,597 @@ class FunctionAnalyzer:
                             extrema.append((cp, f_cp, 'Local Maximum'))
                         else:
                             extrema.append((cp, f_cp, 'Inflection Point'))
+            return extrema
+        
+        items = []
+        try:
+            second_derivative = graph.get('second_derivative')
+            items.append(('Second Derivative', second_derivative))
             
-            properties['Extrema'] = extrema
+            try:
+                critical_points = graph.get('critical_points')
+            except Exception:
+                critical_points = []
+            if not critical_points:
+                critical_points = [sp.Float(cp.x) for cp in graph.get('numeric_zeros')[1]]
+            
+            items.append(('Extrema', graph.timed('extrema', classify, second_derivative, critical_points)))
+            return items
+        except AnalysisTimeout:
+            return items + [('Extrema', FunctionAnalyzer._approximate(
+                lambda: FunctionAnalyzer._numeric_extrema(graph),
+                f"derivative zeros {FunctionAnalyzer._window()}",
+                'Unable to calculate extrema.'
+            ))]
         except Exception:
-            properties['Extrema'] = 'Unable to calculate extrema.'
+            return items + [('Extrema', 'Unable to calculate extrema.')]
+    
+    @staticmethod
+    def _window():
+        """数值方法搜索区间的说明文字"""
+        x_min, x_max = NumericSolver.DEFAULT_RANGE
+        return f"sampled on [{x_min}, {x_max}]"
+    
+    @staticmethod
+    def _approximate(compute, method, failure):
+        """执行数值回退计算，失败时返回错误信息
         
-        return properties
+        Args:
+            compute: 数值计算函数
+            method: 数值方法说明
+            failure: 失败时返回的信息
+            
+        Returns:
+            ApproximateResult或失败信息
+        """
+        try:
+            return ApproximateResult(compute(), method)
+        except Exception:
+            return failure
     
     @staticmethod
-    def find_intersections(y_funcs_list, x_vals):
+    def _numeric_limits(graph):
+        """数值估计x趋于正负无穷时的极限"""
+        func = graph.get('numeric_func')
+        return {
+            'x→∞': NumericSolver.estimate_limit(func, 1),
+            'x→-∞': NumericSolver.estimate_limit(func, -1),
+        }
+    
+    @staticmethod
+    def _numeric_zeros(graph, which, fallback):
+        """取数值求得的f（which=0）或f'（which=1）的零点
+        
+        Args:
+            graph: 分析依赖图
+            which: 0表示f的零点，1表示f'的零点
+            fallback: 数值方法也失败或找不到零点时返回的值
+            
+        Returns:
+            ApproximateResult或fallback
+        """
+        try:
+            zeros = graph.get('numeric_zeros')[which]
+        except Exception:
+            return fallback
+        if not zeros:
+            return fallback
+        return ApproximateResult(zeros, f"sign changes and near-zero minima {FunctionAnalyzer._window()}, Brent-polished")
+    
+    @staticmethod
+    def _numeric_extrema(graph):
+        """根据数值临界点两侧导数的符号判断极值
+        
+        Args:
+            graph: 分析依赖图
+            
+        Returns:
+            list: (x, y, 类型) 元组列表
+        """
+        func = graph.get('numeric_func')
+        try:
+            slope = graph.get('numeric_derivative')
+        except Exception:
+            slope = NumericSolver.central_difference(func)
+        
+        extrema = []
+        for cp in graph.get('numeric_zeros')[1]:
+            step = max(1e-6, 10 * cp.error)
+            left, right = evaluate(slope, [cp.x - step, cp.x + step])
+            y_cp = round(float(evaluate(func, [cp.x])[0]), NumericSolver.DECIMALS)
+            x_cp = round(cp.x, NumericSolver.DECIMALS)
+            if left < 0 < right:
+                extrema.append((x_cp, y_cp, 'Local Minimum'))
+            elif left > 0 > right:
+                extrema.append((x_cp, y_cp, 'Local Maximum'))
+        return extrema
+    
+    @staticmethod
+    def find_intersections(y_funcs_list, x_vals, prune=True):
         """查找函数交点
         
+        所有函数在同一网格上各求值一次，再对所有函数对批量查找差值的
+        符号变化和接近零的局部极小值（相切交点，或同一采样间隔内的两个交点），
+        最后把所有候选一起批量精化到机器精度。结果基本不依赖采样密度，
+        较粗的网格也不会漏掉相切的交点。
+        
         Args:
             y_funcs_list: 函数列表
             x_vals: x值数组
+            prune: 是否先按y值范围扫描剔除不可能相交的函数对
             
         Returns:
             list: 交点列表，每个元素为(x, y)坐标
         """
-        from itertools import combinations
+        by_pair = FunctionAnalyzer.find_pair_intersections(y_funcs_list, x_vals, prune=prune)
+        return FunctionAnalyzer._unique_points([point for points in by_pair.values() for point in points])
+    
+    @staticmethod
+    def find_pair_intersections(y_funcs_list, x_vals, curves=None, prune=True):
+        """按函数对查找交点，可以只查找涉及部分曲线的函数对
         
-        intersections = []
-        combinations_indices = list(combinations(range(len(y_funcs_list)), 2))
+        方法与find_intersections相同；增量重绘时只对包含新增或修改曲线的函数对调用。
+        
+        Args:
+            y_funcs_list: 函数列表
+            x_vals: x值数组
+            curves: 曲线下标的集合，只查找至少包含其中一条曲线的函数对；为None时查找所有函数对
+            prune: 是否先按y值范围扫描剔除不可能相交的函数对
+            
+        Returns:
+            dict: {(i, j): 交点列表}，i < j，没有交点的函数对不出现
+        """
+        x_vals = np.asarray(x_vals, dtype=float)
+        if len(y_funcs_list) < 2 or x_vals.size < 3:
+            return {}
+        if curves is not None and not curves:
+            return {}
         
         # 计算所有函数的y值
-        y_vals_list = []
-        for y_func in y_funcs_list:
-            y_vals = y_func(x_vals)
-            y_vals_list.append(y_vals)
-        
-        # 对每对函数查找交点
-        for i, j in combinations_indices:
-            y_vals1 = y_vals_list[i]
-            y_vals2 = y_vals_list[j]
-            
-            # 计算差值并处理无穷和NaN
-            diff = y_vals1 - y_vals2
-            diff = np.where(np.isnan(diff), np.inf, diff)
-            diff = np.where(np.isinf(diff), np.inf, diff)
-            
-            # 查找符号变化的位置（表示交点）
-            sign_diff = np.sign(diff)
-            sign_changes = np.where(np.diff(sign_diff) != 0)[0]
-            
-            # 对每个符号变化位置进行线性插值以找到精确交点
-            for idx in sign_changes:
-                x1, x2 = x_vals[idx], x_vals[idx + 1]
-                y1_diff, y2_diff = diff[idx], diff[idx + 1]
-                
-                if np.isfinite(y1_diff) and np.isfinite(y2_diff):
-                    # 线性插值计算交点的x坐标
-                    x_zero = x1 - y1_diff * (x2 - x1) / (y2_diff - y1_diff)
-                    # 计算交点的y坐标
-                    y_zero = y_funcs_list[i](x_zero)
-                    intersections.append((x_zero, y_zero))
-        
-        # 移除重复的交点（考虑浮点误差）
-        unique_intersections = list({(round(x, 5), round(y, 5)) for x, y in intersections})
-        return unique_intersections
+        y_matrix = np.vstack([evaluate(y_func, x_vals) for y_func in y_funcs_list])
+        
+        # 候选函数对
+        if prune:
+            pairs = FunctionAnalyzer._overlapping_pairs(y_matrix)
+        else:
+            pairs = np.array(list(combinations(range(len(y_funcs_list)), 2)), dtype=int).reshape(-1, 2)
+        if curves is not None:
+            selected = np.fromiter(curves, dtype=int)
+            pairs = pairs[np.isin(pairs[:, 0], selected) | np.isin(pairs[:, 1], selected)]
+        if not pairs.size:
+            return {}
+        
+        # 分块批量查找符号变化和|差值|的局部极小值，避免函数对很多时占用过多内存
+        crossings, touchings = [], []
+        chunk = max(1, FunctionAnalyzer.INTERSECTION_CHUNK // x_vals.size)
+        for start in range(0, len(pairs), chunk):
+            block = pairs[start:start + chunk]
+            with np.errstate(invalid='ignore'):
+                diff = y_matrix[block[:, 0]] - y_matrix[block[:, 1]]
+            
+            rows, cols = FunctionAnalyzer._sign_changes(diff)
+            crossings.append((block[rows, 0], block[rows, 1], x_vals[cols], x_vals[cols + 1],
+                              diff[rows, cols], diff[rows, cols + 1]))
+            
+            rows, cols, vertex = FunctionAnalyzer._near_zero_minima(diff, x_vals)
+            touchings.append((block[rows, 0], block[rows, 1], x_vals[cols - 1], x_vals[cols + 1],
+                              vertex, diff[rows, cols]))
+        
+        # 紧靠极点的交点与极点落在同一采样区间时差值在区间两端同号，会被漏掉；
+        # 在极点处把区间一分为二，每个交点都有自己的含根区间，结果不依赖网格
+        crossings.append(FunctionAnalyzer._pole_brackets(y_funcs_list, y_matrix, x_vals, pairs))
+        crossings = [np.concatenate(column) for column in zip(*crossings)]
+        first, second, left, right, vertex, d_mid = (np.concatenate(column) for column in zip(*touchings))
+        
+        # 极小值处抛物线顶点若与两侧异号，说明同一区间内有两个交点，拆成两个含根区间
+        if vertex.size:
+            d_vertex = FunctionAnalyzer._batch_gap(y_funcs_list, first, second)(vertex, np.arange(vertex.size))
+            split = np.isfinite(d_vertex) & (np.sign(d_vertex) != np.sign(d_mid))
+            if np.any(split):
+                d_left = FunctionAnalyzer._batch_gap(y_funcs_list, first[split], second[split])(
+                    left[split], np.arange(np.count_nonzero(split))
+                )
+                d_right = FunctionAnalyzer._batch_gap(y_funcs_list, first[split], second[split])(
+                    right[split], np.arange(np.count_nonzero(split))
+                )
+                extra = (
+                    np.concatenate([first[split], first[split]]),
+                    np.concatenate([second[split], second[split]]),
+                    np.concatenate([left[split], vertex[split]]),
+                    np.concatenate([vertex[split], right[split]]),
+                    np.concatenate([d_left, d_vertex[split]]),
+                    np.concatenate([d_vertex[split], d_right]),
+                )
+                crossings = [np.concatenate([a, b]) for a, b in zip(crossings, extra)]
+            keep = ~split
+            first, second, left, right = first[keep], second[keep], left[keep], right[keep]
+        
+        intersections = FunctionAnalyzer._refine_crossings(y_funcs_list, *crossings)
+        intersections += FunctionAnalyzer._refine_touchings(y_funcs_list, first, second, left, right)
+        
+        by_pair = {}
+        for i, j, x, y in intersections:
+            by_pair.setdefault((i, j), []).append((x, y))
+        return {pair: FunctionAnalyzer._unique_points(points) for pair, points in by_pair.items()}
+    
+    @staticmethod
+    def find_sample_intersections(first, second):
+        """在两条曲线的采样折线之间查找交点
+        
+        用于参数曲线和极坐标曲线：不要求x单调，直接对已缓存的采样折线逐段求交，
+        交点精度与采样的弦高误差相当。第一条折线按每SEGMENT_BLOCK段分块，
+        每块只与包围盒相交的线段求交。
+        
+        Args:
+            first: 第一条曲线的采样 (x值数组, y值数组)
+            second: 第二条曲线的采样 (x值数组, y值数组)
+            
+        Returns:
+            list: 交点列表，每个元素为(x, y)坐标
+        """
+        def segments(samples):
+            points = np.column_stack([np.asarray(values, dtype=float) for values in samples])
+            starts, directions = points[:-1], np.diff(points, axis=0)
+            # 含无定义端点的线段（曲线断开处）不参与求交
+            finite = np.all(np.isfinite(starts) & np.isfinite(directions), axis=1)
+            return starts[finite], directions[finite]
+        
+        def cross(a, b):
+            return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+        
+        p, r = segments(first)
+        q, s = segments(second)
+        if not p.size or not q.size:
+            return []
+        
+        # 第二条折线各线段的包围盒
+        q_low = np.minimum(q, q + s)
+        q_high = np.maximum(q, q + s)
+        
+        points = []
+        block = FunctionAnalyzer.SEGMENT_BLOCK
+        for start in range(0, len(p), block):
+            p_block, r_block = p[start:start + block], r[start:start + block]
+            ends = p_block + r_block
+            low = np.minimum(p_block, ends).min(axis=0)
+            high = np.maximum(p_block, ends).max(axis=0)
+            near = np.flatnonzero(np.all((q_high >= low) & (q_low <= high), axis=1))
+            if not near.size:
+                continue
+            
+            q_near, s_near = q[near][None, :, :], s[near][None, :, :]
+            offset = q_near - p_block[:, None, :]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                denom = cross(r_block[:, None, :], s_near)
+                t = cross(offset, s_near) / denom
+                u = cross(offset, r_block[:, None, :]) / denom
+                # 区间取左闭右开，相邻线段共用的端点只计一次
+                hit = (denom != 0) & (t >= 0) & (t < 1) & (u >= 0) & (u < 1)
+            i, j = np.nonzero(hit)
+            found = p_block[i] + t[i, j, None] * r_block[i]
+            points.extend((float(x), float(y)) for x, y in found)
+        
+        return FunctionAnalyzer._unique_points(points)
+    
+    @staticmethod
+    def _pole_brackets(y_funcs_list, y_matrix, x_vals, pairs):
+        """在函数的奇数阶极点处拆分采样区间，得到极点两侧的含根区间
+        
+        函数值变号但精化后函数值不接近零的位置是极点；恰好落在采样点上的
+        无定义点（两侧有定义）也视为极点。极点位置只取决于函数本身，与网格无关。
+        对包含该函数的每个函数对，极点两侧差值变号的部分区间作为额外候选。
+        
+        Args:
+            y_funcs_list: 函数列表
+            y_matrix: 形状为(函数数, 采样数)的函数值矩阵
+            x_vals: x值数组
+            pairs: 形状为(对数, 2)的候选函数对
+            
+        Returns:
+            tuple: (第一个函数下标, 第二个函数下标, 左端, 右端, 左端差值, 右端差值) 数组
+        """
+        curves, outer_left, outer_right, points, steps = [], [], [], [], []
+        
+        rows, cols = FunctionAnalyzer._sign_changes(y_matrix)
+        if rows.size:
+            def batch_value(t, sub):
+                return FunctionAnalyzer._batch_values(y_funcs_list, rows[sub], t)
+            
+            f_left, f_right = y_matrix[rows, cols], y_matrix[rows, cols + 1]
+            x_zero, error = NumericSolver.refine_brackets(
+                batch_value, x_vals[cols], x_vals[cols + 1], f_left, f_right
+            )
+            residual = batch_value(x_zero, np.arange(x_zero.size))
+            scale = np.maximum(1.0, np.maximum(np.abs(f_left), np.abs(f_right)))
+            with np.errstate(invalid='ignore'):
+                pole = ~(np.abs(residual) <= 1e-6 * scale) & (error > 0)
+            curves.append(rows[pole])
+            outer_left.append(x_vals[cols[pole]])
+            outer_right.append(x_vals[cols[pole] + 1])
+            points.append(x_zero[pole])
+            steps.append(error[pole])
+        
+        finite = np.isfinite(y_matrix)
+        rows, cols = np.nonzero(~finite[:, 1:-1] & finite[:, :-2] & finite[:, 2:])
+        curves.append(rows)
+        outer_left.append(x_vals[cols])
+        outer_right.append(x_vals[cols + 2])
+        points.append(x_vals[cols + 1])
+        steps.append(np.zeros(cols.size))
+        
+        curves, outer_left, outer_right, points, steps = (
+            np.concatenate(column) for column in (curves, outer_left, outer_right, points, steps)
+        )
+        # 两侧的点至少离开极点一个求根容差
+        steps = np.maximum(steps, NumericSolver.XTOL + NumericSolver.RTOL * np.abs(points))
+        
+        # 极点与包含该函数的函数对逐一组合，每个组合产生左右两个区间
+        pole_idx, pair_idx = np.nonzero((pairs[None, :, 0] == curves[:, None]) | (pairs[None, :, 1] == curves[:, None]))
+        first = np.tile(pairs[pair_idx, 0], 2)
+        second = np.tile(pairs[pair_idx, 1], 2)
+        left = np.concatenate([outer_left[pole_idx], points[pole_idx] + steps[pole_idx]])
+        right = np.concatenate([points[pole_idx] - steps[pole_idx], outer_right[pole_idx]])
+        
+        rows = np.arange(first.size)
+        batch_gap = FunctionAnalyzer._batch_gap(y_funcs_list, first, second)
+        d_left, d_right = batch_gap(left, rows), batch_gap(right, rows)
+        with np.errstate(invalid='ignore'):
+            keep = (left < right) & (np.sign(d_left) * np.sign(d_right) < 0)
+        return first[keep], second[keep], left[keep], right[keep], d_left[keep], d_right[keep]
+    
+    @staticmethod
+    def _refine_crossings(y_funcs_list, first, second, left, right, d_left, d_right):
+        """批量精化差值变号的交点
+        
+        Args:
+            y_funcs_list: 函数列表
+            first: 每个候选的第一个函数下标
+            second: 每个候选的第二个函数下标
+            left: 含根区间左端
+            right: 含根区间右端
+            d_left: 左端差值
+            d_right: 右端差值
+            
+        Returns:
+            list: (第一个函数下标, 第二个函数下标, x, y) 列表
+        """
+        if not first.size:
+            return []
+        batch_gap = FunctionAnalyzer._batch_gap(y_funcs_list, first, second)
+        x_zero, _ = NumericSolver.refine_brackets(batch_gap, left, right, d_left, d_right)
+        
+        # 排除穿过极点的符号变化
+        residual = batch_gap(x_zero, np.arange(x_zero.size))
+        scale = np.maximum(1.0, np.maximum(np.abs(d_left), np.abs(d_right)))
+        with np.errstate(invalid='ignore'):
+            valid = np.isfinite(residual) & (np.abs(residual) <= 1e-6 * scale)
+        return FunctionAnalyzer._points_on_curves(y_funcs_list, first, second, x_zero, valid)
+    
+    @staticmethod
+    def _refine_touchings(y_funcs_list, first, second, left, right):
+        """批量精化相切交点
+        
+        相切处差值不变号，但其导数变号：用中心差分得到差值的导数，
+        再批量求导数的零点，最后只保留差值足够接近零的点。
+        
+        Args:
+            y_funcs_list: 函数列表
+            first: 每个候选的第一个函数下标
+            second: 每个候选的第二个函数下标
+            left: 搜索区间左端
+            right: 搜索区间右端
+            
+        Returns:
+            list: (第一个函数下标, 第二个函数下标, x, y) 列表
+        """
+        if not first.size:
+            return []
+        batch_gap = FunctionAnalyzer._batch_gap(y_funcs_list, first, second)
+        
+        def batch_slope(t, rows):
+            step = 1e-6 * np.maximum(1.0, np.abs(t))
+            return (batch_gap(t + step, rows) - batch_gap(t - step, rows)) / (2 * step)
+        
+        rows = np.arange(first.size)
+        s_left = batch_slope(left, rows)
+        s_right = batch_slope(right, rows)
+        with np.errstate(invalid='ignore'):
+            bracketed = np.flatnonzero(np.sign(s_left) * np.sign(s_right) <= 0)
+        if not bracketed.size:
+            return []
+        
+        x_touch, _ = NumericSolver.refine_brackets(
+            lambda t, sub: batch_slope(t, bracketed[sub]),
+            left[bracketed], right[bracketed], s_left[bracketed], s_right[bracketed]
+        )
+        
+        # 只接受差值接近零的点
+        residual = batch_gap(x_touch, bracketed)
+        y_touch = FunctionAnalyzer._batch_values(y_funcs_list, first[bracketed], x_touch)
+        with np.errstate(invalid='ignore'):
+            valid = np.isfinite(residual) & (np.abs(residual) <= 1e-9 * np.maximum(1.0, np.abs(y_touch)))
+        return FunctionAnalyzer._points_on_curves(
+            y_funcs_list, first[bracketed], second[bracketed], x_touch, valid
+        )
+    
+    @staticmethod
+    def _batch_values(y_funcs_list, curves, t):
+        """批量计算 y_funcs_list[curves[k]](t[k])，每条曲线只调用一次
+        
+        Args:
+            y_funcs_list: 函数列表
+            curves: 每个点对应的函数下标
+            t: x值数组
+            
+        Returns:
+            numpy.ndarray: 函数值数组
+        """
+        values = np.empty(t.size)
+        for curve in np.unique(curves):
+            mask = curves == curve
+            values[mask] = evaluate(y_funcs_list[curve], t[mask])
+        return values
+    
+    @staticmethod
+    def _batch_gap(y_funcs_list, first, second):
+        """构造批量差值函数 f_first - f_second
+        
+        Args:
+            y_funcs_list: 函数列表
+            first: 每个候选的第一个函数下标
+            second: 每个候选的第二个函数下标
+            
+        Returns:
+            callable: 参数为(t数组, 候选下标数组)的批量差值函数
+        """
+        def batch_gap(t, rows):
+            with np.errstate(invalid='ignore'):
+                return (FunctionAnalyzer._batch_values(y_funcs_list, first[rows], t)
+                        - FunctionAnalyzer._batch_values(y_funcs_list, second[rows], t))
+        return batch_gap
+    
+    @staticmethod
+    def _points_on_curves(y_funcs_list, first, second, x_vals, valid):
+        """计算有效交点的y坐标
+        
+        Args:
+            y_funcs_list: 函数列表
+            first: 每个点所在函数对的第一个函数下标（y坐标按它计算）
+            second: 每个点所在函数对的第二个函数下标
+            x_vals: 交点x坐标
+            valid: 有效点的掩码
+            
+        Returns:
+            list: (第一个函数下标, 第二个函数下标, x, y) 列表
+        """
+        y_vals = FunctionAnalyzer._batch_values(y_funcs_list, first, x_vals)
+        valid = valid & np.isfinite(y_vals)
+        return list(zip(first[valid].tolist(), second[valid].tolist(),
+                        x_vals[valid].tolist(), y_vals[valid].tolist()))
+    
+    @staticmethod
+    def _overlapping_pairs(y_matrix):
+        """扫描排序剔除y值范围不重叠的函数对
+        
+        按各函数的最小值排序后扫描，只保留范围有重叠的函数对，
+        实际中候选对的数量接近线性。
+        
+        Args:
+            y_matrix: 形状为(函数数, 采样数)的函数值矩阵
+            
+        Returns:
+            numpy.ndarray: 形状为(对数, 2)的函数下标对，每行前小后大
+        """
+        finite = np.isfinite(y_matrix)
+        has_values = finite.any(axis=1)
+        lows = np.where(finite, y_matrix, np.inf).min(axis=1)
+        highs = np.where(finite, y_matrix, -np.inf).max(axis=1)
+        
+        # 真实极值可能落在采样点之间，按极值处相邻采样的变化量放宽范围，
+        # 避免漏掉相切的函数对
+        with np.errstate(invalid='ignore'):
+            step = np.abs(np.diff(y_matrix, axis=1))
+        step = np.where(np.isfinite(step), step, 0.0)
+        step = np.maximum(np.pad(step, ((0, 0), (1, 0))), np.pad(step, ((0, 0), (0, 1))))
+        rows = np.arange(y_matrix.shape[0])
+        lows = lows - step[rows, np.where(finite, y_matrix, np.inf).argmin(axis=1)]
+        highs = highs + step[rows, np.where(finite, y_matrix, -np.inf).argmax(axis=1)]
+        
+        pairs = []
+        active = []
+        for idx in np.argsort(lows):
+            if not has_values[idx]:
+                continue
+            active = [a for a in active if highs[a] >= lows[idx]]
+            pairs.extend((min(a, idx), max(a, idx)) for a in active)
+            active.append(idx)
+        
+        return np.array(sorted(pairs), dtype=int).reshape(-1, 2)
+    
+    @staticmethod
+    def _sign_changes(diff):
+        """批量定位每行差值的符号变化和孤立零点
+        
+        Args:
+            diff: 形状为(对数, 采样数)的差值矩阵
+            
+        Returns:
+            tuple: (行下标数组, 列下标数组)，交点位于第col与col+1个采样之间
+                  （或恰好在第col个采样上）
+        """
+        finite = np.isfinite(diff)
+        sign = np.sign(np.where(finite, diff, np.nan))
+        pair_finite = finite[:, :-1] & finite[:, 1:]
+        
+        with np.errstate(invalid='ignore'):
+            crossing = pair_finite & (sign[:, :-1] * sign[:, 1:] < 0)
+        
+        # 恰好落在采样点上的零点，排除两曲线重合的整段
+        zero = finite & (diff == 0)
+        padded = np.pad(zero, ((0, 0), (1, 1)))
+        isolated = zero & ~padded[:, :-2] & ~padded[:, 2:]
+        crossing |= isolated[:, :-1]
+        
+        return np.nonzero(crossing)
+    
+    @staticmethod
+    def _near_zero_minima(diff, x_vals):
+        """批量定位每行|差值|接近零的局部极小值
+        
+        在极小值及其两侧三点上拟合抛物线，顶点值接近零或越过零的才作为候选：
+        前者可能是相切交点，后者说明同一采样间隔内有两个交点。
+        
+        Args:
+            diff: 形状为(对数, 采样数)的差值矩阵
+            x_vals: x值数组
+            
+        Returns:
+            tuple: (行下标数组, 列下标数组, 抛物线顶点x坐标数组)
+        """
+        left, mid, right = diff[:, :-2], diff[:, 1:-1], diff[:, 2:]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            same_sign = (np.sign(left) == np.sign(mid)) & (np.sign(mid) == np.sign(right)) & (mid != 0)
+            minimum = (np.abs(mid) <= np.abs(left)) & (np.abs(mid) <= np.abs(right))
+            curvature = left - 2 * mid + right
+            slope = right - left
+            # 抛物线顶点值（带符号）
+            vertex_value = mid - slope ** 2 / (8 * curvature)
+            near_zero = vertex_value * np.sign(mid) <= 0.25 * np.abs(curvature)
+        
+        finite = np.isfinite(left) & np.isfinite(mid) & np.isfinite(right) & (curvature != 0)
+        rows, cols = np.nonzero(finite & same_sign & minimum & near_zero)
+        
+        # 顶点位置限制在两侧采样点之间
+        step = x_vals[cols + 2] - x_vals[cols + 1]
+        offset = -0.5 * slope[rows, cols] / curvature[rows, cols]
+        vertex = x_vals[cols + 1] + np.clip(offset, -0.999, 0.999) * step
+        return rows, cols + 1, vertex
+    
+    @staticmethod
+    def _unique_points(points, tol=1e-7):
+        """合并重复的交点（考虑浮点误差）
+        
+        按x排序后，与前一个保留点在x和y上都相差不超过相对容差的点视为同一交点。
+        相邻含根区间、符号变化与相切候选精化到同一交点时只保留一个，
+        不会因为恰好跨过舍入边界而重复。
+        
+        Args:
+            points: (x, y) 坐标列表
+            tol: 相对容差
+            
+        Returns:
+            list: 去重后按x排序的坐标列表
+        """
+        unique = []
+        for x, y in sorted(points):
+            duplicate = False
+            # 只需向前检查x在容差内的已保留点
+            for ux, uy in reversed(unique):
+                if x - ux > tol * max(1.0, abs(ux)):
+                    break
+                if abs(y - uy) <= tol * max(1.0, abs(uy)):
+                    duplicate = True
+                    break
+            if not duplicate:
+                unique.append((x, y))
+        return unique
@@ -0,0 +1,482 @@
+"""
+数值分析模块 - 在符号计算超时或失败时提供近似结果
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import sympy as sp
+
+from core.sampling import evaluate
+
+
+def warm_up():
+    """预先导入数值求解依赖
+
+    scipy.optimize导入较慢（数百毫秒），只在精化零点时才需要，因此在用到时才导入；
+    界面启动后在后台线程调用本函数，第一次分析时就不必再等待导入。
+    """
+    import scipy.optimize  # noqa: F401
+
+
+class ApproximateResult:
+    """近似结果类，标记由数值方法得到的属性值"""
+
+    def __init__(self, value, method):
+        """初始化近似结果
+
+        Args:
+            value: 近似值
+            method: 所用数值方法的说明
+        """
+        self.value = value
+        self.method = method
+
+    def __str__(self):
+        return f"≈ {self.value} (approximate, {self.method})"
+
+    __repr__ = __str__
+
+
+class NumericRoot(namedtuple('NumericRoot', ['x', 'error'])):
+    """数值零点，x为零点位置，error为位置的误差界"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"{self.x:.{NumericSolver.DECIMALS}g} ± {self.error:.1e}"
+
+
+class NumericSolver:
+    """数值求解器类，在有限区间上通过采样近似函数属性"""
+
+    # 默认的数值搜索区间和采样点数
+    DEFAULT_RANGE = (-10, 10)
+    DEFAULT_POINTS = 2001
+
+    # 结果保留的小数位数
+    DECIMALS = 6
+
+    # Brent法的绝对和相对容差
+    XTOL = 1e-14
+    RTOL = 4 * np.finfo(float).eps
+
+    @staticmethod
+    def compile(expr):
+        """把sympy表达式编译为numpy函数
+
+        Args:
+            expr: sympy表达式对象
+
+        Returns:
+            callable: 接受numpy数组的函数
+        """
+        x = sp.symbols('x')
+        return sp.lambdify(x, expr, modules=['scipy', 'numpy'])
+
+    @staticmethod
+    def find_roots(func, x_min, x_max, num_points=DEFAULT_POINTS):
+        """通过采样定位零点并精化
+
+        Args:
+            func: numpy函数
+            x_min: 区间下界
+            x_max: 区间上界
+            num_points: 采样点数
+
+        Returns:
+            list: 升序排列的根（保留DECIMALS位小数）
+        """
+        roots = NumericSolver.find_roots_with_bounds(func, x_min, x_max, num_points)
+        return sorted({round(root.x, NumericSolver.DECIMALS) for root in roots})
+
+    @staticmethod
+    def find_roots_with_bounds(func, x_min, x_max, num_points=DEFAULT_POINTS, derivative=None):
+        """求函数在区间内的全部零点及其误差界
+
+        Args:
+            func: numpy函数
+            x_min: 区间下界
+            x_max: 区间上界
+            num_points: 采样点数
+            derivative: 可选的导函数，用于精化相切零点
+
+        Returns:
+            list: 升序排列的NumericRoot
+        """
+        x_vals = np.linspace(x_min, x_max, num_points)
+        y_vals = evaluate(func, x_vals)
+        slope = derivative or NumericSolver.central_difference(func)
+        return NumericSolver.polish_zeros(func, x_vals, y_vals, slope)
+
+    @staticmethod
+    def locate_zeros(func, derivative, x_min, x_max, num_points=DEFAULT_POINTS):
+        """一次采样同时求f和f'的零点
+
+        f和f'在同一网格上批量求值，符号变化和接近零的局部极小值
+        一次性定位后再逐个精化。
+
+        Args:
+            func: numpy函数
+            derivative: 导函数，为None时使用中心差分
+            x_min: 区间下界
+            x_max: 区间上界
+            num_points: 采样点数
+
+        Returns:
+            tuple: (f的零点列表, f'的零点列表)，元素均为NumericRoot
+        """
+        x_vals = np.linspace(x_min, x_max, num_points)
+        y_vals = evaluate(func, x_vals)
+        if derivative is None:
+            derivative = NumericSolver.central_difference(func)
+            with np.errstate(all='ignore'):
+                dy_vals = np.gradient(y_vals, x_vals)
+        else:
+            dy_vals = evaluate(derivative, x_vals)
+
+        roots = NumericSolver.polish_zeros(func, x_vals, y_vals, derivative)
+        critical = NumericSolver.polish_zeros(
+            derivative, x_vals, dy_vals, NumericSolver.central_difference(derivative)
+        )
+        return roots, critical
+
+    @staticmethod
+    def polish_zeros(func, x_vals, y_vals, derivative):
+        """根据已有采样定位零点候选并精化到机器精度
+
+        候选包括：采样值恰为零的点、相邻有限值的符号变化（用Brent法精化），
+        以及|f|接近零的局部极小值（相切零点，用导数的Brent法或有界极小化精化）。
+
+        Args:
+            func: numpy函数
+            x_vals: 采样x值
+            y_vals: 对应的函数值
+            derivative: 导函数，用于精化相切零点
+
+        Returns:
+            list: 升序排列、去重后的NumericRoot
+        """
+        from scipy.optimize import bisect, brentq
+
+        finite = np.isfinite(y_vals)
+        if not np.any(finite):
+            return []
+
+        magnitude = np.abs(np.where(finite, y_vals, np.nan))
+        scale = max(1.0, float(np.nanmedian(magnitude)))
+        accept_tol = 1e-8 * scale
+
+        def scalar(t):
+            return float(evaluate(func, np.array([t]))[0])
+
+        def scalar_slope(t):
+            return float(evaluate(derivative, np.array([t]))[0])
+
+        # 向量化定位所有候选
+        exact = np.flatnonzero(y_vals == 0)
+        pair = finite[:-1] & finite[1:]
+        brackets = np.flatnonzero(pair & (np.sign(y_vals[:-1]) * np.sign(y_vals[1:]) < 0))
+        interior = finite[1:-1] & finite[:-2] & finite[2:]
+        with np.errstate(invalid='ignore'):
+            minima = np.flatnonzero(
+                interior
+                & (magnitude[1:-1] <= magnitude[:-2])
+                & (magnitude[1:-1] <= magnitude[2:])
+                & (magnitude[1:-1] < 1e-2 * scale)
+                & (y_vals[1:-1] != 0)
+            ) + 1
+        # 与符号变化相邻的极小值已被Brent法覆盖
+        covered = np.zeros(x_vals.size, dtype=bool)
+        covered[brackets] = True
+        covered[brackets + 1] = True
+        minima = minima[~covered[minima]]
+
+        roots = [NumericRoot(float(x_vals[i]), 0.0) for i in exact]
+
+        for idx in brackets:
+            a, b = x_vals[idx], x_vals[idx + 1]
+            try:
+                r = brentq(scalar, a, b, xtol=NumericSolver.XTOL, rtol=NumericSolver.RTOL)
+                error = NumericSolver.XTOL + NumericSolver.RTOL * abs(r)
+            except ValueError:
+                continue
+            except RuntimeError:
+                # 多重根附近函数极平坦，Brent法可能不收敛，改用保证收敛的二分法
+                try:
+                    r = bisect(scalar, a, b, xtol=NumericSolver.XTOL, rtol=NumericSolver.RTOL, maxiter=200)
+                except (ValueError, RuntimeError):
+                    continue
+                error = NumericSolver.XTOL + NumericSolver.RTOL * abs(r)
+            # 排除穿过极点的符号变化（如1/x在0处）
+            value = scalar(r)
+            bound = max(1.0, abs(y_vals[idx]), abs(y_vals[idx + 1]))
+            if np.isfinite(value) and abs(value) <= 1e-6 * bound:
+                roots.append(NumericRoot(r, error))
+
+        for idx in minima:
+            root = NumericSolver._polish_touching(
+                scalar, scalar_slope, x_vals[idx - 1], x_vals[idx + 1], accept_tol
+            )
+            if root is not None:
+                roots.append(root)
+
+        return NumericSolver._deduplicate(roots)
+
+    @staticmethod
+    def refine_brackets(batch_func, a, b, fa, fb, max_iter=100):
+        """批量精化多个含根区间（Illinois改进的试位法）
+
+        所有区间同时迭代，每轮只调用一次batch_func；新点无定义或落在区间外时
+        改用二分，直到区间宽度达到机器精度或命中零点。
+
+        Args:
+            batch_func: 批量函数，参数为(t数组, 区间下标数组)，返回对应函数值
+            a: 区间左端数组
+            b: 区间右端数组
+            fa: 左端函数值数组
+            fb: 右端函数值数组（须与fa异号）
+            max_iter: 最大迭代次数
+
+        Returns:
+            tuple: (根数组, 误差界数组)
+        """
+        a = np.array(a, dtype=float)
+        b = np.array(b, dtype=float)
+        fa = np.array(fa, dtype=float)
+        fb = np.array(fb, dtype=float)
+        side = np.zeros(a.size, dtype=np.int8)
+        exact = (fa == 0) | (fb == 0)
+        root = np.where(fa == 0, a, b)
+        done = exact.copy()
+
+        for _ in range(max_iter):
+            tol = NumericSolver.XTOL + NumericSolver.RTOL * np.maximum(np.abs(a), np.abs(b))
+            done |= np.abs(b - a) <= tol
+            active = np.flatnonzero(~done)
+            if not active.size:
+                break
+
+            aa, bb, ffa, ffb = a[active], b[active], fa[active], fb[active]
+            with np.errstate(all='ignore'):
+                c = (aa * ffb - bb * ffa) / (ffb - ffa)
+            lo, hi = np.minimum(aa, bb), np.maximum(aa, bb)
+            bisect = ~np.isfinite(c) | (c <= lo) | (c >= hi)
+            c = np.where(bisect, 0.5 * (aa + bb), c)
+
+            fc = batch_func(c, active)
+
+            # 新点无定义（如靠近极点）时按二分处理：保留靠近有限值的一侧
+            undefined = ~np.isfinite(fc)
+            fc_sign = np.where(undefined, np.sign(ffb), np.sign(fc))
+
+            hit = (fc == 0)
+            same_b = ~hit & (fc_sign == np.sign(ffb))
+            same_a = ~hit & ~same_b
+
+            # Illinois：同一端连续保留时，把另一端的函数值减半
+            s = side[active]
+            new_fa = np.where(same_b & (s == -1), ffa / 2, ffa)
+            new_fb = np.where(same_a & (s == 1), ffb / 2, ffb)
+
+            a[active] = np.where(same_a, c, aa)
+            fa[active] = np.where(same_a, np.where(undefined, ffa, fc), new_fa)
+            b[active] = np.where(same_b, c, bb)
+            fb[active] = np.where(same_b, np.where(undefined, ffb, fc), new_fb)
+            side[active] = np.where(same_b, -1, np.where(same_a, 1, s))
+
+            root[active[hit]] = c[hit]
+            exact[active[hit]] = True
+            done[active[hit]] = True
+
+        # 根位于最终区间内，取中点并以半宽作为误差界
+        root = np.where(exact, root, 0.5 * (a + b))
+        error = np.where(exact, 0.0, 0.5 * np.abs(b - a))
+        return root, error
+
+    @staticmethod
+    def _polish_touching(scalar, scalar_slope, a, b, accept_tol):
+        """精化相切零点（|f|的局部极小值）
+
+        若导数在区间内变号，则用Brent法求导数零点；否则在区间内极小化|f|。
+        只有精化后|f|足够小才视为零点。
+
+        Args:
+            scalar: 标量函数
+            scalar_slope: 标量导函数
+            a: 区间左端
+            b: 区间右端
+            accept_tol: 接受为零点的|f|阈值
+
+        Returns:
+            NumericRoot: 零点，不满足条件时返回None
+        """
+        from scipy.optimize import brentq, minimize_scalar
+
+        try:
+            if scalar_slope(a) * scalar_slope(b) < 0:
+                r = brentq(scalar_slope, a, b, xtol=NumericSolver.XTOL, rtol=NumericSolver.RTOL)
+                error = NumericSolver.XTOL + NumericSolver.RTOL * abs(r)
+            else:
+                result = minimize_scalar(
+                    lambda t: abs(scalar(t)), bounds=(a, b), method='bounded',
+                    options={'xatol': NumericSolver.XTOL}
+                )
+                r = float(result.x)
+                error = NumericSolver.XTOL
+        except (ValueError, RuntimeError):
+            return None
+
+        value = abs(scalar(r))
+        if not np.isfinite(value) or value > accept_tol:
+            return None
+
+        # 相切零点处|f|近似二次，由残差估计位置误差
+        curvature = abs(scalar_slope(r + 1e-4) - scalar_slope(r - 1e-4)) / 2e-4
+        if np.isfinite(curvature) and curvature > 0:
+            error = max(error, float(np.sqrt(2 * value / curvature)))
+        return NumericRoot(r, error)
+
+    @staticmethod
+    def _deduplicate(roots):
+        """合并误差范围内重合的零点，保留误差较小者
+
+        Args:
+            roots: NumericRoot列表
+
+        Returns:
+            list: 升序排列的NumericRoot
+        """
+        unique = []
+        for root in sorted(roots, key=lambda r: r.x):
+            if unique:
+                last = unique[-1]
+                tol = max(last.error, root.error, 1e-9 * (1.0 + abs(root.x)))
+                if abs(root.x - last.x) <= tol:
+                    if root.error < last.error:
+                        unique[-1] = root
+                    continue
+            unique.append(root)
+        return unique
+
+    @staticmethod
+    def central_difference(func, h=1e-6):
+        """构造函数的中心差分导数
+
+        Args:
+            func: numpy函数
+            h: 相对步长
+
+        Returns:
+            callable: 近似导函数
+        """
+        def derivative(t):
+            t = np.asarray(t, dtype=float)
+            step = h * np.maximum(1.0, np.abs(t))
+            return (evaluate(func, t + step) - evaluate(func, t - step)) / (2 * step)
+        return derivative
+
+    @staticmethod
+    def estimate_limit(func, direction):
+        """通过在远处取值估计x趋于无穷时的极限
+
+        Args:
+            func: numpy函数
+            direction: 1表示x→∞，-1表示x→-∞
+
+        Returns:
+            极限的估计值；发散时为sp.oo或-sp.oo，无法判断时为None
+        """
+        x_vals = direction * np.array([1e2, 1e4, 1e6, 1e8])
+        y_vals = evaluate(func, x_vals)
+
+        if np.all(np.isfinite(y_vals)):
+            if abs(y_vals[-1] - y_vals[-2]) <= 1e-6 * max(1.0, abs(y_vals[-1])):
+                return round(float(y_vals[-1]), NumericSolver.DECIMALS)
+            magnitudes = np.abs(y_vals)
+            if np.all(np.diff(magnitudes) > 0) and magnitudes[-1] > 1e6:
+                return sp.oo if y_vals[-1] > 0 else -sp.oo
+        elif np.isinf(y_vals[-1]):
+            return sp.oo if y_vals[-1] > 0 else -sp.oo
+        return None
+
+    @staticmethod
+    def finite_intervals(func, x_min, x_max, num_points=DEFAULT_POINTS):
+        """找出采样区间内函数取有限值的子区间
+
+        Args:
+            func: numpy函数
+            x_min: 区间下界
+            x_max: 区间上界
+            num_points: 采样点数
+
+        Returns:
+            list: (起点, 终点) 元组列表
+        """
+        x_vals = np.linspace(x_min, x_max, num_points)
+        finite = np.isfinite(evaluate(func, x_vals))
+
+        # 有限段的起止位置
+        edges = np.diff(np.concatenate([[0], finite.astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+
+        return [
+            (round(float(x_vals[s]), NumericSolver.DECIMALS), round(float(x_vals[e]), NumericSolver.DECIMALS))
+            for s, e in zip(starts, ends)
+        ]
+
+    @staticmethod
+    def sampled_range(func, x_min, x_max, num_points=DEFAULT_POINTS):
+        """计算采样区间内函数值的最小值和最大值
+
+        Args:
+            func: numpy函数
+            x_min: 区间下界
+            x_max: 区间上界
+            num_points: 采样点数
+
+        Returns:
+            tuple: (最小值, 最大值)，无有限值时为None
+        """
+        y_vals = evaluate(func, np.linspace(x_min, x_max, num_points))
+        finite = y_vals[np.isfinite(y_vals)]
+        if finite.size == 0:
+            return None
+        return (round(float(finite.min()), NumericSolver.DECIMALS),
+                round(float(finite.max()), NumericSolver.DECIMALS))
+
+    @staticmethod
+    def jump_points(func, x_min, x_max, num_points=DEFAULT_POINTS):
+        """通过采样查找疑似不连续点
+
+        无定义的孤立采样点以及远超相邻差值的跳变都视为不连续点。
+
+        Args:
+            func: numpy函数
+            x_min: 区间下界
+            x_max: 区间上界
+            num_points: 采样点数
+
+        Returns:
+            list: 升序排列的疑似不连续点
+        """
+        x_vals = np.linspace(x_min, x_max, num_points)
+        y_vals = evaluate(func, x_vals)
+        finite = np.isfinite(y_vals)
+        points = []
+
+        # 两侧均有定义的孤立无定义点
+        isolated = np.flatnonzero(~finite[1:-1] & finite[:-2] & finite[2:]) + 1
+        points.extend(x_vals[isolated])
+
+        # 相邻有限值之间的异常跳变
+        pair_finite = finite[:-1] & finite[1:]
+        steps = np.abs(np.diff(y_vals))
+        if np.any(pair_finite):
+            typical = np.median(steps[pair_finite])
+            threshold = 50 * typical + 1e-9
+            jumps = np.flatnonzero(pair_finite & (steps > threshold))
+            points.extend(0.5 * (x_vals[jumps] + x_vals[jumps + 1]))
+
+        return sorted({round(float(p), NumericSolver.DECIMALS) for p in points})
@@ -0,0 +1,444 @@
+"""
+采样模块 - 提供函数曲线的自适应采样功能
+"""
+
+import numpy as np
+
+
+def evaluate(y_func, x_vals):
+    """对数组批量求值，并将结果规整为与x等长的浮点数组
+
+    常数表达式经lambdify后返回标量，复数结果只保留虚部可忽略的部分，
+    其余位置记为NaN。
+
+    Args:
+        y_func: lambdify生成的函数
+        x_vals: x值数组
+
+    Returns:
+        numpy.ndarray: y值数组
+    """
+    x_vals = np.asarray(x_vals, dtype=float)
+    with np.errstate(all='ignore'):
+        return _real_values(y_func(x_vals), x_vals.shape)
+
+
+def evaluate_parametric(xy_func, t_vals):
+    """对参数数组批量求值参数方程，一次调用同时得到x和y
+
+    Args:
+        xy_func: lambdify生成的函数，返回 (x, y) 两个分量
+        t_vals: 参数值数组
+
+    Returns:
+        tuple: (x值数组, y值数组)，规整方式与evaluate相同
+    """
+    t_vals = np.asarray(t_vals, dtype=float)
+    with np.errstate(all='ignore'):
+        x_vals, y_vals = xy_func(t_vals)
+        return _real_values(x_vals, t_vals.shape), _real_values(y_vals, t_vals.shape)
+
+
+def _real_values(values, shape):
+    """把求值结果规整为给定形状的浮点数组，虚部不可忽略的位置记为NaN"""
+    values = np.asarray(values)
+    if np.iscomplexobj(values):
+        values = np.where(np.abs(values.imag) < 1e-12, values.real, np.nan)
+    return np.array(np.broadcast_to(values, shape), dtype=float)
+
+
+def decimate_minmax(x_vals, y_vals, x_min, x_max, columns):
+    """按像素列把曲线精简为最小/最大值包络
+
+    每个像素列只保留落在其中的第一个、最后一个、最小和最大采样点，
+    尖峰和极值不会丢失；无定义的点（断开处）原样保留一个。
+    自适应采样的点集中在细节处，即使总点数少于列数，局部的像素列也可能
+    落入大量采样点，因此不按总点数跳过，不多于4个点的像素列自然原样保留。
+
+    Args:
+        x_vals: 递增的x值数组
+        y_vals: y值数组
+        x_min: 视图x最小值
+        x_max: 视图x最大值
+        columns: 视图宽度对应的像素列数
+
+    Returns:
+        tuple: (x值数组, y值数组)
+    """
+    x_vals = np.asarray(x_vals, dtype=float)
+    y_vals = np.asarray(y_vals, dtype=float)
+    columns = int(columns)
+    if columns <= 0 or x_max <= x_min or x_vals.size <= 4:
+        return x_vals, y_vals
+
+    # 分组键：被无定义点隔开的段号与像素列号，x递增时键也递增，每组是连续的一段
+    finite = np.isfinite(y_vals)
+    segment = np.cumsum(~finite)
+    column = np.floor((x_vals - x_min) * (columns / (x_max - x_min))).astype(np.int64)
+    column -= column.min()
+    key = segment * (column.max() + 1) + column
+
+    # 无定义的点各自成组，连续的只保留第一个
+    breaks = ~finite & np.concatenate(([True], finite[:-1]))
+
+    idx = np.flatnonzero(finite)
+    if not idx.size:
+        keep = breaks
+        return x_vals[keep], y_vals[keep]
+
+    group_key = key[idx]
+    starts = np.flatnonzero(np.concatenate(([True], group_key[1:] != group_key[:-1])))
+    ends = np.concatenate((starts[1:], [idx.size])) - 1
+    sizes = ends - starts + 1
+    group = np.repeat(np.arange(starts.size), sizes)
+
+    y_finite = y_vals[idx]
+    y_low = np.minimum.reduceat(y_finite, starts)
+    y_high = np.maximum.reduceat(y_finite, starts)
+
+    # 每组第一个达到最小值和最大值的点
+    _, first_low = np.unique(group[y_finite == y_low[group]], return_index=True)
+    _, first_high = np.unique(group[y_finite == y_high[group]], return_index=True)
+    low_pos = np.flatnonzero(y_finite == y_low[group])[first_low]
+    high_pos = np.flatnonzero(y_finite == y_high[group])[first_high]
+
+    keep = breaks.copy()
+    keep[idx[np.concatenate((starts, ends, low_pos, high_pos))]] = True
+    return x_vals[keep], y_vals[keep]
+
+
+def subdivide(t_vals, values, evaluate_mid, score, max_points, min_width):
+    """自适应细分的公共循环
+
+    从给定网格开始，每一轮对所有待检查区间的中点做一次向量化求值，
+    对评分大于1的区间插入中点并在下一轮检查其两半，直到满足精度、
+    区间宽度达到下限或用完预算；预算不足时优先细分评分最高的区间。
+
+    Args:
+        t_vals: 递增的自变量（参数）数组
+        values: 每个采样点的数据，形状为 (k, n)，与t_vals逐列对应
+        evaluate_mid: 对中点数组求值的函数，返回形状为 (k, m) 的数组
+        score: 评分函数，参数为区间左端点、中点、右端点的数据（各为 (k, m)），返回长度为m的评分
+        max_points: 采样点预算
+        min_width: 区间宽度下限
+
+    Returns:
+        tuple: (自变量数组, 数据数组)
+    """
+    candidates = np.arange(t_vals.size - 1)
+    while candidates.size:
+        budget = max_points - t_vals.size
+        if budget <= 0:
+            break
+
+        t_left = t_vals[candidates]
+        t_right = t_vals[candidates + 1]
+        wide = (t_right - t_left) > min_width
+        candidates, t_left, t_right = candidates[wide], t_left[wide], t_right[wide]
+        if not candidates.size:
+            break
+
+        # 批量计算中点
+        t_mid = 0.5 * (t_left + t_right)
+        mid_values = evaluate_mid(t_mid)
+
+        scores = score(values[:, candidates], mid_values, values[:, candidates + 1])
+        refine = np.flatnonzero(scores > 1.0)
+        if refine.size > budget:
+            top = np.argpartition(-scores[refine], budget - 1)[:budget]
+            refine = np.sort(refine[top])
+        if not refine.size:
+            break
+
+        # 插入中点，插入后原区间左端点的下标依次后移
+        left = candidates[refine]
+        t_vals = np.insert(t_vals, left + 1, t_mid[refine])
+        values = np.insert(values, left + 1, mid_values[:, refine], axis=1)
+        shifted = left + np.arange(left.size)
+        candidates = np.sort(np.concatenate([shifted, shifted + 1]))
+
+    return t_vals, values
+
+
+class AdaptiveSampler:
+    """自适应采样器类，根据曲线弯曲程度递归细分采样区间"""
+
+    def __init__(self, initial_points=65, max_points=800, tolerance=0.002, max_depth=14,
+                 jump_ratio=0.01, jump_iterations=24):
+        """初始化采样器
+
+        Args:
+            initial_points: 初始均匀采样点数
+            max_points: 每条曲线的采样点预算
+            tolerance: 允许的弦高误差，占视图y范围的比例
+            max_depth: 单个初始区间的最大细分深度
+            jump_ratio: 相邻采样差值超过视图y范围的该比例时检查是否间断
+            jump_iterations: 判断间断时的二分次数
+        """
+        self.initial_points = initial_points
+        self.max_points = max_points
+        self.tolerance = tolerance
+        self.max_depth = max_depth
+        self.jump_ratio = jump_ratio
+        self.jump_iterations = jump_iterations
+
+    def sample(self, y_func, x_min, x_max, y_min=None, y_max=None):
+        """在给定区间内自适应采样函数
+
+        从粗网格开始，每一轮对所有待检查区间的中点做一次向量化求值，
+        对弯曲、跳变或越出视图边界的区间继续细分，直到满足精度或用完预算。
+
+        Args:
+            y_func: lambdify生成的函数
+            x_min: x最小值
+            x_max: x最大值
+            y_min: 视图y最小值，为None时使用采样数据范围
+            y_max: 视图y最大值，为None时使用采样数据范围
+
+        Returns:
+            tuple: (x值数组, y值数组)
+        """
+        x_vals = np.linspace(x_min, x_max, self.initial_points)
+        y_vals = evaluate(y_func, x_vals)
+
+        # 确定误差度量使用的y尺度
+        if y_min is None or y_max is None:
+            finite = y_vals[np.isfinite(y_vals)]
+            if finite.size == 0:
+                return x_vals, y_vals
+            y_min, y_max = finite.min(), finite.max()
+        y_span = (y_max - y_min) or 1.0
+
+        # 超出视图一个视窗高度的部分不影响显示，截断后再比较
+        clip_low = y_min - y_span
+        clip_high = y_max + y_span
+        tol = self.tolerance * y_span
+        min_width = (x_max - x_min) / (self.initial_points - 1) / 2 ** self.max_depth
+
+        x_vals, values = subdivide(
+            x_vals, y_vals[None, :],
+            lambda x_mid: evaluate(y_func, x_mid)[None, :],
+            lambda left, mid, right: self._refine_score(left[0], mid[0], right[0], clip_low, clip_high, tol),
+            self.max_points, min_width
+        )
+        y_vals = values[0]
+
+        return self._break_discontinuities(y_func, x_vals, y_vals, y_span)
+
+    def _break_discontinuities(self, y_func, x_vals, y_vals, y_span):
+        """在极点和跳跃间断处插入NaN断开曲线
+
+        对相邻采样差值较大的区间同时做二分，每次保留变化较大的一半：
+        连续函数的变化随区间缩小而消失，极点和跳跃处的变化则一直保留。
+        确认为间断的区间在两侧各补一个贴近间断点的采样，中间插入NaN。
+
+        Args:
+            y_func: lambdify生成的函数
+            x_vals: x值数组
+            y_vals: y值数组
+            y_span: 视图y范围
+
+        Returns:
+            tuple: (x值数组, y值数组)
+        """
+        with np.errstate(invalid='ignore'):
+            jump = np.abs(np.diff(y_vals))
+            suspects = np.flatnonzero(jump > self.jump_ratio * y_span)
+        if not suspects.size:
+            return x_vals, y_vals
+
+        a, b = x_vals[suspects], x_vals[suspects + 1]
+        fa, fb = y_vals[suspects], y_vals[suspects + 1]
+        initial = jump[suspects]
+
+        for _ in range(self.jump_iterations):
+            mid = 0.5 * (a + b)
+            fm = evaluate(y_func, mid)
+            with np.errstate(invalid='ignore'):
+                left_jump = np.abs(fm - fa)
+                right_jump = np.abs(fb - fm)
+            # 中点无定义时保留有定义的一侧，中间本来就会断开
+            go_left = np.where(np.isfinite(fm), left_jump >= right_jump, np.isfinite(fa))
+            b = np.where(go_left, mid, b)
+            fb = np.where(go_left, fm, fb)
+            a = np.where(go_left, a, mid)
+            fa = np.where(go_left, fa, fm)
+
+        with np.errstate(invalid='ignore'):
+            broken = ~(np.abs(fb - fa) < 0.5 * initial)
+        if not np.any(broken):
+            return x_vals, y_vals
+
+        # 每个间断处插入 左侧点、NaN、右侧点
+        at = np.repeat(suspects[broken] + 1, 3)
+        new_x = np.column_stack([a[broken], 0.5 * (a[broken] + b[broken]), b[broken]]).ravel()
+        new_y = np.column_stack([fa[broken], np.full(np.count_nonzero(broken), np.nan), fb[broken]]).ravel()
+        x_vals = np.insert(x_vals, at, new_x)
+        y_vals = np.insert(y_vals, at, new_y)
+
+        # 二分始终偏向一侧时补的点与原采样点重合，去掉重复的x
+        keep = np.concatenate(([True], np.diff(x_vals) > 0))
+        return x_vals[keep], y_vals[keep]
+
+    @staticmethod
+    def _refine_score(y_left, y_mid, y_right, clip_low, clip_high, tol):
+        """计算区间的细分评分，大于1表示需要细分
+
+        Args:
+            y_left: 区间左端点的y值
+            y_mid: 区间中点的y值
+            y_right: 区间右端点的y值
+            clip_low: 截断下界
+            clip_high: 截断上界
+            tol: 弦高误差阈值
+
+        Returns:
+            numpy.ndarray: 各区间的评分
+        """
+        finite = np.isfinite(y_left) & np.isfinite(y_mid) & np.isfinite(y_right)
+        any_finite = np.isfinite(y_left) | np.isfinite(y_mid) | np.isfinite(y_right)
+
+        with np.errstate(invalid='ignore'):
+            left = np.clip(y_left, clip_low, clip_high)
+            mid = np.clip(y_mid, clip_low, clip_high)
+            right = np.clip(y_right, clip_low, clip_high)
+            score = np.abs(mid - 0.5 * (left + right)) / tol
+
+        # 定义域边界（部分端点无定义）优先细分，完全无定义的区间跳过
+        score = np.where(finite, score, 0.0)
+        return np.where(any_finite & ~finite, np.inf, score)
+
+
+class ParametricSampler:
+    """参数曲线采样器类，按弧长和曲率在参数轴上自适应细分
+
+    误差在按视图宽高归一化的平面坐标中度量：弦高偏差大、转角大或弦长过长的区间继续细分，
+    直线段只保留很少的点，急转的小环则细分到足够平滑。
+    """
+
+    def __init__(self, initial_points=65, max_points=1500, tolerance=0.002, max_angle=0.2,
+                 max_length=0.1, min_length=0.01, max_depth=14, jump_ratio=0.05):
+        """初始化采样器
+
+        Args:
+            initial_points: 初始均匀采样点数
+            max_points: 每条曲线的采样点预算
+            tolerance: 允许的弦高误差，占视图尺寸的比例
+            max_angle: 相邻两段弦之间允许的转角（弧度）
+            max_length: 允许的最大弦长，占视图尺寸的比例
+            min_length: 弦长短于该比例后不再按转角细分，尖点不会耗尽预算
+            max_depth: 单个初始区间的最大细分深度
+            jump_ratio: 细分到最小宽度后弦长仍超过该比例时视为间断
+        """
+        self.initial_points = initial_points
+        self.max_points = max_points
+        self.tolerance = tolerance
+        self.max_angle = max_angle
+        self.max_length = max_length
+        self.min_length = min_length
+        self.max_depth = max_depth
+        self.jump_ratio = jump_ratio
+
+    def sample(self, xy_func, t_min, t_max, x_min, x_max, y_min, y_max):
+        """在参数区间内自适应采样参数曲线
+
+        每一轮对所有待检查区间的中点做一次向量化求值（x和y同时求出），
+        对不满足精度的区间继续细分，直到满足精度或用完预算。
+
+        Args:
+            xy_func: lambdify生成的函数，返回 (x, y) 两个分量
+            t_min: 参数最小值
+            t_max: 参数最大值
+            x_min: 视图x最小值
+            x_max: 视图x最大值
+            y_min: 视图y最小值
+            y_max: 视图y最大值
+
+        Returns:
+            tuple: (参数值数组, x值数组, y值数组)
+        """
+        t_vals = np.linspace(t_min, t_max, self.initial_points)
+        x_vals, y_vals = evaluate_parametric(xy_func, t_vals)
+
+        # 归一化到视图，超出视图一个视窗的部分截断后再比较
+        origin = np.array([[x_min], [y_min]])
+        scale = np.array([[(x_max - x_min) or 1.0], [(y_max - y_min) or 1.0]])
+
+        def normalize(x, y):
+            with np.errstate(invalid='ignore'):
+                return np.clip((np.vstack([x, y]) - origin) / scale, -1.0, 2.0)
+
+        def evaluate_mid(t_mid):
+            x_mid, y_mid = evaluate_parametric(xy_func, t_mid)
+            return np.vstack([x_mid, y_mid, normalize(x_mid, y_mid)])
+
+        # 每列依次为 x、y 和两个归一化坐标，误差只按归一化坐标计算
+        min_width = (t_max - t_min) / (self.initial_points - 1) / 2 ** self.max_depth
+        t_vals, values = subdivide(
+            t_vals, np.vstack([x_vals, y_vals, normalize(x_vals, y_vals)]), evaluate_mid,
+            lambda left, mid, right: self._refine_score(left[2:], mid[2:], right[2:]),
+            self.max_points, min_width
+        )
+        x_vals, y_vals, points = values[0], values[1], values[2:]
+
+        return self._break_jumps(t_vals, x_vals, y_vals, points, min_width)
+
+    def _refine_score(self, left, mid, right):
+        """计算区间的细分评分，大于1表示需要细分
+
+        Args:
+            left: 区间左端点的归一化坐标，形状为 (2, n)
+            mid: 区间中点的归一化坐标
+            right: 区间右端点的归一化坐标
+
+        Returns:
+            numpy.ndarray: 各区间的评分
+        """
+        finite = np.all(np.isfinite(left) & np.isfinite(mid) & np.isfinite(right), axis=0)
+        any_finite = np.any(np.isfinite(left) | np.isfinite(mid) | np.isfinite(right), axis=0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            first = mid - left
+            second = right - mid
+            first_length = np.hypot(*first)
+            second_length = np.hypot(*second)
+            length = first_length + second_length
+
+            # 弦高：中点到弦中点的距离
+            deviation = np.hypot(*(mid - 0.5 * (left + right))) / self.tolerance
+
+            # 转角：两段弦方向之间的夹角，弦已经很短时不再考虑
+            cos_angle = np.sum(first * second, axis=0) / (first_length * second_length)
+            angle = np.arccos(np.clip(np.nan_to_num(cos_angle, nan=1.0), -1.0, 1.0))
+            turning = np.where(length > self.min_length, angle / self.max_angle, 0.0)
+
+            score = np.maximum.reduce([deviation, turning, length / self.max_length])
+
+        # 定义域边界（部分端点无定义）优先细分，完全无定义的区间跳过
+        score = np.where(finite, score, 0.0)
+        return np.where(any_finite & ~finite, np.inf, score)
+
+    def _break_jumps(self, t_vals, x_vals, y_vals, points, min_width):
+        """在已细分到最小宽度仍然很长的区间插入NaN断开曲线
+
+        Args:
+            t_vals: 参数值数组
+            x_vals: x值数组
+            y_vals: y值数组
+            points: 归一化坐标，形状为 (2, n)
+            min_width: 最小细分宽度
+
+        Returns:
+            tuple: (参数值数组, x值数组, y值数组)
+        """
+        with np.errstate(invalid='ignore'):
+            length = np.hypot(*np.diff(points, axis=1))
+            jumps = np.flatnonzero((length > self.jump_ratio) & (np.diff(t_vals) <= 2 * min_width))
+        if not jumps.size:
+            return t_vals, x_vals, y_vals
+
+        at = jumps + 1
+        t_vals = np.insert(t_vals, at, 0.5 * (t_vals[jumps] + t_vals[jumps + 1]))
+        x_vals = np.insert(x_vals, at, np.nan)
+        y_vals = np.insert(y_vals, at, np.nan)
+        return t_vals, x_vals, y_vals
@@ -0,0 +1,110 @@
+"""
+时间预算模块 - 在限定时间内执行计算，超时后中断
+"""
+
+import ctypes
+import threading
+
+
+# 中断失败后仍在运行的辅助线程数上限，达到上限时不再开始新的限时计算
+MAX_ABANDONED = 4
+
+# 中断失败、已放弃等待的辅助线程
+_abandoned = []
+_abandoned_lock = threading.Lock()
+
+
+class AnalysisTimeout(Exception):
+    """计算超出时间预算时抛出的异常"""
+
+
+class _Interrupted(BaseException):
+    """注入到超时线程中的异常
+
+    继承BaseException，避免被sympy内部的 except Exception 吞掉。
+    """
+
+
+def call_with_timeout(func, timeout, *args, **kwargs):
+    """在时间预算内调用函数
+
+    函数在辅助线程中执行，超时后向该线程注入异常使其尽快停止，
+    调用方立即得到AnalysisTimeout，不必等待计算真正结束。
+    停在C代码中的线程收不到注入的异常，只能放弃；这样的线程仍在运行的数量
+    达到MAX_ABANDONED时直接抛出AnalysisTimeout，调用方改用数值方法，
+    避免失控的计算线程不断累积。数值回退本身不应经过这里，否则达到上限后
+    连近似结果也无法得到。
+
+    Args:
+        func: 要调用的函数
+        timeout: 时间预算（秒），为None时不限时
+        *args: 传给函数的位置参数
+        **kwargs: 传给函数的关键字参数
+
+    Returns:
+        函数的返回值
+
+    Raises:
+        AnalysisTimeout: 超出时间预算
+        Exception: 函数本身抛出的异常
+    """
+    if timeout is None:
+        return func(*args, **kwargs)
+
+    if abandoned_count() >= MAX_ABANDONED:
+        raise AnalysisTimeout(f"{MAX_ABANDONED} abandoned computations are still running")
+
+    outcome = {}
+
+    def target():
+        try:
+            outcome['value'] = func(*args, **kwargs)
+        except _Interrupted:
+            pass
+        except BaseException as e:
+            outcome['error'] = e
+
+    worker = threading.Thread(target=target, daemon=True)
+    worker.start()
+    worker.join(timeout)
+
+    if worker.is_alive():
+        _interrupt(worker)
+        raise AnalysisTimeout(f"Exceeded time budget of {timeout} s")
+
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome.get('value')
+
+
+def abandoned_count():
+    """统计已放弃且仍在运行的辅助线程数，同时移除已结束的线程
+
+    Returns:
+        int: 仍在运行的已放弃线程数
+    """
+    with _abandoned_lock:
+        _abandoned[:] = [worker for worker in _abandoned if worker.is_alive()]
+        return len(_abandoned)
+
+
+def _interrupt(worker, attempts=3):
+    """向线程注入中断异常
+
+    纯Python代码会在下一条字节码处收到异常；若线程内部吞掉了异常，
+    则再尝试几次，仍未停止时放弃并登记（守护线程不会阻止程序退出）。
+
+    Args:
+        worker: 要中断的线程
+        attempts: 最多尝试次数
+    """
+    for _ in range(attempts):
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(
+            ctypes.c_ulong(worker.ident), ctypes.py_object(_Interrupted)
+        )
+        worker.join(0.05)
+        if not worker.is_alive():
+            return
+
+    with _abandoned_lock:
+        _abandoned.append(worker)
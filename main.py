@@ -14,8 +14,8 @@ def main():
     # 创建应用程序
     app = QApplication(sys.argv)
     
-    # 创建主窗口
-    window = GraphingCalculatorWindow()
+    # 创建主窗口，--debug 时在状态栏显示帧率
+    window = GraphingCalculatorWindow(debug='--debug' in sys.argv)
     
     # 显示窗口
     window.show()
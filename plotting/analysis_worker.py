@@ -0,0 +1,227 @@
+"""
+后台分析模块 - 在工作线程中计算函数属性并逐项回传结果
+"""
+
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from core.analysis_cache import AnalysisCache
+from core.expression_cache import ExpressionCache
+from core.function_props import FunctionAnalyzer
+
+
+class AnalysisSignals(QObject):
+    """分析任务信号类，跨线程把结果送回主线程"""
+
+    # 参数：批次号、方程序号、属性名、属性值
+    property_ready = pyqtSignal(int, int, str, object)
+
+    # 参数：批次号、方程序号
+    finished = pyqtSignal(int, int)
+
+
+class AnalysisTask(QRunnable):
+    """单个方程的分析任务"""
+
+    def __init__(self, generation, index, expr, cancel_event, signals, cache=None):
+        """初始化分析任务
+
+        Args:
+            generation: 所属批次号
+            index: 方程序号
+            expr: sympy表达式对象
+            cancel_event: 批次取消标志
+            signals: 用于回传结果的信号对象
+            cache: 持久化分析缓存，为None时不使用缓存
+        """
+        super().__init__()
+        self.generation = generation
+        self.index = index
+        self.expr = expr
+        self.cancel_event = cancel_event
+        self.signals = signals
+        self.cache = cache
+
+    def run(self):
+        """逐项计算属性，每项之间检查取消标志
+
+        命中持久化缓存时直接回传全部结果；完整算完且没有任何一步超时的结果写回缓存。
+        """
+        if self.cancel_event.is_set():
+            return
+
+        try:
+            items = self.cache.get(self.expr) if self.cache else None
+            from_cache = items is not None
+            graph = None
+            if not from_cache:
+                graph = FunctionAnalyzer.make_graph(self.expr)
+                items = FunctionAnalyzer.iter_function_properties(self.expr, graph=graph)
+
+            computed = []
+            for prop_name, prop_value in items:
+                if self.cancel_event.is_set():
+                    return
+                computed.append((prop_name, prop_value))
+                self.signals.property_ready.emit(self.generation, self.index, prop_name, prop_value)
+
+            if self.cache and not from_cache and not graph.timed_out:
+                self.cache.put(self.expr, computed)
+
+            self.signals.finished.emit(self.generation, self.index)
+        except RuntimeError:
+            # 应用退出时信号对象可能已被销毁
+            pass
+
+
+class AnalysisRunner(QObject):
+    """分析调度器类，管理后台分析批次并把结果流式写入结果区"""
+
+    # 后台线程数量，符号计算受GIL限制，线程过多只会抢占界面线程
+    MAX_THREADS = 2
+
+    def __init__(self, result_browser, statusbar=None):
+        """初始化分析调度器
+
+        Args:
+            result_browser: 结果显示区对象
+            statusbar: 状态栏对象
+        """
+        super().__init__()
+        self.result_browser = result_browser
+        self.statusbar = statusbar
+
+        self.cache = AnalysisCache.shared()
+
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(self.MAX_THREADS)
+
+        self.signals = AnalysisSignals()
+        self.signals.property_ready.connect(self._on_property_ready)
+        self.signals.finished.connect(self._on_finished)
+
+        # 当前批次状态
+        self.generation = 0
+        self.cancel_event = threading.Event()
+        self.equations = []
+        self.results = []
+        self.pending = set()
+        self.completed = set()
+
+    def start(self, equations, expr_list):
+        """取消旧批次并开始分析新的方程列表
+
+        上一批次中已经分析完成、规范化文本相同的方程直接沿用结果，不再提交任务。
+
+        Args:
+            equations: 方程式字符串列表
+            expr_list: 对应的sympy表达式列表，不做函数分析的方程（参数方程、极坐标方程）为None
+        """
+        finished = {}
+        for idx, equation in enumerate(self.equations):
+            if idx in self.completed:
+                finished.setdefault(ExpressionCache.normalize(equation), self.results[idx])
+
+        self.cancel()
+
+        self.equations = list(equations)
+        self.results = [{} for _ in expr_list]
+        self.pending = set()
+        self.completed = set()
+
+        for idx, (equation, expr) in enumerate(zip(self.equations, expr_list)):
+            reused = finished.get(ExpressionCache.normalize(equation))
+            if reused is not None:
+                self.results[idx] = reused
+                self.completed.add(idx)
+                continue
+
+            if expr is None:
+                self.results[idx] = {'Analysis': 'only available for y = f(x) equations'}
+                self.completed.add(idx)
+                continue
+
+            self.pending.add(idx)
+            task = AnalysisTask(
+                self.generation, idx, expr, self.cancel_event, self.signals, self.cache
+            )
+            self.pool.start(task)
+
+        self._render()
+
+    def clear_cache(self):
+        """清空持久化分析缓存，下一批次重新分析所有方程（不沿用上一批次的结果）"""
+        self.cache.invalidate()
+        self.completed = set()
+
+    def cancel(self):
+        """取消正在进行的分析，已排队的任务会在开始前退出"""
+        self.cancel_event.set()
+        self.pool.clear()
+
+        # 新批次使用新的取消标志和批次号，旧批次迟到的结果会被丢弃
+        self.cancel_event = threading.Event()
+        self.generation += 1
+        self.pending = set()
+
+    def is_running(self):
+        """是否仍有方程在分析中
+
+        Returns:
+            bool: 是否正在分析
+        """
+        return bool(self.pending)
+
+    def format_results(self):
+        """把当前已得到的结果格式化为文本
+
+        Returns:
+            str: 结果文本
+        """
+        result_text = ""
+        for idx, equation in enumerate(self.equations):
+            result_text += f"Equation {idx + 1}: {equation}\n"
+            for prop_name, prop_value in self.results[idx].items():
+                result_text += f"{prop_name}: {prop_value}\n"
+            if idx in self.pending:
+                result_text += "Analyzing...\n"
+            result_text += "\n"
+        return result_text
+
+    def _on_property_ready(self, generation, index, prop_name, prop_value):
+        """单项属性计算完成
+
+        Args:
+            generation: 批次号
+            index: 方程序号
+            prop_name: 属性名
+            prop_value: 属性值
+        """
+        if generation != self.generation:
+            return
+        self.results[index][prop_name] = prop_value
+        self._render()
+
+    def _on_finished(self, generation, index):
+        """单个方程分析完成
+
+        Args:
+            generation: 批次号
+            index: 方程序号
+        """
+        if generation != self.generation:
+            return
+        self.pending.discard(index)
+        self.completed.add(index)
+        self._render()
+
+        if not self.pending and self.statusbar:
+            self.statusbar.showMessage(f"Analysis finished for {len(self.equations)} equation(s)")
+
+    def _render(self):
+        """刷新结果区，尽量保持滚动位置"""
+        scrollbar = self.result_browser.verticalScrollBar()
+        position = scrollbar.value()
+        self.result_browser.setText(self.format_results())
+        scrollbar.setValue(position)
@@ -3,23 +3,35 @@
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-import sympy as sp
-from sympy.parsing.sympy_parser import parse_expr
+from matplotlib import colormaps
 from matplotlib.backends.backend_qtagg import (
     FigureCanvasQTAgg as FigureCanvas,
     NavigationToolbar2QT as NavigationToolbar
 )
+from matplotlib.figure import Figure
 from PyQt6.QtWidgets import QSizePolicy
+from PyQt6.QtCore import QTimer
 from ui.modern_theme import ModernTheme
 
 from core.function_props import FunctionAnalyzer
+from plotting.analysis_worker import AnalysisRunner
+from core.sampling import AdaptiveSampler, ParametricSampler, decimate_minmax
+from core.expression_cache import CARTESIAN, ExpressionCache
+from plotting.overlay import BlitOverlay
+from plotting.render_scheduler import RenderScheduler
+from plotting.style import apply_figure_style, apply_grid, apply_legend
 
 
 class GraphManager:
     """图形管理器类，用于处理图形绘制和管理"""
     
-    def __init__(self, plot_layout, statusbar, result_browser, dark_mode=False):
+    # 视图变化后等待多久再重新采样（毫秒）
+    RESAMPLE_DELAY_MS = 80
+    
+    # 采样范围在视图两侧额外延伸的比例，平移时曲线不会立即露出端点
+    VIEW_MARGIN = 0.25
+    
+    def __init__(self, plot_layout, statusbar, result_browser, dark_mode=False, debug=False):
         """初始化图形管理器
         
         Args:
@@ -27,6 +39,7 @@ class GraphManager:
             statusbar: 状态栏对象
             result_browser: 结果显示区对象
             dark_mode: 是否使用暗色模式
+            debug: 是否在状态栏显示帧率等调试信息
         """
         self.plot_layout = plot_layout
         self.statusbar = statusbar
@@ -42,12 +55,46 @@ class GraphManager:
         self.expr_list = []
         self.y_funcs_list = []
         self.x_vals = None
+        self.samples = []
+        self.labels = []
         self.intersection_points = []
         
+        # 每条曲线的编译结果（含曲线类型和参数范围）
+        self.compiled_list = []
+        
+        # 增量重绘：每条曲线的规范化方程文本，以及按函数对缓存的交点
+        self.equation_keys = []
+        self.pair_intersections = {}
+        self.intersection_markers = None
+        
+        # 编译结果缓存（进程内共享）
+        self.expression_cache = ExpressionCache.shared()
+        
+        # 后台函数分析
+        self.analysis_runner = AnalysisRunner(result_browser, statusbar)
+        
+        # 自适应采样器
+        self.sampler = AdaptiveSampler()
+        self.parametric_sampler = ParametricSampler()
+        self.sampled_view = None
+        
+        # 视图变化后的重新采样定时器，连续的平移缩放只触发一次求值
+        self.resample_timer = QTimer()
+        self.resample_timer.setSingleShot(True)
+        self.resample_timer.setInterval(self.RESAMPLE_DELAY_MS)
+        self.resample_timer.timeout.connect(self.resample_visible)
+        
+        # 平移缩放的重绘调度，每帧最多重绘一次，超出帧预算时降低曲线细节
+        self.render_scheduler = RenderScheduler(
+            self._draw_canvas, statusbar, self._apply_detail, debug
+        )
+        
         # 交互相关属性
         self.pressing = False
         self.dot = None
         self.text_annotation = None
+        self.crosshair = None
+        self.overlay = None
         self.selected_graph_index = None
         self.panning = False
         self.pan_start = None
@@ -56,10 +103,16 @@ class GraphManager:
         self.cid_press = None
         self.cid_motion = None
         self.cid_release = None
+        self.cid_resize = None
+        self.cid_xlim = None
+        self.cid_ylim = None
     
     def setup_new_figure(self, x_min=-10, x_max=10, y_min=-10, y_max=10, show_grid=True):
         """设置新的图形
         
+        图形、画布和工具栏只在第一次调用时创建，之后原地清空并重建坐标轴，
+        不经过pyplot，旧的图形不会留在pyplot的全局图形列表中。
+        
         Args:
             x_min: x轴最小值
             x_max: x轴最大值
@@ -67,13 +120,33 @@ class GraphManager:
             y_max: y轴最大值
             show_grid: 是否显示网格
         """
-        # 清除现有的画布和工具栏
         if self.canvas:
+            # 清空现有图形，旧坐标轴上的回调、交互点和标注随之失效
             self._disconnect_events()
-            self._clear_plot_layout()
+            self.fig.clear()
+            self.toolbar.update()
+        else:
+            # 创建图形、画布和工具栏
+            self.fig = Figure(figsize=(10, 8))
+            self.canvas = FigureCanvas(self.fig)
+            self.toolbar = NavigationToolbar(self.canvas, None)
+            
+            # 应用工具栏样式
+            self.toolbar.setStyleSheet(ModernTheme.get_toolbar_style(self.dark_mode))
+            
+            # 设置画布的大小策略和最小高度
+            self.canvas.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+            self.canvas.setMinimumHeight(400)
+            
+            # 添加到布局
+            self.plot_layout.addWidget(self.toolbar)
+            self.plot_layout.addWidget(self.canvas)
         
-        # 创建新的图形和坐标轴
-        self.fig, self.ax = plt.subplots(figsize=(10, 8))
+        self.ax = self.fig.add_subplot()
+        self.intersection_markers = None
+        self.dot = None
+        self.text_annotation = None
+        self.crosshair = None
         
         # 设置坐标轴范围
         self.ax.set_xlim(x_min, x_max)
@@ -81,25 +154,13 @@ class GraphManager:
         
         # 设置网格
         if show_grid:
-            self.ax.grid(True, linestyle='--', alpha=0.2, color='#000000' if not self.dark_mode else '#FFFFFF', zorder=0)
+            apply_grid(self.ax, show_grid, self.dark_mode)
         
         # 设置图形样式
         self._apply_figure_style()
         
-        # 创建画布和工具栏
-        self.canvas = FigureCanvas(self.fig)
-        self.toolbar = NavigationToolbar(self.canvas, None)
-        
-        # 应用工具栏样式
-        self.toolbar.setStyleSheet(ModernTheme.get_toolbar_style(self.dark_mode))
-        
-        # 设置画布的大小策略和最小高度
-        self.canvas.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.canvas.setMinimumHeight(400)
-        
-        # 添加到布局
-        self.plot_layout.addWidget(self.toolbar)
-        self.plot_layout.addWidget(self.canvas)
+        # 交互点、标注和十字线所在的覆盖层
+        self.overlay = BlitOverlay(self.canvas, self.ax)
         
         # 连接事件
         self._connect_events()
@@ -112,6 +173,11 @@ class GraphManager:
     def plot_functions(self, equations, modules_dict, local_dict, transformations):
         """绘制函数图形
         
+        方程可以是 y = f(x) 形式的表达式、参数方程 (x(t), y(t)) 或极坐标方程 r = f(θ)。
+        新的方程列表按规范化文本与上一次绘制的比较：未改变的方程保留线条、
+        采样和分析结果，只编译、采样和分析新增或修改的方程，删除的方程移除其线条；
+        交点只对包含新曲线的函数对重新计算。
+        
         Args:
             equations: 方程式列表
             modules_dict: 模块字典，用于lambdify
@@ -119,74 +185,95 @@ class GraphManager:
             transformations: 转换列表，用于parse_expr
             
         Returns:
-            str: 结果文本
+            str: 结果文本，函数属性会在后台分析完成后逐项写入结果区
         """
-        self.lines = []
-        self.expr_list = []
-        self.y_funcs_list = []
-        result_text = ""
+        # 新曲线以完整细节绘制
+        self.render_scheduler.reset_detail()
         
         # 获取当前坐标轴范围
         x_min, x_max = self.ax.get_xlim()
+        view = self._current_view()
+        
+        # 创建用于交点计算的x值数组，范围变化后旧的交点不再适用
+        x_vals = np.linspace(x_min, x_max, 800)
+        if self.x_vals is None or not np.array_equal(x_vals, self.x_vals):
+            self.pair_intersections = {}
+        self.x_vals = x_vals
         
-        # 创建x值数组
-        self.x_vals = np.linspace(x_min, x_max, 800)
+        # 上一次绘制的曲线按规范化文本分组，重复的方程各自对应一条旧曲线
+        previous = {}
+        for old_idx, key in enumerate(self.equation_keys):
+            previous.setdefault(key, []).append(old_idx)
         
         # 获取颜色列表
-        colors = plt.cm.tab10.colors
+        colors = colormaps['tab10'].colors
         
-        x = sp.symbols('x')
+        # 新的曲线状态：(规范化文本, 编译结果, 采样, 线条)
+        curves = []
+        new_lines = []
         
-        # 处理每个方程
+        # 处理每个方程，出错时撤销本次新画的线条，保留上一次的图形
         for idx, equation in enumerate(equations):
+            key = ExpressionCache.normalize(equation)
+            
+            # 未改变的方程沿用已有的线条和采样
+            if previous.get(key):
+                old_idx = previous[key].pop(0)
+                curves.append((key, self.compiled_list[old_idx], self.samples[old_idx], self.lines[old_idx]))
+                continue
+            
             try:
-                # 解析表达式
-                expr = parse_expr(
-                    equation,
-                    transformations=transformations,
-                    local_dict=local_dict,
+                # 解析并编译表达式（命中缓存时跳过解析、lambdify和LaTeX渲染）
+                compiled = self.expression_cache.compile(
+                    equation, local_dict, transformations, modules_dict
                 )
                 
-                # 检查表达式中的符号
-                symbols_in_expr = expr.free_symbols
-                if not symbols_in_expr.issubset({x}):
-                    unsupported_vars = symbols_in_expr - {x}
+                # 检查表达式中的符号（y = f(x) 只允许x，参数方程只允许t，极坐标方程只允许θ）
+                symbols_in_expr = compiled.expr.free_symbols
+                if not symbols_in_expr.issubset({compiled.variable}):
+                    unsupported_vars = symbols_in_expr - {compiled.variable}
                     var_names = ', '.join(str(var) for var in unsupported_vars)
+                    self._remove_lines(new_lines)
                     return f"Error: Equation {idx + 1} contains unsupported variables: {var_names}"
                 
-                # 保存表达式
-                self.expr_list.append(expr)
-                
-                # 创建函数并计算y值
-                y_func = sp.lambdify(x, expr, modules=[modules_dict, "numpy"])
-                y_vals = y_func(self.x_vals)
-                self.y_funcs_list.append(y_func)
-                
-                try:
-                    latex_label = sp.latex(expr)
-                except Exception:
-                    latex_label = str(expr) # Fallback to string representation
+                # 自适应采样
+                x_samples, y_vals = self._sample_curve(compiled)
                 
                 # 绘制函数
                 line, = self.ax.plot(
-                    self.x_vals, y_vals, 
+                    *self._display_data(x_samples, y_vals, compiled.kind), 
                     color=colors[idx % len(colors)],
-                    label=f"${latex_label}$"
+                    label=f"${compiled.label}$"
                 )
-                self.lines.append(line)
-                
-                # 计算函数属性
-                properties = FunctionAnalyzer.compute_function_properties(expr)
-                
-                # 添加到结果文本
-                result_text += f"Equation {idx + 1}: {equation}\n"
-                for prop_name, prop_value in properties.items():
-                    result_text += f"{prop_name}: {prop_value}\n"
-                result_text += "\n"
+                new_lines.append(line)
+                curves.append((key, compiled, (x_samples, y_vals), line))
                 
             except Exception as e:
+                self._remove_lines(new_lines)
                 return f"Error processing equation {idx + 1}: {str(e)}"
         
+        # 移除已删除或已修改的方程的旧线条
+        self._remove_lines(self.lines[old_idx] for old_indices in previous.values() for old_idx in old_indices)
+        
+        # 沿用的曲线按新序号更新颜色，视图变化后按当前视图重新采样
+        for idx, (key, compiled, samples, line) in enumerate(curves):
+            line.set_color(colors[idx % len(colors)])
+            if line not in new_lines and view != self.sampled_view:
+                samples = self._sample_curve(compiled)
+                line.set_data(*self._display_data(*samples, compiled.kind))
+                curves[idx] = (key, compiled, samples, line)
+        
+        self.equation_keys = [key for key, _, _, _ in curves]
+        self.compiled_list = [compiled for _, compiled, _, _ in curves]
+        self.expr_list = [compiled.expr for compiled in self.compiled_list]
+        self.labels = [compiled.label for compiled in self.compiled_list]
+        self.y_funcs_list = [compiled.func for compiled in self.compiled_list]
+        self.samples = [samples for _, _, samples, _ in curves]
+        self.lines = [line for _, _, _, line in curves]
+        
+        # 记录本次采样对应的视图
+        self.sampled_view = view
+        
         # 计算交点
         self.update_intersections()
         
@@ -199,16 +286,200 @@ class GraphManager:
         # 更新状态栏
         self.statusbar.showMessage(f"Plotted {len(equations)} equation(s)")
         
-        return result_text
+        # 在后台分析函数属性（未改变的方程沿用已有结果，参数方程和极坐标方程不做函数分析）
+        self.analysis_runner.start(equations, [
+            compiled.expr if compiled.kind == CARTESIAN else None for compiled in self.compiled_list
+        ])
+        
+        return self.analysis_runner.format_results()
     
-    def update_intersections(self):
-        """更新函数交点"""
-        if len(self.y_funcs_list) >= 2 and self.x_vals is not None:
-            self.intersection_points = FunctionAnalyzer.find_intersections(self.y_funcs_list, self.x_vals)
+    def resample_visible(self):
+        """按当前视图重新采样所有曲线
+        
+        复用已编译的函数，原地更新已有线条的数据而不重新绘制。
+        """
+        if not self.ax or not self.lines:
+            return
+        
+        # 交互结束，恢复完整细节
+        restore = self.render_scheduler.reset_detail()
+        
+        view = self._current_view()
+        if view == self.sampled_view:
+            if restore:
+                self._apply_detail(1.0)
+                self.render_scheduler.request(interactive=False)
+            return
+        
+        for idx, (line, compiled) in enumerate(zip(self.lines, self.compiled_list)):
+            try:
+                x_samples, y_vals = self._sample_curve(compiled)
+            except Exception:
+                continue
+            line.set_data(*self._display_data(x_samples, y_vals, compiled.kind))
+            self.samples[idx] = (x_samples, y_vals)
+        
+        self.sampled_view = view
+        self.render_scheduler.request(interactive=False)
+    
+    def request_redraw(self):
+        """登记一次由交互触发的重绘，同一帧内的多次请求合并为一次"""
+        self.render_scheduler.request()
+    
+    def _draw_canvas(self):
+        """立即完整重绘画布"""
+        if self.canvas:
+            self.canvas.draw()
+    
+    def _apply_detail(self, detail):
+        """按细节等级更新线条数据
+        
+        等级低于1时按步长抽取显示用的点（保留无定义的点，断开处不会被连起来），
+        等级为1时恢复按像素精简后的完整数据。
+        
+        Args:
+            detail: 细节等级（0到1）
+        """
+        step = max(1, int(round(1.0 / detail)))
+        for line, samples, compiled in zip(self.lines, self.samples, self.compiled_list):
+            x_samples, y_vals = self._display_data(*samples, compiled.kind)
+            if step > 1 and x_samples.size > 2 * step:
+                keep = np.zeros(x_samples.size, dtype=bool)
+                keep[::step] = True
+                keep[-1] = True
+                keep |= ~np.isfinite(y_vals)
+                line.set_data(x_samples[keep], y_vals[keep])
+            else:
+                line.set_data(x_samples, y_vals)
+    
+    def _display_data(self, x_samples, y_vals, kind=CARTESIAN):
+        """把采样数据精简为当前画布宽度下每像素列的最小/最大值包络
+        
+        绘制开销只取决于屏幕宽度，与采样点数无关。参数曲线和极坐标曲线的x不单调，
+        按像素列精简不适用，其采样点数已由采样预算限制，原样返回。
+        
+        Args:
+            x_samples: x值数组
+            y_vals: y值数组
+            kind: 曲线类型
+            
+        Returns:
+            tuple: (x值数组, y值数组)
+        """
+        if kind != CARTESIAN:
+            return x_samples, y_vals
+        x_min, x_max = self.ax.get_xlim()
+        return decimate_minmax(x_samples, y_vals, x_min, x_max, self.ax.bbox.width)
+    
+    def _on_resize(self, event):
+        """画布尺寸变化后按新的像素宽度重新精简线条数据
+        
+        Args:
+            event: 尺寸变化事件对象
+        """
+        if self.lines:
+            self._apply_detail(self.render_scheduler.detail)
+    
+    def _sample_curve(self, compiled):
+        """按当前视图自适应采样一条曲线
+        
+        y = f(x) 在视图（含两侧余量）的x范围内采样；参数曲线和极坐标曲线在整个参数（θ）范围内采样，
+        精度按当前视图衡量。
+        
+        Args:
+            compiled: 曲线的编译结果
             
-            # 在图上标记交点
-            for x, y in self.intersection_points:
-                self.ax.plot(x, y, 'ro', markersize=4)
+        Returns:
+            tuple: (x值数组, y值数组)
+        """
+        x_min, x_max = self.ax.get_xlim()
+        y_min, y_max = self.ax.get_ylim()
+        if compiled.kind != CARTESIAN:
+            _, x_vals, y_vals = self.parametric_sampler.sample(
+                compiled.func, *compiled.domain, x_min, x_max, y_min, y_max
+            )
+            return x_vals, y_vals
+        margin = (x_max - x_min) * self.VIEW_MARGIN
+        return self.sampler.sample(compiled.func, x_min - margin, x_max + margin, y_min, y_max)
+    
+    def _current_view(self):
+        """返回当前视图范围
+        
+        Returns:
+            tuple: (x_min, x_max, y_min, y_max)
+        """
+        return tuple(self.ax.get_xlim()) + tuple(self.ax.get_ylim())
+    
+    def _on_view_changed(self, ax):
+        """坐标轴范围变化回调，启动（或重启）防抖定时器
+        
+        Args:
+            ax: 范围发生变化的坐标轴
+        """
+        if self.lines:
+            self.resample_timer.start()
+    
+    def update_intersections(self):
+        """更新函数交点
+        
+        交点按函数对（以两条曲线的规范化文本为键）缓存，只计算缓存中缺少的函数对；
+        所有交点用同一个标记对象显示。y = f(x) 曲线之间批量求根，
+        涉及参数曲线或极坐标曲线的函数对在已缓存的采样折线上求交。
+        """
+        keys = self.equation_keys
+        pair_keys = {
+            (i, j): tuple(sorted((keys[i], keys[j])))
+            for i in range(len(keys)) for j in range(i + 1, len(keys))
+        }
+        missing_pairs = [pair for pair, pair_key in pair_keys.items() if pair_key not in self.pair_intersections]
+        
+        # y = f(x) 曲线在其子列表中的位置
+        cartesian = [idx for idx, compiled in enumerate(self.compiled_list) if compiled.kind == CARTESIAN]
+        position = {idx: pos for pos, idx in enumerate(cartesian)}
+        
+        # 有函数对尚未计算的 y = f(x) 曲线
+        missing = set()
+        for i, j in missing_pairs:
+            if i in position and j in position:
+                missing.update((position[i], position[j]))
+        found = {}
+        if missing and self.x_vals is not None:
+            found = FunctionAnalyzer.find_pair_intersections(
+                [self.y_funcs_list[idx] for idx in cartesian], self.x_vals, curves=missing
+            )
+        
+        for i, j in missing_pairs:
+            if i in position and j in position:
+                if self.x_vals is None:
+                    continue
+                points = found.get((position[i], position[j]), [])
+            else:
+                points = FunctionAnalyzer.find_sample_intersections(self.samples[i], self.samples[j])
+            self.pair_intersections[pair_keys[(i, j)]] = points
+        
+        # 只保留当前函数对的缓存
+        current = set(pair_keys.values())
+        self.pair_intersections = {
+            pair_key: points for pair_key, points in self.pair_intersections.items() if pair_key in current
+        }
+        self.intersection_points = sorted({point for points in self.pair_intersections.values() for point in points})
+        
+        # 在图上标记交点
+        x_points = [x for x, _ in self.intersection_points]
+        y_points = [y for _, y in self.intersection_points]
+        if self.intersection_markers is None or self.intersection_markers.axes is not self.ax:
+            self.intersection_markers, = self.ax.plot(x_points, y_points, 'ro', markersize=4)
+        else:
+            self.intersection_markers.set_data(x_points, y_points)
+    
+    def _remove_lines(self, lines):
+        """从坐标轴上移除线条
+        
+        Args:
+            lines: 线条对象的可迭代对象
+        """
+        for line in lines:
+            line.remove()
     
     def reset_view(self, x_min=-10, x_max=10, y_min=-10, y_max=10):
         """重置视图到默认状态
@@ -224,13 +495,25 @@ class GraphManager:
             self.ax.set_ylim(y_min, y_max)
             self.canvas.draw()
     
+    def clear_analysis_cache(self):
+        """清空持久化分析缓存，下次绘制时重新分析所有方程"""
+        self.analysis_runner.clear_cache()
+    
     def clear_graphs(self):
         """清除所有图形并重置状态"""
+        # 停止后台分析
+        self.analysis_runner.cancel()
+        
         # 重置内部状态
         self.expr_list = []
         self.lines = []
         self.y_funcs_list = []
+        self.samples = []
+        self.labels = []
+        self.compiled_list = []
+        self.equation_keys = []
         self.intersection_points = []
+        self.pair_intersections = {}
         
         # 设置新的图形
         self.setup_new_figure()
@@ -246,64 +529,29 @@ class GraphManager:
         if self.ax and self.canvas:
             # 应用新的样式
             self._apply_figure_style()
+            
+            # 覆盖层的背景和标注颜色随主题变化
+            if self.text_annotation:
+                self.text_annotation.set_color('black' if not dark_mode else 'white')
+            if self.overlay:
+                self.overlay.invalidate()
             self.canvas.draw()
     
     def _apply_figure_style(self):
         """应用图形样式"""
-        # 设置图表样式
-        plt.style.use('default')
-        
-        if self.dark_mode:
-            # 暗色模式
-            self.fig.patch.set_facecolor('#1C1C1E')
-            self.ax.set_facecolor('#2C2C2E')
-            
-            # 设置坐标轴
-            for spine in ['left', 'bottom', 'right', 'top']:
-                self.ax.spines[spine].set_linewidth(0.5)
-                self.ax.spines[spine].set_color('#48484A')
-            
-            # 美化刻度
-            self.ax.tick_params(axis='both', color='#48484A', width=0.5)
-            
-            # 设置字体
-            for label in self.ax.get_xticklabels() + self.ax.get_yticklabels():
-                label.set_fontsize(10)
-                label.set_fontfamily('Arial')
-                label.set_color('#8E8E93')
-        else:
-            # 亮色模式
-            self.fig.patch.set_facecolor('#FFFFFF')
-            self.ax.set_facecolor('#FAFAFA')
-            
-            # 设置坐标轴
-            for spine in ['left', 'bottom', 'right', 'top']:
-                self.ax.spines[spine].set_linewidth(0.5)
-                self.ax.spines[spine].set_color('#D1D1D6')
-            
-            # 美化刻度
-            self.ax.tick_params(axis='both', color='#D1D1D6', width=0.5)
-            
-            # 设置字体
-            for label in self.ax.get_xticklabels() + self.ax.get_yticklabels():
-                label.set_fontsize(10)
-                label.set_fontfamily('Arial')
-                label.set_color('#6C6C70')
+        apply_figure_style(self.fig, self.ax, self.dark_mode)
     
     def _update_legend(self):
-        """更新图例"""
-        if self.ax:
-            self.ax.legend(
-                loc='upper left',
-                fontsize=10,
-                frameon=True,
-                fancybox=True,
-                shadow=True,
-                framealpha=0.95,
-                edgecolor='#D1D1D6' if not self.dark_mode else '#48484A',
-                borderpad=1,
-                labelspacing=0.5
-            )
+        """更新图例，没有曲线时移除旧图例
+        
+        沿用的线条保留其在坐标轴中的原有顺序，图例按方程序号（self.lines的顺序）显式排列。
+        """
+        if not self.ax:
+            return
+        if self.lines:
+            apply_legend(self.ax, self.dark_mode, self.lines)
+        elif self.ax.get_legend():
+            self.ax.get_legend().remove()
     
     def _connect_events(self):
         """连接事件处理器"""
@@ -311,6 +559,10 @@ class GraphManager:
             self.cid_press = self.canvas.mpl_connect('button_press_event', self.on_press)
             self.cid_motion = self.canvas.mpl_connect('motion_notify_event', self.on_motion)
             self.cid_release = self.canvas.mpl_connect('button_release_event', self.on_release)
+            self.cid_resize = self.canvas.mpl_connect('resize_event', self._on_resize)
+        if self.ax:
+            self.cid_xlim = self.ax.callbacks.connect('xlim_changed', self._on_view_changed)
+            self.cid_ylim = self.ax.callbacks.connect('ylim_changed', self._on_view_changed)
     
     def _disconnect_events(self):
         """断开事件处理器连接"""
@@ -321,14 +573,18 @@ class GraphManager:
                 self.canvas.mpl_disconnect(self.cid_motion)
             if self.cid_release:
                 self.canvas.mpl_disconnect(self.cid_release)
-    
-    def _clear_plot_layout(self):
-        """清除绘图布局中的所有部件"""
-        if self.plot_layout:
-            for i in reversed(range(self.plot_layout.count())):
-                widget = self.plot_layout.itemAt(i).widget()
-                if widget:
-                    widget.setParent(None)
+            if self.cid_resize:
+                self.canvas.mpl_disconnect(self.cid_resize)
+        if self.ax:
+            if self.cid_xlim:
+                self.ax.callbacks.disconnect(self.cid_xlim)
+            if self.cid_ylim:
+                self.ax.callbacks.disconnect(self.cid_ylim)
+        if self.overlay:
+            self.overlay.disconnect()
+            self.overlay = None
+        self.resample_timer.stop()
+        self.render_scheduler.cancel()
     
     # 以下是事件处理方法，将在interactions.py中实现
     def on_press(self, event):
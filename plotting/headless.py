@@ -0,0 +1,151 @@
+"""
+无界面渲染模块 - 不依赖Qt，用Agg后端把方程式渲染为图片
+"""
+
+from itertools import combinations
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from core.expression_cache import CARTESIAN, ExpressionCache
+from core.function_props import FunctionAnalyzer
+from core.sampling import AdaptiveSampler, ParametricSampler, decimate_minmax
+from plotting.style import apply_figure_style, apply_grid, apply_legend
+from utils.helpers import ExpressionParser
+
+
+class HeadlessRenderer:
+    """无界面渲染器类，按与界面相同的样式绘制方程式并保存为PNG或SVG"""
+
+    # 导出时每条曲线的采样点预算，高于界面以适应高分辨率输出
+    MAX_POINTS = 4000
+
+    def __init__(self, x_range=(-10, 10), y_range=(-10, 10), dpi=300, figsize=(10, 8),
+                 show_grid=True, dark_mode=False, intersections=True):
+        """初始化渲染器
+
+        Args:
+            x_range: x轴范围
+            y_range: y轴范围
+            dpi: 输出分辨率
+            figsize: 图形尺寸（英寸）
+            show_grid: 是否显示网格
+            dark_mode: 是否使用暗色模式
+            intersections: 是否标记交点
+        """
+        self.x_range = tuple(x_range)
+        self.y_range = tuple(y_range)
+        self.dpi = dpi
+        self.figsize = tuple(figsize)
+        self.show_grid = show_grid
+        self.dark_mode = dark_mode
+        self.intersections = intersections
+
+        self.expression_cache = ExpressionCache.shared()
+        self.sampler = AdaptiveSampler(max_points=self.MAX_POINTS)
+        self.parametric_sampler = ParametricSampler(max_points=self.MAX_POINTS)
+        self.modules = ExpressionParser.plot_modules()
+        self.local_dict = ExpressionParser.plot_local_dict()
+
+    def render(self, equations, filename):
+        """绘制方程式并保存，格式由文件扩展名决定
+
+        Args:
+            equations: 方程式字符串列表
+            filename: 输出文件路径（.png或.svg）
+
+        Returns:
+            int: 绘制的曲线数量
+
+        Raises:
+            ValueError: 方程式无法解析或包含不支持的变量
+        """
+        # 使用导出分辨率创建图形，坐标轴宽度即为输出图片中的像素列数
+        fig = Figure(figsize=self.figsize, dpi=self.dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.set_xlim(*self.x_range)
+        ax.set_ylim(*self.y_range)
+        if self.show_grid:
+            apply_grid(ax, self.show_grid, self.dark_mode)
+        apply_figure_style(fig, ax, self.dark_mode)
+
+        colors = colormaps['tab10'].colors
+        y_funcs = []
+        curves = []
+        for idx, equation in enumerate(equations):
+            compiled = self._compile(idx, equation)
+            if compiled.kind == CARTESIAN:
+                x_samples, y_vals = self.sampler.sample(compiled.func, *self.x_range, *self.y_range)
+                y_funcs.append(compiled.func)
+            else:
+                _, x_samples, y_vals = self.parametric_sampler.sample(
+                    compiled.func, *compiled.domain, *self.x_range, *self.y_range
+                )
+            ax.plot(
+                *self._display_data(ax, x_samples, y_vals, compiled.kind),
+                color=colors[idx % len(colors)], label=f"${compiled.label}$"
+            )
+            curves.append((compiled.kind, (x_samples, y_vals)))
+
+        # 标记交点：y = f(x) 曲线之间批量求根，其余函数对在采样折线上求交
+        if self.intersections and len(curves) >= 2:
+            points = []
+            if len(y_funcs) >= 2:
+                points += FunctionAnalyzer.find_intersections(y_funcs, np.linspace(*self.x_range, 800))
+            for (first_kind, first), (second_kind, second) in combinations(curves, 2):
+                if first_kind != CARTESIAN or second_kind != CARTESIAN:
+                    points += FunctionAnalyzer.find_sample_intersections(first, second)
+            for x, y in points:
+                ax.plot(x, y, 'ro', markersize=4)
+
+        if equations:
+            apply_legend(ax, self.dark_mode)
+
+        fig.savefig(filename, dpi=self.dpi, bbox_inches='tight')
+        return len(equations)
+
+    def _display_data(self, ax, x_samples, y_vals, kind):
+        """把y = f(x)曲线精简为输出分辨率下每像素列的最小/最大值包络
+
+        导出文件（尤其是SVG）的顶点数只取决于输出宽度，与采样点数无关；
+        参数曲线和极坐标曲线的x不单调，原样返回。交点仍按完整采样数据计算。
+
+        Args:
+            ax: 坐标轴对象
+            x_samples: x值数组
+            y_vals: y值数组
+            kind: 曲线类型
+
+        Returns:
+            tuple: (x值数组, y值数组)
+        """
+        if kind != CARTESIAN:
+            return x_samples, y_vals
+        return decimate_minmax(x_samples, y_vals, *self.x_range, ax.bbox.width)
+
+    def _compile(self, idx, equation):
+        """预处理并编译单个方程式
+
+        Args:
+            idx: 方程序号（用于错误信息）
+            equation: 方程式字符串
+
+        Returns:
+            CompiledExpression: 编译结果
+        """
+        try:
+            compiled = self.expression_cache.compile(
+                ExpressionParser.preprocess(equation), self.local_dict,
+                ExpressionParser.TRANSFORMATIONS, self.modules
+            )
+        except Exception as e:
+            raise ValueError(f"Error processing equation {idx + 1}: {e}") from e
+
+        unsupported_vars = compiled.expr.free_symbols - {compiled.variable}
+        if unsupported_vars:
+            var_names = ', '.join(str(var) for var in unsupported_vars)
+            raise ValueError(f"Equation {idx + 1} contains unsupported variables: {var_names}")
+        return compiled
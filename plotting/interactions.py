@@ -6,6 +6,8 @@ import numpy as np
 import sympy as sp
 from PyQt6.QtCore import Qt
 
+from core.expression_cache import CARTESIAN
+
 
 class GraphInteractions:
     """图表交互处理类，用于处理用户与图表的交互"""
@@ -81,8 +83,8 @@ class GraphInteractions:
                 ax.set_xlim(x_min + dx, x_max + dx)
                 ax.set_ylim(y_min + dy, y_max + dy)
                 
-                # 更新画布
-                self.graph_manager.canvas.draw_idle()
+                # 登记重绘，同一帧内的多次移动只重绘一次
+                self.graph_manager.request_redraw()
                 
                 # 更新起始点
                 self.pan_start = (event.xdata, event.ydata)
@@ -95,6 +97,12 @@ class GraphInteractions:
         """
         if event.button == 1:  # 左键
             self.pressing = False
+            
+            # 松开后隐藏十字线，保留点和标注
+            if self.graph_manager.crosshair and self.graph_manager.overlay:
+                for line in self.graph_manager.crosshair:
+                    line.set_visible(False)
+                self.graph_manager.overlay.update()
         
         elif event.button == 2:  # 中键
             self.panning = False
@@ -103,6 +111,11 @@ class GraphInteractions:
     def update_dot(self, event):
         """更新交互点和标注
         
+        最近曲线的选取在已采样的数组上插值完成，不再逐条调用函数，
+        只对选中的曲线求值一次；参数曲线和极坐标曲线取折线上离鼠标最近的点。
+        点、标注和十字线只创建一次，之后原地更新，
+        并通过覆盖层blit到屏幕，不重绘曲线和网格。
+        
         Args:
             event: 鼠标事件对象
         """
@@ -143,76 +156,178 @@ class GraphInteractions:
         
         # 如果没有选中图形且没有捕捉到交点，则选择最近的曲线
         if self.selected_graph_index is None and not snapped_to_intersection:
-            y_curves = []
-            for y_func in self.graph_manager.y_funcs_list:
-                try:
-                    y_curve = y_func(x_snap)
-                    if np.isfinite(y_curve):
-                        y_curves.append(y_curve)
-                    else:
-                        y_curves.append(np.nan)
-                except Exception:
-                    y_curves.append(np.nan)
-            
-            # 计算到每条曲线的距离
-            distances = [abs(y - y_curve) for y_curve in y_curves]
-            valid_distances = [(dist, idx) for idx, dist in enumerate(distances) if not np.isnan(dist)]
-            
-            if not valid_distances:
+            # 计算到每条曲线的距离（参数曲线和极坐标曲线的归一化距离换算为y方向的长度）
+            distances = np.array([
+                abs(y - self._interpolate(samples, x_snap)) if compiled.kind == CARTESIAN
+                else self._nearest_point(samples, x, y, x_scale, y_scale)[2] * y_scale
+                for samples, compiled in zip(self.graph_manager.samples, self.graph_manager.compiled_list)
+            ])
+            if not np.any(np.isfinite(distances)):
                 return
             
             # 选择最近的曲线
-            min_distance, min_index = min(valid_distances, key=lambda t: t[0])
-            y_curve = y_curves[min_index]
+            min_index = int(np.nanargmin(distances))
             
             # 如果距离小于阈值，则选中该曲线
-            if min_distance < y_threshold:
+            if distances[min_index] < y_threshold:
                 self.selected_graph_index = min_index
             else:
                 return
         
         # 如果已选中图形，则更新点和标注
         if self.selected_graph_index is not None:
+            # 只对选中的曲线精确求值一次，失败时退回插值结果
             try:
+                samples = self.graph_manager.samples[self.selected_graph_index]
                 y_func = self.graph_manager.y_funcs_list[self.selected_graph_index]
-                y_curve = y_func(x_snap)
-                
-                if not np.isfinite(y_curve):
-                    return
-                
-                # 移除现有的点和标注
-                if self.graph_manager.dot:
-                    self.graph_manager.dot.remove()
-                
-                if self.graph_manager.text_annotation:
-                    self.graph_manager.text_annotation.remove()
-                
-                # 绘制新的点
-                self.graph_manager.dot = self.graph_manager.ax.plot(x_snap, y_curve, 'ro')[0]
-                
-                # 格式化坐标显示
-                x_display = round(x_snap, 2)
-                y_display = round(y_curve, 2)
-                
-                # 获取方程标签
-                equation_label = f"${sp.latex(self.graph_manager.expr_list[self.selected_graph_index])}$"
-                
-                # 添加文本标注
-                self.graph_manager.text_annotation = self.graph_manager.ax.text(
+                compiled = self.graph_manager.compiled_list[self.selected_graph_index]
+            except IndexError:
+                return
+            if compiled.kind != CARTESIAN:
+                # 参数曲线和极坐标曲线不按整数x捕捉，只在捕捉到交点时使用交点位置
+                x_target = x_snap if snapped_to_intersection else x
+                x_snap, y_curve, _ = self._nearest_point(samples, x_target, y, x_scale, y_scale)
+            else:
+                try:
+                    y_curve = float(y_func(x_snap))
+                except (ValueError, TypeError, ZeroDivisionError, OverflowError):
+                    y_curve = self._interpolate(samples, x_snap)
+            
+            if not np.isfinite(y_curve):
+                return
+            
+            # 格式化坐标显示
+            x_display = round(x_snap, 2)
+            y_display = round(y_curve, 2)
+            
+            # 获取方程标签（编译时已缓存LaTeX）
+            equation_label = f"${self._label(self.selected_graph_index)}$"
+            text = f"({x_display}, {y_display})\n{equation_label}"
+            text_y = y_curve + y_scale * 0.03
+            color = 'black' if not self.graph_manager.dark_mode else 'white'
+            
+            gm = self.graph_manager
+            overlay = gm.overlay
+            
+            # 更新点，对象不存在或已不在当前坐标轴上时才新建
+            dot = gm.dot
+            if dot is None or dot.axes is not ax:
+                gm.dot = overlay.add(ax.plot(x_snap, y_curve, 'ro')[0])
+            else:
+                dot.set_data([x_snap], [y_curve])
+            
+            # 更新十字线
+            if gm.crosshair is None or gm.crosshair[0].axes is not ax:
+                style = dict(linestyle='--', linewidth=0.8, alpha=0.5, color='#8E8E93')
+                gm.crosshair = (
+                    overlay.add(ax.axvline(x_snap, **style)),
+                    overlay.add(ax.axhline(y_curve, **style)),
+                )
+            else:
+                gm.crosshair[0].set_xdata([x_snap, x_snap])
+                gm.crosshair[1].set_ydata([y_curve, y_curve])
+            for line in gm.crosshair:
+                line.set_visible(True)
+            
+            # 更新文本标注，文本未变时不重新排版
+            annotation = gm.text_annotation
+            if annotation is None or annotation.axes is not ax:
+                gm.text_annotation = overlay.add(ax.text(
                     x_snap,
-                    y_curve + (self.graph_manager.ax.get_ylim()[1] - self.graph_manager.ax.get_ylim()[0]) * 0.03,
-                    f"({x_display}, {y_display})\n{equation_label}",
+                    text_y,
+                    text,
                     fontsize=10,
-                    color='black' if not self.graph_manager.dark_mode else 'white',
+                    color=color,
                     ha='center',
                     va='bottom'
-                )
-                
-                # 更新画布
-                self.graph_manager.canvas.draw_idle()
+                ))
+            else:
+                annotation.set_position((x_snap, text_y))
+                if annotation.get_text() != text:
+                    annotation.set_text(text)
+                annotation.set_color(color)
+            
+            # 只重绘覆盖层
+            overlay.update()
+    
+    def _label(self, index):
+        """获取曲线的LaTeX标签，优先使用编译时缓存的结果
+        
+        Args:
+            index: 曲线序号
+            
+        Returns:
+            str: LaTeX字符串
+        """
+        labels = self.graph_manager.labels
+        if index >= len(labels):
+            labels.extend([None] * (index + 1 - len(labels)))
+        if labels[index] is None:
+            labels[index] = sp.latex(self.graph_manager.expr_list[index])
+        return labels[index]
+    
+    @staticmethod
+    def _interpolate(samples, x):
+        """在已采样的曲线上线性插值
+        
+        Args:
+            samples: (x值数组, y值数组)，x值递增
+            x: 要取值的x坐标
+            
+        Returns:
+            float: 插值结果，超出采样范围或相邻采样无定义时为nan
+        """
+        x_vals, y_vals = samples
+        pos = np.searchsorted(x_vals, x)
+        if pos == 0:
+            return float(y_vals[0]) if x_vals.size and x == x_vals[0] else np.nan
+        if pos >= x_vals.size:
+            return np.nan
+        
+        x0, x1 = x_vals[pos - 1], x_vals[pos]
+        y0, y1 = y_vals[pos - 1], y_vals[pos]
+        if x1 == x0:
+            return float(y0)
+        return float(y0 + (y1 - y0) * (x - x0) / (x1 - x0))
+    
+    @staticmethod
+    def _nearest_point(samples, x, y, x_scale, y_scale):
+        """在参数曲线的采样折线上找离 (x, y) 最近的点
+        
+        距离按视图宽高归一化，横竖方向的像素距离同等对待。
+        
+        Args:
+            samples: (x值数组, y值数组)，按参数顺序排列
+            x: 鼠标x坐标
+            y: 鼠标y坐标
+            x_scale: 视图宽度
+            y_scale: 视图高度
             
-            except (IndexError, ValueError, TypeError):
-                pass
+        Returns:
+            tuple: (x, y, 归一化距离)，没有有定义的线段时均为nan
+        """
+        x_vals, y_vals = samples
+        u = (x_vals - x) / x_scale
+        v = (y_vals - y) / y_scale
+        u0, v0 = u[:-1], v[:-1]
+        du, dv = np.diff(u), np.diff(v)
+        
+        # 鼠标在每条线段上的投影，位置限制在线段内
+        with np.errstate(invalid='ignore', divide='ignore'):
+            position = np.clip(-(u0 * du + v0 * dv) / (du * du + dv * dv), 0.0, 1.0)
+        position = np.nan_to_num(position)
+        u_near = u0 + position * du
+        v_near = v0 + position * dv
+        distances = np.hypot(u_near, v_near)
+        if not np.any(np.isfinite(distances)):
+            return np.nan, np.nan, np.nan
+        
+        nearest = int(np.nanargmin(distances))
+        return (
+            float(x + u_near[nearest] * x_scale),
+            float(y + v_near[nearest] * y_scale),
+            float(distances[nearest])
+        )
     
     def handle_wheel_event(self, event):
         """处理鼠标滚轮事件
@@ -278,10 +393,10 @@ class GraphInteractions:
         ax = self.graph_manager.ax
         canvas = self.graph_manager.canvas
         
-        # 获取鼠标在图表中的位置
+        # 获取鼠标在图表中的位置（画布像素坐标转换为数据坐标）
         try:
             coords = canvas.mouseEventCoords(event)
-            x_data, y_data = coords
+            x_data, y_data = ax.transData.inverted().transform(coords)
         except Exception:
             # 如果转换失败，使用图表中心作为默认位置
             x_min, x_max = ax.get_xlim()
@@ -307,8 +422,8 @@ class GraphInteractions:
         ax.set_xlim(x_min_new, x_max_new)
         ax.set_ylim(y_min_new, y_max_new)
         
-        # 更新画布
-        canvas.draw_idle()
+        # 登记重绘，连续的滚轮和手势事件合并到同一帧
+        self.graph_manager.request_redraw()
     
     def pan_wheel(self, delta_x, delta_y, event):
         """使用滚轮平移图表
@@ -328,5 +443,5 @@ class GraphInteractions:
         ax.set_xlim(x_min + delta_x, x_max + delta_x)
         ax.set_ylim(y_min + delta_y, y_max + delta_y)
         
-        # 更新画布
-        self.graph_manager.canvas.draw_idle()
+        # 登记重绘，连续的滚轮事件合并到同一帧
+        self.graph_manager.request_redraw()
@@ -0,0 +1,129 @@
+"""
+实时编译模块 - 输入时在工作线程中解析和编译方程式，不阻塞界面
+"""
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from core.expression_cache import ExpressionCache
+
+
+class CompileSignals(QObject):
+    """编译任务信号类，跨线程把结果送回主线程"""
+
+    # 参数：批次号、方程序号
+    compiled = pyqtSignal(int, int)
+
+    # 参数：批次号、方程序号、错误信息
+    failed = pyqtSignal(int, int, str)
+
+
+class CompileTask(QRunnable):
+    """单个方程的编译任务
+
+    编译结果写入共享的表达式缓存，主线程绘制时直接命中缓存。
+    """
+
+    def __init__(self, generation, index, equation, settings, compiler):
+        """初始化编译任务
+
+        Args:
+            generation: 所属批次号
+            index: 方程序号
+            equation: 预处理后的方程式字符串
+            settings: (local_dict, transformations, modules_dict)
+            compiler: 所属的实时编译器，用于检查批次是否已过期
+        """
+        super().__init__()
+        self.generation = generation
+        self.index = index
+        self.equation = equation
+        self.settings = settings
+        self.compiler = compiler
+
+    def run(self):
+        """解析、编译并检查变量，批次已过期时直接退出"""
+        if self.generation != self.compiler.generation:
+            return
+
+        local_dict, transformations, modules_dict = self.settings
+        try:
+            compiled = ExpressionCache.shared().compile(
+                self.equation, local_dict, transformations, modules_dict
+            )
+            unsupported_vars = compiled.expr.free_symbols - {compiled.variable}
+            if unsupported_vars:
+                var_names = ', '.join(sorted(str(var) for var in unsupported_vars))
+                raise ValueError(f"unsupported variables: {var_names}")
+        except Exception as e:
+            self._emit(self.compiler.signals.failed, self.generation, self.index, str(e) or type(e).__name__)
+            return
+        self._emit(self.compiler.signals.compiled, self.generation, self.index)
+
+    @staticmethod
+    def _emit(signal, *args):
+        """发送信号，应用退出时信号对象可能已被销毁"""
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            pass
+
+
+class LiveCompiler(QObject):
+    """实时编译器类
+
+    每次提交新的方程列表时开始新批次：丢弃尚未开始的旧任务，
+    正在运行的旧任务完成后其结果因批次号不同而被忽略，界面线程从不等待sympy。
+    """
+
+    # 编译线程数量
+    MAX_THREADS = 2
+
+    # 参数：方程序号
+    equation_ready = pyqtSignal(int)
+
+    # 参数：方程序号、错误信息
+    equation_failed = pyqtSignal(int, str)
+
+    def __init__(self, local_dict, transformations, modules_dict):
+        """初始化实时编译器
+
+        Args:
+            local_dict: 本地字典，用于parse_expr
+            transformations: 转换列表，用于parse_expr
+            modules_dict: 模块字典，用于lambdify
+        """
+        super().__init__()
+        self.settings = (local_dict, transformations, modules_dict)
+        self.generation = 0
+
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(self.MAX_THREADS)
+
+        self.signals = CompileSignals()
+        self.signals.compiled.connect(self._on_compiled)
+        self.signals.failed.connect(self._on_failed)
+
+    def submit(self, equations):
+        """取消旧批次并开始编译新的方程列表
+
+        Args:
+            equations: 预处理后的方程式字符串列表
+        """
+        self.cancel()
+        for idx, equation in enumerate(equations):
+            self.pool.start(CompileTask(self.generation, idx, equation, self.settings, self))
+
+    def cancel(self):
+        """丢弃尚未开始的任务和所有迟到的结果"""
+        self.pool.clear()
+        self.generation += 1
+
+    def _on_compiled(self, generation, index):
+        """编译成功（主线程）"""
+        if generation == self.generation:
+            self.equation_ready.emit(index)
+
+    def _on_failed(self, generation, index, message):
+        """编译失败（主线程）"""
+        if generation == self.generation:
+            self.equation_failed.emit(index, message)
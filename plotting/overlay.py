@@ -0,0 +1,97 @@
+"""
+覆盖层模块 - 用blitting只重绘交互点、标注和十字线
+"""
+
+
+class BlitOverlay:
+    """动画覆盖层类
+
+    完整重绘后缓存不含动画对象的背景，之后每次更新只恢复背景、
+    重绘注册的动画对象并blit到屏幕，不再重新渲染曲线、网格和图例。
+    尺寸、主题或视图变化后背景失效，下一次更新时先完整重绘一次。
+    """
+
+    def __init__(self, canvas, ax):
+        """初始化覆盖层
+
+        Args:
+            canvas: matplotlib画布对象
+            ax: 坐标轴对象
+        """
+        self.canvas = canvas
+        self.ax = ax
+        self.artists = []
+        self.background = None
+
+        self.cid_draw = canvas.mpl_connect('draw_event', self._on_draw)
+        self.cid_resize = canvas.mpl_connect('resize_event', self.invalidate)
+        self.cid_xlim = ax.callbacks.connect('xlim_changed', self.invalidate)
+        self.cid_ylim = ax.callbacks.connect('ylim_changed', self.invalidate)
+
+    def add(self, artist):
+        """注册动画对象，之后它只在覆盖层中绘制
+
+        Args:
+            artist: matplotlib图形对象
+
+        Returns:
+            图形对象本身
+        """
+        artist.set_animated(True)
+        self.artists.append(artist)
+        return artist
+
+    def remove(self, artist):
+        """注销并移除动画对象
+
+        Args:
+            artist: matplotlib图形对象
+        """
+        if artist in self.artists:
+            self.artists.remove(artist)
+        if artist.axes is not None:
+            artist.remove()
+
+    def invalidate(self, *args):
+        """使缓存的背景失效（作为回调使用时忽略参数）"""
+        self.background = None
+
+    def update(self):
+        """刷新覆盖层
+
+        背景有效时只重绘动画对象，否则完整重绘一次（背景会在绘制事件中重新缓存）。
+        """
+        if self.background is None:
+            self.canvas.draw()
+            return
+
+        figure = self.canvas.figure
+        self.canvas.restore_region(self.background)
+        self._draw_artists()
+        self.canvas.blit(figure.bbox)
+
+    def disconnect(self):
+        """断开所有回调"""
+        self.canvas.mpl_disconnect(self.cid_draw)
+        self.canvas.mpl_disconnect(self.cid_resize)
+        self.ax.callbacks.disconnect(self.cid_xlim)
+        self.ax.callbacks.disconnect(self.cid_ylim)
+        self.background = None
+
+    def _on_draw(self, event):
+        """完整重绘后缓存背景，并补画动画对象
+
+        Args:
+            event: 绘制事件对象
+        """
+        if event is not None and event.canvas is not self.canvas:
+            return
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        """绘制所有可见的动画对象"""
+        figure = self.canvas.figure
+        for artist in self.artists:
+            if artist.get_visible() and artist.figure is figure:
+                figure.draw_artist(artist)
@@ -0,0 +1,139 @@
+"""
+渲染调度模块 - 合并视图变化请求，每帧最多重绘一次
+"""
+
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+
+
+class RenderScheduler(QObject):
+    """渲染调度器类
+
+    平移、缩放和手势事件只登记重绘请求，调度器在下一帧统一重绘一次。
+    每次重绘都会计时：交互中的帧超出预算时降低曲线细节，充裕时再逐步恢复，
+    交互结束后由使用方调用reset_detail恢复完整细节；
+    调试模式下在状态栏显示帧率和绘制耗时。
+    """
+
+    # 帧间隔（毫秒），约60帧每秒
+    FRAME_MS = 16
+
+    # 细节等级的范围和每次调整的倍数
+    MIN_DETAIL = 0.25
+    DETAIL_STEP = 0.5
+
+    # 绘制耗时低于帧预算的该比例时才提高细节，避免来回抖动
+    RECOVER_RATIO = 0.5
+
+    # 绘制耗时的指数平滑系数
+    SMOOTHING = 0.3
+
+    def __init__(self, draw, statusbar=None, on_detail_changed=None, debug=False):
+        """初始化渲染调度器
+
+        Args:
+            draw: 执行一次完整重绘的函数
+            statusbar: 状态栏对象，调试模式下显示帧率
+            on_detail_changed: 细节等级变化时的回调，参数为新的等级（0到1）
+            debug: 是否为调试模式
+        """
+        super().__init__()
+        self.draw = draw
+        self.statusbar = statusbar
+        self.on_detail_changed = on_detail_changed
+        self.debug = debug
+
+        self.detail = 1.0
+        self.draw_ms = 0.0
+        self.last_frame = 0.0
+        self.requests = 0
+        self.frames = 0
+        self.interactive = False
+
+        # 帧率统计窗口
+        self.fps = 0.0
+        self._fps_window_start = time.perf_counter()
+        self._fps_window_frames = 0
+
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.render)
+
+    def request(self, interactive=True):
+        """登记一次重绘请求，同一帧内的多次请求只会重绘一次
+
+        Args:
+            interactive: 是否由平移缩放等交互触发，只有交互帧会调整细节等级
+        """
+        self.requests += 1
+        self.interactive |= interactive
+        if self.timer.isActive():
+            return
+
+        elapsed_ms = (time.perf_counter() - self.last_frame) * 1000
+        self.timer.start(int(max(0, self.FRAME_MS - elapsed_ms)))
+
+    def render(self):
+        """立即重绘并更新计时统计"""
+        self.timer.stop()
+        interactive, self.interactive = self.interactive, False
+
+        start = time.perf_counter()
+        self.draw()
+        end = time.perf_counter()
+
+        self.last_frame = end
+        self.frames += 1
+        self._record(1000 * (end - start), end, interactive)
+
+    def cancel(self):
+        """丢弃尚未执行的重绘请求"""
+        self.timer.stop()
+        self.interactive = False
+
+    def reset_detail(self):
+        """恢复完整细节（不触发回调）
+
+        Returns:
+            bool: 之前是否处于降低细节的状态
+        """
+        lowered = self.detail < 1.0
+        self.detail = 1.0
+        return lowered
+
+    def _record(self, draw_ms, now, interactive):
+        """记录一帧的绘制耗时，调整细节等级并更新帧率
+
+        Args:
+            draw_ms: 本帧绘制耗时（毫秒）
+            now: 本帧结束时间
+            interactive: 本帧是否由交互触发
+        """
+        if self.draw_ms:
+            self.draw_ms += self.SMOOTHING * (draw_ms - self.draw_ms)
+        else:
+            self.draw_ms = draw_ms
+
+        detail = self.detail
+        if interactive and self.draw_ms > self.FRAME_MS:
+            detail = max(self.MIN_DETAIL, detail * self.DETAIL_STEP)
+        elif interactive and self.draw_ms < self.FRAME_MS * self.RECOVER_RATIO:
+            detail = min(1.0, detail / self.DETAIL_STEP)
+        if detail != self.detail:
+            self.detail = detail
+            if self.on_detail_changed:
+                self.on_detail_changed(detail)
+
+        self._fps_window_frames += 1
+        window = now - self._fps_window_start
+        if window >= 1.0:
+            self.fps = self._fps_window_frames / window
+            self._fps_window_start = now
+            self._fps_window_frames = 0
+
+            if self.debug and self.statusbar:
+                self.statusbar.showMessage(
+                    f"{self.fps:.0f} FPS | draw {self.draw_ms:.1f} ms | "
+                    f"detail {self.detail:.0%} | {self.requests} requests / {self.frames} frames"
+                )
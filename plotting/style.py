@@ -0,0 +1,80 @@
+"""
+图形样式模块 - 坐标轴、网格和图例的样式设置（不依赖Qt，界面和无界面渲染共用）
+"""
+
+from matplotlib import style as mpl_style
+
+
+def apply_figure_style(fig, ax, dark_mode=False):
+    """应用图形样式
+
+    Args:
+        fig: matplotlib图形对象
+        ax: 坐标轴对象
+        dark_mode: 是否使用暗色模式
+    """
+    # 设置图表样式
+    mpl_style.use('default')
+    
+    if dark_mode:
+        # 暗色模式
+        fig.patch.set_facecolor('#1C1C1E')
+        ax.set_facecolor('#2C2C2E')
+        spine_color = '#48484A'
+        label_color = '#8E8E93'
+    else:
+        # 亮色模式
+        fig.patch.set_facecolor('#FFFFFF')
+        ax.set_facecolor('#FAFAFA')
+        spine_color = '#D1D1D6'
+        label_color = '#6C6C70'
+    
+    # 设置坐标轴
+    for spine in ['left', 'bottom', 'right', 'top']:
+        ax.spines[spine].set_linewidth(0.5)
+        ax.spines[spine].set_color(spine_color)
+    
+    # 美化刻度
+    ax.tick_params(axis='both', color=spine_color, width=0.5)
+    
+    # 设置字体
+    for label in ax.get_xticklabels() + ax.get_yticklabels():
+        label.set_fontsize(10)
+        label.set_fontfamily('Arial')
+        label.set_color(label_color)
+
+
+def apply_grid(ax, show_grid=True, dark_mode=False):
+    """设置网格
+
+    Args:
+        ax: 坐标轴对象
+        show_grid: 是否显示网格
+        dark_mode: 是否使用暗色模式
+    """
+    if show_grid:
+        ax.grid(True, linestyle='--', alpha=0.2, color='#000000' if not dark_mode else '#FFFFFF', zorder=0)
+    else:
+        ax.grid(False)
+
+
+def apply_legend(ax, dark_mode=False, handles=None):
+    """添加图例
+
+    Args:
+        ax: 坐标轴对象
+        dark_mode: 是否使用暗色模式
+        handles: 按显示顺序排列的线条，为None时按线条加入坐标轴的顺序
+    """
+    ax.legend(
+        handles=handles,
+        loc='upper left',
+        fontsize=10,
+        frameon=True,
+        fancybox=True,
+        shadow=True,
+        framealpha=0.95,
+        edgecolor='#D1D1D6' if not dark_mode else '#48484A',
+        borderpad=1,
+        labelspacing=0.5
+    )
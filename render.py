@@ -0,0 +1,149 @@
+"""
+绘图计算器 - 无界面批量渲染入口
+
+把方程式文件（每行一个方程式，与“保存方程式”的格式相同）批量渲染为PNG或SVG。
+使用Agg后端，不导入PyQt，可在没有显示器的服务器上运行；多个文件分配到进程池并行处理。
+
+用法示例：
+    python render.py equations/ -o figures --format svg --jobs 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+from utils.helpers import FileHandler
+
+
+# 每个工作进程各自持有一个渲染器，复用其中的表达式缓存
+_renderer = None
+
+
+def _init_worker(options):
+    """工作进程初始化：创建渲染器
+
+    Args:
+        options: 渲染器参数字典
+    """
+    global _renderer
+    from plotting.headless import HeadlessRenderer
+    _renderer = HeadlessRenderer(**options)
+
+
+def _render_file(source, target):
+    """渲染单个方程式文件
+
+    Args:
+        source: 方程式文件路径
+        target: 输出图片路径
+
+    Returns:
+        tuple: (源文件, 输出文件, 曲线数量, 错误信息或None)
+    """
+    equations = FileHandler.load_equations(source)
+    if not equations:
+        return source, target, 0, "no equations"
+    try:
+        count = _renderer.render(equations, target)
+    except Exception as e:
+        return source, target, 0, str(e)
+    return source, target, count, None
+
+
+def output_path(source, output_dir, fmt, base=None):
+    """计算输出图片路径，保留输入目录下的相对结构
+
+    Args:
+        source: 方程式文件路径
+        output_dir: 输出目录，为None时与源文件放在一起
+        fmt: 图片格式
+        base: 输入目录，用于计算相对路径
+
+    Returns:
+        str: 输出文件路径
+    """
+    stem = os.path.splitext(source)[0]
+    if output_dir is None:
+        return f"{stem}.{fmt}"
+    relative = os.path.relpath(stem, base) if base else os.path.basename(stem)
+    return os.path.join(output_dir, f"{relative}.{fmt}")
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Render equation files to PNG/SVG without the GUI.")
+    parser.add_argument('inputs', nargs='+', help="equation files or directories containing *.txt files")
+    parser.add_argument('-o', '--output-dir', help="output directory (default: next to each input file)")
+    parser.add_argument('-f', '--format', choices=['png', 'svg'], default='png', help="image format")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument('--dpi', type=int, default=300, help="output resolution")
+    parser.add_argument('--size', type=float, nargs=2, default=(10, 8), metavar=('W', 'H'), help="figure size in inches")
+    parser.add_argument('--x-range', type=float, nargs=2, default=(-10, 10), metavar=('MIN', 'MAX'))
+    parser.add_argument('--y-range', type=float, nargs=2, default=(-10, 10), metavar=('MIN', 'MAX'))
+    parser.add_argument('--no-grid', action='store_true', help="hide the grid")
+    parser.add_argument('--dark', action='store_true', help="use the dark theme")
+    parser.add_argument('--no-intersections', action='store_true', help="do not mark intersections")
+    parser.add_argument('--skip-existing', action='store_true', help="skip inputs whose output already exists")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """主函数
+
+    Returns:
+        int: 退出码，有文件渲染失败时为1
+    """
+    args = parse_args(argv)
+
+    options = {
+        'x_range': args.x_range,
+        'y_range': args.y_range,
+        'dpi': args.dpi,
+        'figsize': args.size,
+        'show_grid': not args.no_grid,
+        'dark_mode': args.dark,
+        'intersections': not args.no_intersections,
+    }
+
+    jobs = []
+    for path in args.inputs:
+        base = path if os.path.isdir(path) else None
+        for source in FileHandler.find_equation_files([path]):
+            target = output_path(source, args.output_dir, args.format, base)
+            if args.skip_existing and os.path.exists(target):
+                continue
+            jobs.append((source, target))
+
+    if not jobs:
+        print("Nothing to render.")
+        return 0
+
+    for _, target in jobs:
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+
+    start = time.perf_counter()
+    failures = 0
+    workers = max(1, min(args.jobs, len(jobs)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options,)) as pool:
+        futures = [pool.submit(_render_file, source, target) for source, target in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            source, target, count, error = future.result()
+            if error:
+                failures += 1
+                print(f"[{done}/{len(jobs)}] FAILED {source}: {error}", file=sys.stderr)
+            else:
+                print(f"[{done}/{len(jobs)}] {source} -> {target} ({count} curve(s))")
+
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {len(jobs) - failures}/{len(jobs)} file(s) in {elapsed:.1f} s with {workers} process(es)")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,50 +3,81 @@
 """
 
 import sys
-import numpy as np
-import sympy as sp
+import threading
 from PyQt6.QtWidgets import (
     QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
     QLabel, QLineEdit, QPushButton, QTextBrowser, QMessageBox, 
     QSizePolicy, QSplitter, QFileDialog, QStatusBar, QGroupBox, 
     QFormLayout, QGridLayout, QCheckBox
 )
-from PyQt6.QtCore import Qt, QEvent
+from PyQt6.QtCore import Qt, QEvent, QTimer
 from PyQt6.QtGui import QWheelEvent, QNativeGestureEvent
-from sympy.functions.special.bessel import jn, yn
-from scipy import special
 
 from ui.modern_theme import ModernTheme
-from plotting.graph_manager import GraphManager
-from plotting.interactions import GraphInteractions
-from utils.helpers import ExpressionParser, FileHandler
+
+# 绘图相关模块（matplotlib、sympy、scipy）导入较慢，在窗口首次绘制后由init_graphing加载
 
 
 class GraphingCalculatorWindow(QMainWindow):
     """绘图计算器主窗口类"""
     
-    def __init__(self):
-        """初始化主窗口"""
+    # 实时绘制时停止输入多久后开始编译（毫秒）
+    LIVE_DELAY_MS = 300
+    
+    def __init__(self, debug=False):
+        """初始化主窗口
+        
+        Args:
+            debug: 是否在状态栏显示帧率等调试信息
+        """
         super().__init__()
         
         # 设置窗口属性
         self.setWindowTitle("Graphing Calculator")
         self.resize(800, 1000)
         
+        # 图形管理器和交互处理器在窗口首次绘制后创建
+        self.debug = debug
+        self.graph_manager = None
+        self.interactions = None
+        self.modules = None
+        self._graphing_scheduled = False
+        
+        # 实时绘制状态：编译器在首次使用时创建
+        self.live_compiler = None
+        self.live_equations = []
+        self.live_status = []
+        self._live_plot_scheduled = False
+        
         # 初始化UI组件
         self.init_ui()
         
+        # 应用样式
+        self.apply_styles()
+        
+        self.statusBar().showMessage("正在加载绘图组件...")
+    
+    def init_graphing(self):
+        """加载绘图模块并创建图形管理器、交互处理器和初始图形
+        
+        窗口首次绘制后自动调用；需要图形的操作也会先调用它，重复调用不做任何事。
+        """
+        if self.graph_manager:
+            return
+        
+        from plotting.graph_manager import GraphManager
+        from plotting.interactions import GraphInteractions
+        from utils.helpers import ExpressionParser
+        
         # 初始化图形管理器
         self.graph_manager = GraphManager(
             self.plot_layout,
             self.statusBar(),
             self.result_browser,
-            self.dark_mode_checkbox.isChecked()
+            self.dark_mode_checkbox.isChecked(),
+            self.debug
         )
         
-        # 应用样式
-        self.apply_styles()
-        
         # 初始化交互处理器
         self.interactions = GraphInteractions(self.graph_manager)
         
@@ -56,20 +87,13 @@ class GraphingCalculatorWindow(QMainWindow):
         )
         
         # 定义模块字典，用于lambdify
-        self.modules = {
-            'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
-            'asin': np.arcsin, 'acos': np.arccos, 'atan': np.arctan,
-            'log': np.log, 'sqrt': np.sqrt, 'Abs': np.abs,
-            'exp': np.exp, 'ln': np.log, 'e': np.e, 'pi': np.pi,
-            'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
-            'asinh': np.arcsinh, 'acosh': np.arccosh, 'atanh': np.arctanh,
-            'sec': lambda x: 1 / np.cos(x),
-            'csc': lambda x: 1 / np.sin(x),
-            'cot': lambda x: 1 / np.tan(x),
-            'factorial': special.factorial, 'gamma': special.gamma,
-            'erf': special.erf, 'erfc': special.erfc,
-            'jn': special.jn, 'yn': special.yn
-        }
+        self.modules = ExpressionParser.plot_modules()
+        
+        # 在后台预先导入函数分析才用到的模块
+        from core.numeric import warm_up
+        threading.Thread(target=warm_up, daemon=True).start()
+        
+        self.statusBar().showMessage("就绪")
     
     def init_ui(self):
         """初始化用户界面"""
@@ -117,13 +141,27 @@ class GraphingCalculatorWindow(QMainWindow):
         input_2d_layout.addWidget(input_2d_label)
         
         self.entry_2d = QLineEdit()
-        self.entry_2d.setPlaceholderText("输入方程式，用空格分隔多个方程式，例如: sin(x) x^2 |x|")
+        self.entry_2d.setPlaceholderText("输入方程式，用空格分隔多个方程式，例如: sin(x) x^2 |x| (cos(3t), sin(2t))")
         input_2d_layout.addWidget(self.entry_2d)
         
         self.plot_button = QPushButton("绘制2D图形")
         self.plot_button.clicked.connect(self.plot_graphs_2d)
         input_2d_layout.addWidget(self.plot_button)
         
+        # 实时绘制的解析错误显示在输入框下方
+        self.live_error_label = QLabel()
+        self.live_error_label.setProperty("error", True)
+        self.live_error_label.setWordWrap(True)
+        self.live_error_label.hide()
+        input_layout.addWidget(self.live_error_label)
+        
+        # 实时绘制：输入停顿后再编译，避免每次按键都解析
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(self.LIVE_DELAY_MS)
+        self.live_timer.timeout.connect(self.live_compile)
+        self.entry_2d.textChanged.connect(self.on_entry_changed)
+        
         # 创建模板按钮区域
         templates_layout = QHBoxLayout()
         input_layout.addLayout(templates_layout)
@@ -194,6 +232,11 @@ class GraphingCalculatorWindow(QMainWindow):
         self.dark_mode_checkbox.stateChanged.connect(self.toggle_dark_mode)
         settings_layout.addWidget(self.dark_mode_checkbox, 2, 3, 1, 2)
         
+        self.live_checkbox = QCheckBox("实时绘制")
+        self.live_checkbox.setChecked(False)
+        self.live_checkbox.stateChanged.connect(self.toggle_live_mode)
+        settings_layout.addWidget(self.live_checkbox, 2, 5)
+        
         # 创建操作按钮区域
         actions_layout = QHBoxLayout()
         settings_layout.addLayout(actions_layout, 3, 0, 1, 6)
@@ -219,6 +262,10 @@ class GraphingCalculatorWindow(QMainWindow):
         clear_button.clicked.connect(self.clear_graphs)
         actions_layout.addWidget(clear_button)
         
+        clear_cache_button = QPushButton("清除分析缓存")
+        clear_cache_button.clicked.connect(self.clear_analysis_cache)
+        actions_layout.addWidget(clear_cache_button)
+        
         # 创建绘图区域
         plot_group = QGroupBox("图形")
         self.plot_layout = QVBoxLayout(plot_group)
@@ -315,6 +362,10 @@ class GraphingCalculatorWindow(QMainWindow):
     
     def plot_graphs_2d(self):
         """绘制2D图形"""
+        from utils.helpers import ExpressionParser
+        
+        self.init_graphing()
+        
         # 获取方程式输入
         equations_input = self.entry_2d.text().strip()
         
@@ -322,39 +373,15 @@ class GraphingCalculatorWindow(QMainWindow):
             self.result_browser.setText("请输入至少一个方程式。")
             return
         
-        # 分割多个方程式
-        equations = equations_input.split()
+        # 分割多个方程式（括号内的空白不分割）
+        equations = ExpressionParser.split_equations(equations_input)
         
-        # 创建符号变量和转换
-        x = sp.symbols('x')
-        transformations = sp.parsing.sympy_parser.standard_transformations + (
-            sp.parsing.sympy_parser.implicit_multiplication_application, 
-            sp.parsing.sympy_parser.implicit_application, 
-            sp.parsing.sympy_parser.convert_xor
-        )
+        # 解析设置
+        transformations = ExpressionParser.TRANSFORMATIONS
+        local_dict = ExpressionParser.plot_local_dict()
         
-        # 创建本地字典
-        local_dict = {
-            'x': x, 'e': np.e, 'pi': np.pi,
-            'sin': sp.sin, 'cos': sp.cos, 'tan': sp.tan,
-            'asin': sp.asin, 'acos': sp.acos, 'atan': sp.atan,
-            'log': sp.log, 'sqrt': sp.sqrt, 'Abs': sp.Abs,
-            'exp': sp.exp, 'ln': sp.log,
-            'sinh': sp.sinh, 'cosh': sp.cosh, 'tanh': sp.tanh,
-            'asinh': sp.asinh, 'acosh': sp.acosh, 'atanh': sp.atanh,
-            'sec': sp.sec, 'csc': sp.csc, 'cot': sp.cot,
-            'factorial': sp.factorial, 'gamma': sp.gamma,
-            'erf': sp.erf, 'erfc': sp.erfc,
-            'jn': jn, 'yn': yn
-        }
-        
-        # 处理方程式
-        processed_equations = []
-        for equation in equations:
-            # 预处理方程式
-            equation = ExpressionParser.replace_absolute_value(equation)
-            equation = ExpressionParser.replace_inverse_trig_functions(equation)
-            processed_equations.append(equation)
+        # 预处理方程式
+        processed_equations = [ExpressionParser.preprocess(equation) for equation in equations]
         
         # 绘制图形
         result_text = self.graph_manager.plot_functions(
@@ -367,6 +394,124 @@ class GraphingCalculatorWindow(QMainWindow):
         # 显示结果
         self.result_browser.setText(result_text)
     
+    def toggle_live_mode(self, state):
+        """切换实时绘制
+        
+        Args:
+            state: 复选框状态
+        """
+        if self.live_checkbox.isChecked():
+            self.live_timer.start()
+        else:
+            self.live_timer.stop()
+            if self.live_compiler:
+                self.live_compiler.cancel()
+            self.show_live_errors()
+    
+    def on_entry_changed(self, text):
+        """输入变化时重新开始防抖计时，并丢弃上一次输入仍在编译的结果
+        
+        Args:
+            text: 当前输入
+        """
+        if not self.live_checkbox.isChecked():
+            return
+        if self.live_compiler:
+            self.live_compiler.cancel()
+        self.live_timer.start()
+    
+    def live_compile(self):
+        """在后台编译当前输入的所有方程式，编译完成的方程逐个绘制"""
+        from plotting.live_compiler import LiveCompiler
+        from utils.helpers import ExpressionParser
+        
+        self.init_graphing()
+        
+        if self.live_compiler is None:
+            self.live_compiler = LiveCompiler(
+                ExpressionParser.plot_local_dict(),
+                ExpressionParser.TRANSFORMATIONS,
+                self.modules
+            )
+            self.live_compiler.equation_ready.connect(self.on_live_ready)
+            self.live_compiler.equation_failed.connect(self.on_live_failed)
+        
+        self.live_equations = [
+            ExpressionParser.preprocess(equation)
+            for equation in ExpressionParser.split_equations(self.entry_2d.text())
+        ]
+        self.live_status = [None] * len(self.live_equations)
+        self.show_live_errors()
+        
+        if self.live_equations:
+            self.live_compiler.submit(self.live_equations)
+        else:
+            self.live_compiler.cancel()
+            self.schedule_live_plot()
+    
+    def on_live_ready(self, index):
+        """单个方程编译完成
+        
+        Args:
+            index: 方程序号
+        """
+        self.live_status[index] = True
+        self.schedule_live_plot()
+    
+    def on_live_failed(self, index, message):
+        """单个方程编译失败
+        
+        Args:
+            index: 方程序号
+            message: 错误信息
+        """
+        self.live_status[index] = message
+        self.show_live_errors()
+        self.schedule_live_plot()
+    
+    def schedule_live_plot(self):
+        """合并同一轮事件循环中完成的多个方程，只重绘一次"""
+        if not self._live_plot_scheduled:
+            self._live_plot_scheduled = True
+            QTimer.singleShot(0, self.live_plot)
+    
+    def live_plot(self):
+        """按输入顺序绘制已编译成功的方程，编译结果直接从表达式缓存取得
+        
+        编译失败的方程不绘制，上一次绘制的对应曲线也会被移除。
+        """
+        from utils.helpers import ExpressionParser
+        
+        self._live_plot_scheduled = False
+        if not self.live_checkbox.isChecked():
+            return
+        
+        ready = [
+            equation for equation, status in zip(self.live_equations, self.live_status)
+            if status is True
+        ]
+        if not ready and not self.graph_manager.lines:
+            return
+        
+        result_text = self.graph_manager.plot_functions(
+            ready,
+            self.modules,
+            ExpressionParser.plot_local_dict(),
+            ExpressionParser.TRANSFORMATIONS
+        )
+        self.result_browser.setText(result_text)
+    
+    def show_live_errors(self):
+        """在输入框下方显示实时绘制的解析错误"""
+        errors = []
+        if self.live_checkbox.isChecked():
+            for idx, status in enumerate(self.live_status):
+                if isinstance(status, str):
+                    errors.append(f"Equation {idx + 1}: {status.splitlines()[0]}")
+        
+        self.live_error_label.setText('\n'.join(errors))
+        self.live_error_label.setVisible(bool(errors))
+    
     def save_graphs(self):
         """保存方程式到文件"""
         if not self.entry_2d.text().strip():
@@ -379,8 +524,10 @@ class GraphingCalculatorWindow(QMainWindow):
         )
         
         if filename:
+            from utils.helpers import ExpressionParser, FileHandler
+            
             # 保存方程式
-            equations = self.entry_2d.text().strip().split()
+            equations = ExpressionParser.split_equations(self.entry_2d.text())
             if FileHandler.save_equations(filename, equations):
                 self.statusBar().showMessage(f"方程式已保存到 {filename}")
             else:
@@ -394,6 +541,8 @@ class GraphingCalculatorWindow(QMainWindow):
         )
         
         if filename:
+            from utils.helpers import FileHandler
+            
             # 加载方程式
             equations = FileHandler.load_equations(filename)
             if equations:
@@ -450,6 +599,12 @@ class GraphingCalculatorWindow(QMainWindow):
             
             self.statusBar().showMessage("所有图形已清除")
     
+    def clear_analysis_cache(self):
+        """清空持久化的函数分析缓存，下次绘制时重新分析"""
+        self.init_graphing()
+        self.graph_manager.clear_analysis_cache()
+        self.statusBar().showMessage("分析缓存已清除，下次绘制时重新分析")
+    
     def eventFilter(self, source, event):
         """事件过滤器，用于处理特殊事件
         
@@ -460,6 +615,11 @@ class GraphingCalculatorWindow(QMainWindow):
         Returns:
             bool: 是否处理了事件
         """
+        # 首次绘制后再加载绘图组件，窗口先显示出来
+        if event.type() == QEvent.Type.Paint and source is self and not self._graphing_scheduled:
+            self._graphing_scheduled = True
+            QTimer.singleShot(0, self.init_graphing)
+        
         # 处理滚轮事件
         if event.type() == QEvent.Type.Wheel and source is self:
             if self.interactions:
@@ -109,6 +109,10 @@ class ModernTheme:
                 padding: {cls.SPACING['small']}px {cls.SPACING['small']}px;
             }}
             
+            QLabel[error="true"] {{
+                color: {colors['error']};
+            }}
+            
             /* 按钮样式 */
             QPushButton {{
                 font-family: {cls.FONTS['family']};
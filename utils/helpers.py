@@ -2,8 +2,12 @@
 辅助函数模块 - 提供各种实用工具函数
 """
 
+import os
 import re
+import numpy as np
 import sympy as sp
+from scipy import special
+from sympy.functions.special.bessel import jn, yn
 from sympy.parsing.sympy_parser import (
     parse_expr, standard_transformations,
     implicit_multiplication_application, convert_xor, implicit_application
@@ -13,6 +17,109 @@ from sympy.parsing.sympy_parser import (
 class ExpressionParser:
     """表达式解析器类，用于处理数学表达式"""
     
+    # 绘图时解析方程式使用的转换
+    TRANSFORMATIONS = standard_transformations + (
+        implicit_multiplication_application, 
+        implicit_application, 
+        convert_xor
+    )
+    
+    @staticmethod
+    def split_equations(text):
+        """按空白分割多个方程式，括号内和等号两侧的空白不分割
+        
+        参数方程 (cos(t), sin(t)) 中逗号后的空格、极坐标方程 r = sin(θ) 中
+        等号两侧的空格都不会把它拆成多个方程式。
+        
+        Args:
+            text: 输入字符串
+            
+        Returns:
+            list: 方程式字符串列表
+        """
+        equations = []
+        current = ''
+        depth = 0
+        for char in text:
+            if char.isspace() and depth <= 0:
+                if current:
+                    equations.append(current)
+                current = ''
+                continue
+            if char in '([':
+                depth += 1
+            elif char in ')]':
+                depth -= 1
+            current += char
+        if current:
+            equations.append(current)
+        
+        # 把以等号结尾或开头的片段与相邻片段合并
+        merged = []
+        for equation in equations:
+            if merged and (merged[-1].endswith('=') or equation.startswith('=')):
+                merged[-1] += equation
+            else:
+                merged.append(equation)
+        return merged
+    
+    @staticmethod
+    def preprocess(expr_str):
+        """绘图前预处理方程式：替换绝对值和反三角函数表示法
+        
+        Args:
+            expr_str: 表达式字符串
+            
+        Returns:
+            str: 处理后的表达式字符串
+        """
+        expr_str = ExpressionParser.replace_absolute_value(expr_str)
+        return ExpressionParser.replace_inverse_trig_functions(expr_str)
+
+    @staticmethod
+    def plot_local_dict():
+        """绘图时解析方程式使用的本地变量字典
+        
+        Returns:
+            dict: 名称到sympy对象的映射
+        """
+        x = sp.symbols('x')
+        return {
+            'x': x, 'e': np.e, 'pi': np.pi,
+            'sin': sp.sin, 'cos': sp.cos, 'tan': sp.tan,
+            'asin': sp.asin, 'acos': sp.acos, 'atan': sp.atan,
+            'log': sp.log, 'sqrt': sp.sqrt, 'Abs': sp.Abs,
+            'exp': sp.exp, 'ln': sp.log,
+            'sinh': sp.sinh, 'cosh': sp.cosh, 'tanh': sp.tanh,
+            'asinh': sp.asinh, 'acosh': sp.acosh, 'atanh': sp.atanh,
+            'sec': sp.sec, 'csc': sp.csc, 'cot': sp.cot,
+            'factorial': sp.factorial, 'gamma': sp.gamma,
+            'erf': sp.erf, 'erfc': sp.erfc,
+            'jn': jn, 'yn': yn
+        }
+    
+    @staticmethod
+    def plot_modules():
+        """绘图时lambdify使用的数值函数字典
+        
+        Returns:
+            dict: 名称到numpy/scipy函数的映射
+        """
+        return {
+            'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+            'asin': np.arcsin, 'acos': np.arccos, 'atan': np.arctan,
+            'log': np.log, 'sqrt': np.sqrt, 'Abs': np.abs,
+            'exp': np.exp, 'ln': np.log, 'e': np.e, 'pi': np.pi,
+            'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+            'asinh': np.arcsinh, 'acosh': np.arccosh, 'atanh': np.arctanh,
+            'sec': _sec,
+            'csc': _csc,
+            'cot': _cot,
+            'factorial': special.factorial, 'gamma': special.gamma,
+            'erf': special.erf, 'erfc': special.erfc,
+            'jn': special.jn, 'yn': special.yn
+        }
+    
     @staticmethod
     def replace_absolute_value(expr_str):
         """替换绝对值表示法
@@ -100,6 +207,18 @@ class ExpressionParser:
         return parse_expr(expr_str, transformations=transformations, local_dict=local_dict)
 
 
+def _sec(x):
+    return 1 / np.cos(x)
+
+
+def _csc(x):
+    return 1 / np.sin(x)
+
+
+def _cot(x):
+    return 1 / np.tan(x)
+
+
 class FileHandler:
     """文件处理器类，用于处理文件操作"""
     
@@ -121,6 +240,26 @@ class FileHandler:
         except Exception:
             return False
     
+    @staticmethod
+    def find_equation_files(paths, extension='.txt'):
+        """展开输入路径，目录中递归按扩展名收集方程式文件
+        
+        Args:
+            paths: 文件或目录路径列表，文件原样保留
+            extension: 目录中收集的文件扩展名
+            
+        Returns:
+            list: 排序后的文件路径列表
+        """
+        sources = []
+        for path in paths:
+            if os.path.isdir(path):
+                for root, _, files in os.walk(path):
+                    sources.extend(os.path.join(root, name) for name in files if name.endswith(extension))
+            else:
+                sources.append(path)
+        return sorted(sources)
+    
     @staticmethod
     def load_equations(filename):
         """从文件加载方程式